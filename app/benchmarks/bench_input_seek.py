@@ -0,0 +1,113 @@
+# benchmarks/bench_input_seek.py
+"""
+Compare le temps d'export d'un clip de quelques secondes selon son point
+d'entrée (in_s), avec l'ancienne méthode (filtres trim/atrim : décodage depuis
+t=0) et le seek côté entrée (-ss/-t avant -i).
+
+Usage (depuis app/) :
+    python -m benchmarks.bench_input_seek --source-duration 600 --offsets 0 60 300 540
+"""
+from __future__ import annotations
+import argparse
+import json
+import tempfile
+import time
+from dataclasses import replace
+from pathlib import Path
+from typing import Any, Dict, Tuple
+
+import ffmpeg
+
+from core.project import Project, Clip
+from core.export.export_profile import DEFAULT_PROFILES
+from core.export.ffmpeg_engine import FfmpegRenderEngine
+from core.export.render_graph import SourceNode
+
+
+class TrimFilterEngine(FfmpegRenderEngine):
+    """
+    Reproduit l'ancien découpage : chaque source est ouverte sans -ss/-t et
+    les clips sont coupés par trim/atrim, donc décodés depuis t=0. Même graphe
+    que le moteur, seules les entrées (SourceNode.input_args) changent.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        # id(source) -> (source, entrée ffmpeg sans seek), partagée vidéo/audio
+        self._inputs: Dict[int, Tuple[SourceNode, Any]] = {}
+        self.lowered = 0
+
+    def _from_start(self, src: SourceNode) -> Tuple[Any, SourceNode]:
+        if id(src) not in self._inputs:
+            self._inputs[id(src)] = (src, ffmpeg.input(src.path))
+        offset = float(src.input_args.get('ss', 0.0))
+        shifted = replace(src, input_args={},
+                          segments=[(offset + start, dur) for start, dur in src.segments])
+        self.lowered += 1
+        return self._inputs[id(src)][1], shifted
+
+    def _lower_source_video(self, inp, src: SourceNode) -> list:
+        return super()._lower_source_video(*self._from_start(src))
+
+    def _lower_source_audio(self, inp, src: SourceNode) -> list:
+        return super()._lower_source_audio(*self._from_start(src))
+
+    def render(self, project, output_path, profile, monitor=None) -> None:
+        self._inputs.clear()
+        self.lowered = 0
+        super().render(project, output_path, profile, monitor)
+        if not self.lowered:
+            # le moteur ne passe plus par _lower_source_* : la mesure "trim" serait un seek
+            raise RuntimeError("TrimFilterEngine : surcharge non appelée, le benchmark ne compare plus rien")
+
+
+def make_source(path: Path, duration: float, size: str = "1280x720", fps: int = 30) -> Path:
+    """Génère une source synthétique (testsrc + sine), GOP de 2 s."""
+    if path.exists():
+        return path
+    v = ffmpeg.input(f"testsrc=size={size}:rate={fps}:duration={duration}", f="lavfi")
+    a = ffmpeg.input(f"sine=frequency=440:duration={duration}", f="lavfi")
+    out = ffmpeg.output(v, a, str(path), vcodec="libx264", preset="ultrafast",
+                        g=fps * 2, acodec="aac")
+    ffmpeg.run(out, overwrite_output=True, quiet=True)
+    return path
+
+
+def time_export(engine, src: Path, in_s: float, clip_s: float, out: Path) -> float:
+    proj = Project(name="bench", resolution=(1280, 720), fps=30, audio_normalize=False)
+    proj.clips = [Clip(path=str(src), in_s=in_s, out_s=in_s + clip_s, duration_s=clip_s)]
+    t0 = time.perf_counter()
+    engine.render(proj, out, DEFAULT_PROFILES["h264_fast_draft"])
+    return time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--source-duration", type=float, default=600.0)
+    parser.add_argument("--clip", type=float, default=5.0, help="durée du clip exporté (s)")
+    parser.add_argument("--offsets", type=float, nargs="+", default=[0, 30, 120, 300, 540])
+    parser.add_argument("--json", type=Path, help="écrit les résultats dans ce fichier")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="lm-bench-seek-") as tmp:
+        tmp = Path(tmp)
+        src = make_source(tmp / "source.mp4", args.source_duration)
+        engines = {"trim": TrimFilterEngine(), "seek": FfmpegRenderEngine()}
+
+        results = []
+        print(f"{'in_s':>8} | {'trim (s)':>9} | {'seek (s)':>9} | {'gain':>6}")
+        for in_s in args.offsets:
+            in_s = min(in_s, max(0.0, args.source_duration - args.clip))
+            row = {"in_s": in_s}
+            for name, engine in engines.items():
+                row[name] = time_export(engine, src, in_s, args.clip, tmp / f"{name}.mp4")
+            row["speedup"] = row["trim"] / row["seek"] if row["seek"] > 0 else 0.0
+            results.append(row)
+            print(f"{in_s:8.1f} | {row['trim']:9.2f} | {row['seek']:9.2f} | x{row['speedup']:5.1f}")
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
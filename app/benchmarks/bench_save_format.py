@@ -0,0 +1,102 @@
+# benchmarks/bench_save_format.py
+"""
+Compare la sauvegarde et le chargement d'un .lmprj selon le format des clips :
+tables en colonnes (STRT/CLPT/IMGT, format 2) ou un chunk JSON par clip
+(CLIP, format 1). Mesure aussi la taille du fichier et, si numpy est
+installé, la lecture directe des colonnes (numpy.frombuffer).
+
+Usage (depuis app/) :
+    python -m benchmarks.bench_save_format --clips 1000 10000 100000
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import struct
+import tempfile
+import time
+
+from core.project import Project, Clip, ImageOverlay
+from core.save_system import columnar
+from core.save_system.serializers import LMPRJChunkedSerializer
+
+
+def make_project(n_clips: int, n_sources: int = 50) -> Project:
+    proj = Project(name=f"bench-{n_clips}")
+    proj.clips = [Clip(path=f"/media/rushes/source_{i % n_sources:03d}.mp4",
+                       in_s=float(i % 60), out_s=float(i % 60) + 4.0, duration_s=4.0)
+                  for i in range(n_clips)]
+    proj.image_overlays = [ImageOverlay(path=f"/media/logos/logo_{i % 5}.png",
+                                        start=float(i), end=float(i) + 2.0)
+                           for i in range(n_clips // 100)]
+    return proj
+
+
+def time_save(project: Project, filename: str, columnar_tables: bool) -> float:
+    t0 = time.perf_counter()
+    with open(LMPRJChunkedSerializer.path_for(filename), "wb") as f:
+        LMPRJChunkedSerializer.write_snapshot(f, project, columnar_tables=columnar_tables)
+    return time.perf_counter() - t0
+
+
+def time_load(filename: str, expected: int) -> float:
+    t0 = time.perf_counter()
+    proj = LMPRJChunkedSerializer.load(filename)
+    elapsed = time.perf_counter() - t0
+    assert len(proj.clips) == expected, f"{filename} : {len(proj.clips)} clips relus sur {expected}"
+    return elapsed
+
+
+def time_columns(filename: str):
+    """Somme des durées lue directement dans le chunk CLPT (sans créer de Clip)."""
+    try:
+        import numpy as np
+    except ImportError:
+        return None
+    t0 = time.perf_counter()
+    with open(LMPRJChunkedSerializer.path_for(filename), "rb") as f:
+        buf = f.read()
+    pos = 0
+    while pos < len(buf):
+        chunk_id, length = struct.unpack_from("4sI", buf, pos)
+        if chunk_id == b"CLPT":
+            n, _, offsets = columnar.table_layout(memoryview(buf)[pos + 8:pos + 8 + length])
+            np.frombuffer(buf, "<f8", count=n, offset=pos + 8 + offsets[2]).sum()
+            break
+        pos += 8 + length
+    return time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clips", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--json", help="écrit les résultats dans ce fichier")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="lm-bench-save-") as tmp:
+        # dossier de sauvegarde isolé (voir get_save_dir)
+        os.environ["XDG_DATA_HOME"] = os.environ["USERPROFILE"] = tmp
+
+        print(f"{'clips':>7} | {'format':>8} | {'save (ms)':>9} | {'load (ms)':>9} | {'taille (Ko)':>11} | {'colonne (ms)':>12}")
+        for n in args.clips:
+            project = make_project(n)
+            for name, columnar_tables in (("json", False), ("colonnes", True)):
+                filename = f"bench_{name}_{n}{LMPRJChunkedSerializer.EXTENSION}"
+                row = {"clips": n, "format": name,
+                       "save_s": time_save(project, filename, columnar_tables),
+                       "load_s": time_load(filename, n),
+                       "size": os.path.getsize(LMPRJChunkedSerializer.path_for(filename)),
+                       "column_s": time_columns(filename) if columnar_tables else None}
+                results.append(row)
+                column = f"{row['column_s'] * 1000:12.2f}" if row["column_s"] is not None else f"{'-':>12}"
+                print(f"{n:7d} | {name:>8} | {row['save_s'] * 1000:9.1f} | {row['load_s'] * 1000:9.1f} | "
+                      f"{row['size'] / 1024:11.1f} | {column}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+# benchmarks/export_suite.py
+"""
+Suite de benchmarks d'export sur projets synthétiques.
+
+Des sources testsrc/sine sont générées une fois, puis des Project variant le
+nombre de clips, d'overlays (texte et image) et les points d'entrée (in_s)
+sont exportés sous chaque profil de DEFAULT_PROFILES. Chaque export tourne
+dans un processus neuf pour mesurer proprement : images/s, temps réel,
+pic de RSS (Python + ffmpeg, hors Windows) et utilisation CPU (en cœurs).
+
+Les résultats sont ajoutés à un historique JSON ; --baseline compare à une
+référence enregistrée (--save-baseline) et signale les régressions.
+
+Usage (depuis app/) :
+    python -m benchmarks.export_suite --save-baseline
+    python -m benchmarks.export_suite --baseline            # code de sortie 1 si régression
+    python -m benchmarks.export_suite --cases many_clips --profiles h264_fast_draft
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import ffmpeg
+
+from benchmarks.bench_input_seek import make_source
+from core.project import Project, Clip, TextOverlay, ImageOverlay
+from core.export.export_profile import DEFAULT_PROFILES
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+HISTORY_FILE = RESULTS_DIR / "export_history.json"
+BASELINE_FILE = RESULTS_DIR / "export_baseline.json"
+
+# Seuils de régression (relatifs à la référence)
+WALL_TOLERANCE = 0.10
+RSS_TOLERANCE = 0.20
+
+
+@dataclass(frozen=True)
+class BenchCase:
+    """Forme d'un projet synthétique."""
+    name: str
+    clips: int = 1
+    clip_s: float = 5.0
+    in_offset_s: float = 0.0
+    text_overlays: int = 0
+    image_overlays: int = 0
+
+
+CASES = [
+    BenchCase("single_clip"),
+    BenchCase("late_in_point", in_offset_s=240.0),
+    BenchCase("many_clips", clips=24, clip_s=1.0, in_offset_s=7.0),
+    BenchCase("captions", clip_s=10.0, text_overlays=40),
+    BenchCase("logos", clip_s=10.0, image_overlays=4),
+    BenchCase("mixed", clips=6, clip_s=3.0, in_offset_s=30.0, text_overlays=12, image_overlays=2),
+]
+
+
+def make_image(path: Path, size: str = "640x360") -> Path:
+    """Image d'overlay synthétique (PNG)."""
+    if not path.exists():
+        img = ffmpeg.input(f"testsrc2=size={size}:rate=1:duration=1", f="lavfi")
+        ffmpeg.run(ffmpeg.output(img, str(path), vframes=1), overwrite_output=True, quiet=True)
+    return path
+
+
+def build_project(case: BenchCase, source: Path, image: Path, source_s: float) -> Project:
+    proj = Project(name=f"bench-{case.name}", resolution=(1280, 720), fps=30, audio_normalize=False)
+    for k in range(case.clips):
+        in_s = (case.in_offset_s * (k + 1)) % max(1.0, source_s - case.clip_s)
+        proj.clips.append(Clip(path=str(source), in_s=in_s, out_s=in_s + case.clip_s,
+                               duration_s=case.clip_s))
+    total = proj.total_duration_s()
+    for k in range(case.text_overlays):
+        start = total * k / max(1, case.text_overlays)
+        proj.text_overlays.append(TextOverlay(text=f"Sous-titre {k}", start=start,
+                                              end=min(total, start + 1.5),
+                                              y="h-text_h-40", fontfile=None))
+    for k in range(case.image_overlays):
+        proj.image_overlays.append(ImageOverlay(path=str(image), x=0.15 + 0.2 * k, y=0.15,
+                                                w=0.15, h=0.15, start=0.0, end=total,
+                                                opacity=0.8))
+    return proj
+
+
+def _run_case(project: Dict[str, Any], profile_key: str, engine_name: str, out: str) -> Dict[str, Any]:
+    """Exécuté dans un processus neuf : exporte et mesure ce processus et ses ffmpeg."""
+    from render_cli import make_engine, peak_rss_mb
+
+    proj = Project.from_dict(project)
+    engine = make_engine(engine_name)
+    t0 = time.perf_counter()
+    engine.render(proj, Path(out), DEFAULT_PROFILES[profile_key])
+    wall = time.perf_counter() - t0
+
+    # os.times : portable (sous Windows, le temps des enfants vaut 0)
+    times = os.times()
+    cpu = times.user + times.system + times.children_user + times.children_system
+    frames = proj.total_duration_s() * proj.fps
+    return {
+        "wall_s": wall,
+        "fps": frames / wall if wall > 0 else 0.0,
+        "realtime_factor": proj.total_duration_s() / wall if wall > 0 else 0.0,
+        # None sous Windows (pas de module resource)
+        "peak_rss_mb": peak_rss_mb(),
+        "ffmpeg_peak_rss_mb": peak_rss_mb(children=True),
+        "cpu_s": cpu,
+        "cpu_cores": cpu / wall if wall > 0 else 0.0,
+    }
+
+
+def _mb(value: Optional[float]) -> str:
+    return f"{value:7.0f}" if value is not None else f"{'-':>7}"
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, cwd=Path(__file__).parent).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Dict[str, Any]]) -> List[str]:
+    """Régressions : temps mural ou pic mémoire au-delà des tolérances."""
+    issues = []
+    for r in results:
+        ref = baseline.get(r["key"])
+        if not ref:
+            continue
+        if r["wall_s"] > ref["wall_s"] * (1 + WALL_TOLERANCE):
+            issues.append(f"{r['key']} : {r['wall_s']:.2f}s vs {ref['wall_s']:.2f}s "
+                          f"(+{100 * (r['wall_s'] / ref['wall_s'] - 1):.0f} %)")
+        peak, ref_peak = r.get("ffmpeg_peak_rss_mb"), ref.get("ffmpeg_peak_rss_mb")
+        if peak is not None and ref_peak and peak > ref_peak * (1 + RSS_TOLERANCE):
+            issues.append(f"{r['key']} : pic ffmpeg {peak:.0f} Mo vs {ref_peak:.0f} Mo")
+    return issues
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cases", nargs="+", choices=[c.name for c in CASES])
+    parser.add_argument("--profiles", nargs="+", choices=sorted(DEFAULT_PROFILES))
+    parser.add_argument("--engine", default="smart", help="moteur (noms de luminare-render)")
+    parser.add_argument("--repeat", type=int, default=1, help="répétitions (on garde la meilleure)")
+    parser.add_argument("--source-duration", type=float, default=300.0)
+    parser.add_argument("--history", type=Path, default=HISTORY_FILE)
+    parser.add_argument("--baseline", nargs="?", type=Path, const=BASELINE_FILE,
+                        help="compare à cette référence (défaut : results/export_baseline.json)")
+    parser.add_argument("--save-baseline", nargs="?", type=Path, const=BASELINE_FILE)
+    args = parser.parse_args()
+
+    cases = [c for c in CASES if not args.cases or c.name in args.cases]
+    profiles = args.profiles or sorted(DEFAULT_PROFILES)
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="lm-bench-export-") as tmp:
+        tmp = Path(tmp)
+        source = make_source(tmp / "source.mp4", args.source_duration)
+        image = make_image(tmp / "logo.png")
+
+        print(f"{'cas':<14} {'profil':<18} {'mur (s)':>8} {'i/s':>7} {'x RT':>6} "
+              f"{'RSS py':>7} {'RSS ff':>7} {'cœurs':>6}")
+        for case in cases:
+            project = build_project(case, source, image, args.source_duration).to_dict()
+            for profile_key in profiles:
+                best = None
+                for _ in range(max(1, args.repeat)):
+                    # un processus par mesure : pics RSS et temps CPU propres au cas
+                    with ProcessPoolExecutor(max_workers=1) as pool:
+                        r = pool.submit(_run_case, project, profile_key, args.engine,
+                                        str(tmp / f"{case.name}-{profile_key}.mp4")).result()
+                    if best is None or r["wall_s"] < best["wall_s"]:
+                        best = r
+                best.update(key=f"{args.engine}/{case.name}/{profile_key}",
+                            case=case.name, profile=profile_key)
+                results.append(best)
+                print(f"{case.name:<14} {profile_key:<18} {best['wall_s']:8.2f} {best['fps']:7.1f} "
+                      f"{best['realtime_factor']:6.2f} {_mb(best['peak_rss_mb'])} "
+                      f"{_mb(best['ffmpeg_peak_rss_mb'])} {best['cpu_cores']:6.2f}")
+
+    run = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "git": git_revision(),
+        "engine": args.engine,
+        "host": {"machine": platform.machine(), "cpus": os.cpu_count(), "python": platform.python_version()},
+        "results": results,
+    }
+    args.history.parent.mkdir(parents=True, exist_ok=True)
+    history = json.loads(args.history.read_text(encoding="utf-8")) if args.history.exists() else []
+    history.append(run)
+    args.history.write_text(json.dumps(history, indent=2), encoding="utf-8")
+    print(f"Historique : {args.history} ({len(history)} exécutions)")
+
+    if args.save_baseline:
+        args.save_baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.save_baseline.write_text(json.dumps({r["key"]: r for r in results}, indent=2), encoding="utf-8")
+        print(f"Référence enregistrée : {args.save_baseline}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        issues = compare(results, baseline)
+        for issue in issues:
+            print("RÉGRESSION", issue)
+        if issues:
+            raise SystemExit(1)
+        print("Aucune régression par rapport à la référence.")
+
+
+if __name__ == "__main__":
+    main()
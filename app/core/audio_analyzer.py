@@ -4,12 +4,14 @@ import hashlib, json, wave, subprocess, shutil
 from pathlib import Path
 import numpy as np
 
+from core.runtime_env import app_cache_dir
+
 def _hash(s: str) -> str:
     import hashlib as _h
     return _h.sha1(s.encode("utf-8")).hexdigest()[:16]
 
 def _cache_dir() -> Path:
-    d = Path("cache") / "wave"
+    d = app_cache_dir("wave")
     d.mkdir(parents=True, exist_ok=True)
     return d
 
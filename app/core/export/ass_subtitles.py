@@ -0,0 +1,231 @@
+# core/export/ass_subtitles.py
+from __future__ import annotations
+import ast
+import functools
+import hashlib
+import shutil
+import subprocess
+import threading
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from core.project import TextOverlay
+from core.runtime_env import app_cache_dir
+
+# Couleurs nommées acceptées par drawtext et courantes dans les projets
+_NAMED_COLORS = {
+    "white": (255, 255, 255), "black": (0, 0, 0), "red": (255, 0, 0),
+    "green": (0, 128, 0), "lime": (0, 255, 0), "blue": (0, 0, 255),
+    "yellow": (255, 255, 0), "cyan": (0, 255, 255), "magenta": (255, 0, 255),
+    "gray": (128, 128, 128), "grey": (128, 128, 128), "orange": (255, 165, 0),
+}
+
+# Variables de drawtext, par rôle
+_W_NAMES = {"w", "W", "main_w"}
+_H_NAMES = {"h", "H", "main_h"}
+_TW_NAMES = {"text_w", "tw"}
+_TH_NAMES = {"text_h", "th"}
+
+# \an : alignement ASS (pavé numérique) selon l'ancrage horizontal / vertical
+_ALIGN = {("left", "top"): 7, ("center", "top"): 8, ("right", "top"): 9,
+          ("left", "middle"): 4, ("center", "middle"): 5, ("right", "middle"): 6,
+          ("left", "bottom"): 1, ("center", "bottom"): 2, ("right", "bottom"): 3}
+
+
+@functools.lru_cache(maxsize=1)
+def ass_filter_available() -> bool:
+    """Vrai si le ffmpeg installé est compilé avec libass (filtre 'ass')."""
+    exe = shutil.which("ffmpeg")
+    if not exe:
+        return False
+    try:
+        out = subprocess.run([exe, "-hide_banner", "-filters"],
+                             capture_output=True, text=True, timeout=10).stdout
+    except (OSError, subprocess.SubprocessError):
+        return False
+    return any(line.split()[1:2] == ["ass"] for line in out.splitlines())
+
+
+def _eval_expr(expr, w: int, h: int, tw: float, th: float) -> Optional[float]:
+    """Évalue une expression de position drawtext (arithmétique simple)."""
+    if isinstance(expr, (int, float)):
+        return float(expr)
+
+    def ev(node):
+        if isinstance(node, ast.Expression):
+            return ev(node.body)
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+            return float(node.value)
+        if isinstance(node, ast.Name):
+            if node.id in _W_NAMES:
+                return float(w)
+            if node.id in _H_NAMES:
+                return float(h)
+            if node.id in _TW_NAMES:
+                return tw
+            if node.id in _TH_NAMES:
+                return th
+            raise ValueError(node.id)
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+            v = ev(node.operand)
+            return -v if isinstance(node.op, ast.USub) else v
+        if isinstance(node, ast.BinOp):
+            a, b = ev(node.left), ev(node.right)
+            if isinstance(node.op, ast.Add):
+                return a + b
+            if isinstance(node.op, ast.Sub):
+                return a - b
+            if isinstance(node.op, ast.Mult):
+                return a * b
+            if isinstance(node.op, ast.Div):
+                return a / b
+        raise ValueError(ast.dump(node))
+
+    try:
+        return ev(ast.parse(str(expr).strip(), mode="eval"))
+    except (SyntaxError, ValueError, ZeroDivisionError):
+        return None
+
+
+def _anchor(expr, w: int, h: int, text_var: str) -> Optional[Tuple[float, str]]:
+    """
+    Ramène une position drawtext (coin haut-gauche du texte, fonction de la
+    taille du texte) à un point d'ancrage ASS : on mesure le coefficient de
+    text_w (ou text_h) ; 0, -1/2 et -1 correspondent à un ancrage début,
+    milieu et fin. Toute autre forme n'est pas convertible.
+    """
+    if text_var == "w":
+        f = lambda t: _eval_expr(expr, w, h, t, 0.0)
+        names = ("left", "center", "right")
+    else:
+        f = lambda t: _eval_expr(expr, w, h, 0.0, t)
+        names = ("top", "middle", "bottom")
+    v0, v1 = f(0.0), f(100.0)
+    if v0 is None or v1 is None:
+        return None
+    coef = (v1 - v0) / 100.0
+    for target, name in zip((0.0, -0.5, -1.0), names):
+        if abs(coef - target) < 1e-6:
+            return v0, name
+    return None
+
+
+def ass_color(color: str) -> Optional[Tuple[str, str]]:
+    """Couleur drawtext ('white', 'black@0.5', '#RRGGBB', '0xRRGGBBAA') -> (&HBBGGRR&, &HAA&)."""
+    if not color:
+        return None
+    base, _, alpha_part = str(color).partition("@")
+    base = base.strip()
+    alpha = 1.0
+    if base.lower() in _NAMED_COLORS:
+        r, g, b = _NAMED_COLORS[base.lower()]
+    else:
+        hexa = base[1:] if base.startswith("#") else base[2:] if base.lower().startswith("0x") else None
+        if hexa is None or len(hexa) not in (6, 8):
+            return None
+        try:
+            r, g, b = int(hexa[0:2], 16), int(hexa[2:4], 16), int(hexa[4:6], 16)
+            if len(hexa) == 8:
+                alpha = int(hexa[6:8], 16) / 255.0
+        except ValueError:
+            return None
+    if alpha_part:
+        try:
+            alpha = float(alpha_part)
+        except ValueError:
+            return None
+    # ASS : alpha inversé (00 = opaque)
+    a = round((1.0 - min(1.0, max(0.0, alpha))) * 255)
+    return f"&H{b:02X}{g:02X}{r:02X}&", f"&H{a:02X}&"
+
+
+def _ass_time(t: float) -> str:
+    cs = max(0, int(round(t * 100)))
+    h, rem = divmod(cs, 360000)
+    m, rem = divmod(rem, 6000)
+    s, cs = divmod(rem, 100)
+    return f"{h}:{m:02d}:{s:02d}.{cs:02d}"
+
+
+def _ass_text(text: str) -> str:
+    # Une barre oblique inverse ne doit pas former de code (\N, \h…) ni d'accolade de balise
+    text = text.replace("\\", "\\\u2060").replace("{", "\\{").replace("}", "\\}")
+    return text.replace("\r\n", "\n").replace("\n", "\\N")
+
+
+def _font_name(fontfile: Optional[str]) -> str:
+    if not fontfile:
+        return "Sans"
+    return Path(fontfile.replace("\\", "/")).stem
+
+
+def overlay_event(ov: TextOverlay, w: int, h: int) -> Optional[str]:
+    """Ligne 'Dialogue' ASS équivalente au drawtext de l'overlay, ou None si non convertible."""
+    ax = _anchor(ov.x, w, h, "w")
+    ay = _anchor(ov.y, w, h, "h")
+    fg = ass_color(ov.fontcolor)
+    box = ass_color(ov.boxcolor) if ov.box else None
+    if ax is None or ay is None or fg is None or (ov.box and box is None):
+        return None
+
+    tags = [f"\\an{_ALIGN[(ax[1], ay[1])]}", f"\\pos({ax[0]:.1f},{ay[0]:.1f})",
+            f"\\fn{_font_name(ov.fontfile)}", f"\\fs{int(ov.fontsize)}",
+            f"\\1c{fg[0]}\\1a{fg[1]}"]
+    style = "Plain"
+    if box:
+        style = "Box"
+        tags.append(f"\\3c{box[0]}\\3a{box[1]}\\bord{int(ov.boxborderw)}")
+    return (f"Dialogue: 0,{_ass_time(ov.start)},{_ass_time(ov.end)},{style},,0,0,0,,"
+            f"{{{''.join(tags)}}}{_ass_text(ov.text or '')}")
+
+
+def build_ass(overlays: List[TextOverlay], width: int, height: int) -> Tuple[str, List[TextOverlay]]:
+    """
+    Compile les overlays en un document ASS (repère = résolution du projet).
+    Retourne (document, overlays non convertibles à laisser à drawtext).
+    """
+    events, rest = [], []
+    for ov in overlays:
+        if ov.end <= ov.start:
+            continue
+        line = overlay_event(ov, width, height)
+        if line is None:
+            rest.append(ov)
+        else:
+            events.append(line)
+
+    header = "\n".join([
+        "[Script Info]",
+        "ScriptType: v4.00+",
+        f"PlayResX: {int(width)}",
+        f"PlayResY: {int(height)}",
+        "WrapStyle: 2",
+        "ScaledBorderAndShadow: yes",
+        "",
+        "[V4+ Styles]",
+        "Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, "
+        "BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, "
+        "BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding",
+        "Style: Plain,Sans,48,&H00FFFFFF,&H00FFFFFF,&H00000000,&H00000000,"
+        "0,0,0,0,100,100,0,0,1,0,0,7,0,0,0,1",
+        # BorderStyle=3 : boîte opaque de couleur OutlineColour, marge = Outline
+        "Style: Box,Sans,48,&H00FFFFFF,&H00FFFFFF,&H80000000,&H00000000,"
+        "0,0,0,0,100,100,0,0,3,10,0,7,0,0,0,1",
+        "",
+        "[Events]",
+        "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text",
+    ])
+    return header + "\n" + "\n".join(events) + "\n", rest
+
+
+def write_ass(document: str, cache_dir: Optional[Path] = None) -> Path:
+    """Écrit le document dans le cache (nom = hash du contenu, réutilisé tel quel)."""
+    cache_dir = Path(cache_dir) if cache_dir else app_cache_dir("subtitles")
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    key = hashlib.sha1(document.encode("utf-8")).hexdigest()[:16]
+    path = cache_dir / f"{key}.ass"
+    if not path.exists():
+        tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp.write_text(document, encoding="utf-8")
+        tmp.replace(path)
+    return path
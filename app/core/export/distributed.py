@@ -0,0 +1,393 @@
+# core/export/distributed.py
+"""
+Rendu distribué : un coordinateur découpe la timeline en plages et les
+envoie à des workers (nœuds de rendu) par socket TCP ; chaque worker rend sa
+partie vidéo et renvoie le fichier MPEG-TS encodé ; le coordinateur rend
+l'audio, puis assemble le tout en copie de flux.
+
+Protocole (une connexion par worker, requêtes séquentielles) : chaque message
+est un en-tête JSON préfixé de sa longueur (4 octets, big-endian), suivi de
+`size` octets de données binaires si l'en-tête l'indique.
+
+    -> {"type": "render_part", "project": {...}, "start": s, "end": e, "profile": {...}}
+    <- {"type": "part", "ok": true, "size": N, "render_s": t}  + N octets (.ts)
+    <- {"type": "part", "ok": false, "error": "..."}
+    -> {"type": "ping"}       <- {"type": "pong"}
+
+Les chemins des médias doivent être valides sur les nœuds (stockage partagé).
+Lancer un worker :  python -m core.export.distributed --port 7650
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import queue
+import shutil
+import socket
+import socketserver
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.project import Project
+from core.export.engine_interface import IRenderEngine, RenderError, RenderCancelled, RenderMonitor
+from core.export.export_profile import ExportProfile
+from core.export.ffmpeg_engine import FfmpegRenderEngine
+from core.export.timeline_slicing import plan_segments
+
+Address = Tuple[str, int]
+
+_HEADER = struct.Struct(">I")
+_CHUNK = 1 << 20
+DEFAULT_PORT = 7650
+
+
+# --- Messages ---
+
+def _recv_exact(sock: socket.socket, n: int) -> bytes:
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = sock.recv(min(_CHUNK, n - len(buf)))
+        if not chunk:
+            raise ConnectionError("Connexion fermée par le pair")
+        buf.extend(chunk)
+    return bytes(buf)
+
+
+def send_message(sock: socket.socket, header: Dict[str, Any], payload: Optional[Path] = None) -> None:
+    """Envoie un en-tête JSON, puis le contenu du fichier `payload` s'il est donné."""
+    header = dict(header)
+    header["size"] = payload.stat().st_size if payload is not None else 0
+    raw = json.dumps(header).encode("utf-8")
+    sock.sendall(_HEADER.pack(len(raw)) + raw)
+    if payload is not None:
+        with open(payload, "rb") as f:
+            sock.sendfile(f)
+
+
+def recv_message(sock: socket.socket, dest: Optional[Path] = None) -> Dict[str, Any]:
+    """Reçoit un message ; les données binaires éventuelles sont écrites dans `dest`."""
+    (length,) = _HEADER.unpack(_recv_exact(sock, _HEADER.size))
+    header = json.loads(_recv_exact(sock, length).decode("utf-8"))
+    remaining = int(header.get("size", 0))
+    if remaining:
+        if dest is None:
+            raise ConnectionError("Données inattendues dans le message")
+        with open(dest, "wb") as f:
+            while remaining:
+                chunk = sock.recv(min(_CHUNK, remaining))
+                if not chunk:
+                    raise ConnectionError("Connexion fermée pendant le transfert")
+                f.write(chunk)
+                remaining -= len(chunk)
+    return header
+
+
+# --- Worker ---
+
+class _WorkerHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        server: "RenderWorkerServer" = self.server  # type: ignore[assignment]
+        sock = self.request
+        while True:
+            try:
+                msg = recv_message(sock)
+            except (ConnectionError, OSError, ValueError):
+                return
+            kind = msg.get("type")
+            if kind == "ping":
+                send_message(sock, {"type": "pong"})
+            elif kind == "render_part":
+                server.handle_render(sock, msg)
+            else:
+                send_message(sock, {"type": "error", "ok": False, "error": f"Requête inconnue : {kind}"})
+
+
+class RenderWorkerServer(socketserver.ThreadingTCPServer):
+    """Nœud de rendu : rend les parties vidéo demandées par un coordinateur."""
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address: Address = ("127.0.0.1", DEFAULT_PORT),
+                 engine: Optional[FfmpegRenderEngine] = None):
+        super().__init__(address, _WorkerHandler)
+        self.engine = engine or FfmpegRenderEngine()
+
+    def handle_render(self, sock: socket.socket, msg: Dict[str, Any]) -> None:
+        work_dir = Path(tempfile.mkdtemp(prefix="luminare-worker-"))
+        try:
+            project = Project.from_dict(msg["project"])
+            profile = ExportProfile(**msg["profile"])
+            start, end = float(msg["start"]), float(msg["end"])
+            part = work_dir / "part.ts"
+            t0 = time.perf_counter()
+            self.engine.render_video_part(project, start, end, part, profile)
+            send_message(sock, {"type": "part", "ok": True,
+                                "render_s": time.perf_counter() - t0}, payload=part)
+        except RenderError as e:
+            send_message(sock, {"type": "part", "ok": False, "error": str(e)})
+        except Exception as e:
+            send_message(sock, {"type": "part", "ok": False, "error": f"Erreur inattendue : {e}"})
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+
+# --- Coordinateur ---
+
+@dataclass
+class WorkerStats:
+    """Débit d'un worker sur un rendu."""
+    address: str
+    parts: int = 0
+    failures: int = 0
+    media_s: float = 0.0
+    busy_s: float = 0.0
+    bytes: int = 0
+
+    @property
+    def realtime_factor(self) -> float:
+        return self.media_s / self.busy_s if self.busy_s > 0 else 0.0
+
+
+class DistributedRenderEngine(FfmpegRenderEngine):
+    """
+    Coordinateur : un thread par worker tire les plages d'une file commune.
+    Une plage en échec (erreur de rendu, worker injoignable) est remise en
+    file jusqu'à `max_retries` fois ; un worker qui ne répond plus est retiré.
+    L'audio est rendu localement, en une passe, pendant que les workers
+    rendent la vidéo.
+    """
+
+    def __init__(self,
+                 workers: List[Address],
+                 segment_s: float = 10.0,
+                 max_retries: int = 2,
+                 timeout_s: float = 600.0):
+        if not workers:
+            raise ValueError("Au moins un worker est nécessaire.")
+        self.workers = [(str(h), int(p)) for h, p in workers]
+        self.segment_s = max(0.5, float(segment_s))
+        self.max_retries = max(0, int(max_retries))
+        self.timeout_s = timeout_s
+        self.last_stats: List[WorkerStats] = []
+
+    def render(self,
+               project: Project,
+               output_path: Path,
+               profile: ExportProfile,
+               monitor: Optional[RenderMonitor] = None) -> None:
+        ranges = plan_segments(project, self.segment_s)
+        if not ranges:
+            raise RenderError("Le projet est vide, aucun clip à exporter.")
+
+        total = project.total_duration_s()
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        work_dir = Path(tempfile.mkdtemp(prefix=f".{output_path.stem}.parts-", dir=output_path.parent))
+        monitor = monitor or RenderMonitor()
+        stats = [WorkerStats(f"{h}:{p}") for h, p in self.workers]
+        self.last_stats = stats
+        try:
+            monitor.add_task("audio", total, weight=total * self.AUDIO_TASK_WEIGHT)
+            monitor.add_task("concat", total, weight=total * self.CONCAT_TASK_WEIGHT)
+            for rng in ranges:
+                monitor.add_task(self.part_task(rng.start), rng.duration)
+
+            parts = [work_dir / f"part_{i:05d}.ts" for i in range(len(ranges))]
+            pending: "queue.Queue[Tuple[int, int]]" = queue.Queue()
+            for i in range(len(ranges)):
+                pending.put((i, 0))
+            done: List[bool] = [False] * len(ranges)
+            errors: List[str] = []
+            lock = threading.Lock()
+            project_dict = project.to_dict()
+            profile_dict = asdict(profile)
+            sockets: List[socket.socket] = []
+
+            def remaining() -> bool:
+                with lock:
+                    return not all(done) and not errors
+
+            def worker_loop(address: Address, st: WorkerStats) -> None:
+                try:
+                    sock = socket.create_connection(address, timeout=self.timeout_s)
+                except OSError as e:
+                    print(f"[distribué] worker {st.address} injoignable : {e}")
+                    return
+                with lock:
+                    sockets.append(sock)
+                with sock:
+                    while remaining() and not monitor.cancelled:
+                        try:
+                            i, attempt = pending.get(timeout=0.2)
+                        except queue.Empty:
+                            continue
+                        rng = ranges[i]
+                        t0 = time.perf_counter()
+                        try:
+                            send_message(sock, {"type": "render_part", "project": project_dict,
+                                                "start": rng.start, "end": rng.end,
+                                                "profile": profile_dict})
+                            reply = recv_message(sock, dest=parts[i])
+                        except (OSError, ConnectionError, ValueError) as e:
+                            # Worker perdu : la plage repart pour un autre
+                            st.failures += 1
+                            self._retry(pending, i, attempt, f"{st.address} : {e}", errors, lock)
+                            return
+                        if not reply.get("ok"):
+                            st.failures += 1
+                            self._retry(pending, i, attempt, f"{st.address} : {reply.get('error')}",
+                                        errors, lock)
+                            continue
+                        st.parts += 1
+                        st.media_s += rng.duration
+                        st.busy_s += time.perf_counter() - t0
+                        st.bytes += parts[i].stat().st_size
+                        monitor.finish(self.part_task(rng.start))
+                        with lock:
+                            done[i] = True
+
+            audio_path = work_dir / "audio.mka"
+            audio_error: List[BaseException] = []
+
+            def audio_job():
+                try:
+                    self.render_audio_track(project, audio_path, profile, monitor)
+                except BaseException as e:
+                    audio_error.append(e)
+
+            threads = [threading.Thread(target=worker_loop, args=(addr, st), daemon=True,
+                                        name=f"dist-{st.address}")
+                       for addr, st in zip(self.workers, stats)]
+            threads.append(threading.Thread(target=audio_job, daemon=True, name="dist-audio"))
+            for t in threads:
+                t.start()
+            while any(t.is_alive() for t in threads):
+                if monitor.cancelled:
+                    # débloque les threads en attente d'une réponse
+                    with lock:
+                        for sock in sockets:
+                            try:
+                                sock.shutdown(socket.SHUT_RDWR)
+                            except OSError:
+                                pass
+                for t in threads:
+                    t.join(0.2)
+
+            monitor.check()
+            if audio_error:
+                raise audio_error[0]
+            if errors:
+                raise RenderError("Rendu distribué en échec : " + errors[0])
+            if not all(done):
+                raise RenderError("Rendu distribué incomplet : plus aucun worker disponible.")
+
+            self.concat_parts(parts, audio_path, output_path, profile, monitor, total)
+            self._print_stats(stats)
+        except (RenderError, RenderCancelled):
+            raise
+        except Exception as e:
+            raise RenderError(f"Erreur inattendue lors du rendu distribué : {e}")
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    def supports_resume(self) -> bool:
+        return False  # les parties sont rendues par les workers, pas localement
+
+    def render_multi(self,
+                     project: Project,
+                     targets: List[Tuple[ExportProfile, Path]],
+                     monitor: Optional[RenderMonitor] = None) -> None:
+        """Un rendu distribué par sortie (le graphe multi-sorties ne tourne qu'en local)."""
+        IRenderEngine.render_multi(self, project, targets, monitor)
+
+    def _retry(self, pending: queue.Queue, i: int, attempt: int, reason: str,
+               errors: List[str], lock: threading.Lock) -> None:
+        print(f"[distribué] partie {i} en échec ({reason})")
+        if attempt < self.max_retries:
+            pending.put((i, attempt + 1))
+        else:
+            with lock:
+                errors.append(f"partie {i} après {attempt + 1} tentatives — {reason}")
+
+    @staticmethod
+    def _print_stats(stats: List[WorkerStats]) -> None:
+        for st in stats:
+            print(f"[distribué] {st.address} : {st.parts} parties, {st.failures} échecs, "
+                  f"{st.media_s:.1f}s média en {st.busy_s:.1f}s (x{st.realtime_factor:.2f}), "
+                  f"{st.bytes / 1e6:.1f} Mo")
+
+
+# --- Workers locaux ---
+
+class LocalWorkerPool:
+    """
+    Lance `n` workers dans des processus locaux (substituts de nœuds, pour
+    essayer le rendu distribué sur une seule machine). Utilisable en `with`.
+    """
+
+    def __init__(self, n: int, host: str = "127.0.0.1"):
+        self.procs: List[subprocess.Popen] = []
+        self.addresses: List[Address] = []
+        app_dir = Path(__file__).resolve().parents[2]
+        try:
+            for _ in range(max(1, n)):
+                proc = subprocess.Popen(
+                    [sys.executable, "-m", "core.export.distributed", "--host", host, "--port", "0"],
+                    cwd=str(app_dir), stdout=subprocess.PIPE, text=True)
+                self.procs.append(proc)
+                line = proc.stdout.readline().split()
+                # première ligne : "LISTENING <host> <port>"
+                if len(line) != 3 or line[0] != "LISTENING":
+                    raise RenderError("Le worker local n'a pas démarré.")
+                self.addresses.append((line[1], int(line[2])))
+        except Exception:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        for proc in self.procs:
+            if proc.poll() is None:
+                proc.terminate()
+        for proc in self.procs:
+            try:
+                proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+        self.procs = []
+
+    def __enter__(self) -> "LocalWorkerPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def launch_local_workers(n: Optional[int] = None) -> LocalWorkerPool:
+    """`n` workers locaux (par défaut : un par paire de cœurs)."""
+    return LocalWorkerPool(n or max(1, (os.cpu_count() or 2) // 2))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(description="Worker de rendu distribué Luminare.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=DEFAULT_PORT, help="0 = port libre choisi par le système")
+    args = ap.parse_args(argv)
+    with RenderWorkerServer((args.host, args.port)) as server:
+        host, port = server.server_address[:2]
+        print(f"LISTENING {host} {port}", flush=True)
+        # La suite des journaux part sur stderr : stdout n'est lu qu'une fois
+        os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,9 @@
 import abc
+import threading
+import time
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
 from core.project import Project
 from core.export.export_profile import ExportProfile
 
@@ -7,20 +11,132 @@ class RenderError(Exception):
     """Exception personnalisée pour les échecs de rendu."""
     pass
 
+class RenderCancelled(RenderError):
+    """Le rendu a été interrompu à la demande de l'appelant."""
+    pass
+
+@dataclass
+class RenderProgress:
+    """Instantané de progression d'un rendu (agrégé sur tous les processus ffmpeg)."""
+    frame: int = 0
+    fps: float = 0.0
+    speed: float = 0.0
+    out_time_s: float = 0.0
+    total_s: float = 0.0
+    percent: float = 0.0
+    eta_s: Optional[float] = None
+
+class RenderMonitor:
+    """
+    Lien entre un rendu et son appelant : agrège la progression des tâches
+    ffmpeg (une par partie, piste audio, etc.) et porte la demande d'annulation.
+    Thread-safe : les tâches peuvent tourner dans un pool.
+    """
+
+    def __init__(self,
+                 on_progress: Optional[Callable[[RenderProgress], None]] = None,
+                 cancel_event: Optional[threading.Event] = None):
+        self.on_progress = on_progress
+        self.cancel_event = cancel_event or threading.Event()
+        self._lock = threading.Lock()
+        self._tasks: Dict[str, Tuple[float, float]] = {}
+        self._state: Dict[str, Tuple[float, int, float, float]] = {}
+        self._started = time.monotonic()
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    def cancel(self) -> None:
+        self.cancel_event.set()
+
+    def check(self) -> None:
+        """Lève RenderCancelled si l'annulation a été demandée."""
+        if self.cancel_event.is_set():
+            raise RenderCancelled("Rendu annulé.")
+
+    def add_task(self, key: str, duration_s: float, weight: Optional[float] = None) -> None:
+        """
+        Déclare une tâche et sa durée média. Le poids dans la progression
+        globale vaut la durée par défaut (une piste audio, bien plus rapide
+        à encoder, peut être déclarée plus légère).
+        """
+        duration_s = max(0.0, float(duration_s))
+        with self._lock:
+            self._tasks[key] = (duration_s, duration_s if weight is None else max(0.0, weight))
+
+    def update(self, key: str, out_time_s: float, frame: int = 0,
+               fps: float = 0.0, speed: float = 0.0) -> None:
+        """Met à jour une tâche (appelé par le lecteur de '-progress')."""
+        with self._lock:
+            if key not in self._tasks:
+                return
+            self._state[key] = (max(0.0, out_time_s), frame, fps, speed)
+            snapshot = self._snapshot()
+        if self.on_progress:
+            self.on_progress(snapshot)
+
+    def finish(self, key: str) -> None:
+        """Marque une tâche comme terminée (100 %)."""
+        with self._lock:
+            if key not in self._tasks:
+                return
+            _, frame, _, _ = self._state.get(key, (0.0, 0, 0.0, 0.0))
+            self._state[key] = (self._tasks[key][0], frame, 0.0, 0.0)
+            snapshot = self._snapshot()
+        if self.on_progress:
+            self.on_progress(snapshot)
+
+    def _snapshot(self) -> RenderProgress:
+        total = sum(w for _, w in self._tasks.values())
+        done = 0.0
+        for key, st in self._state.items():
+            dur, weight = self._tasks[key]
+            done += weight * (min(1.0, st[0] / dur) if dur > 0 else 1.0)
+        fraction = (done / total) if total > 0 else 0.0
+        elapsed = time.monotonic() - self._started
+        eta = elapsed * (1.0 - fraction) / fraction if fraction > 1e-3 else None
+        return RenderProgress(
+            frame=sum(st[1] for st in self._state.values()),
+            fps=sum(st[2] for st in self._state.values()),
+            speed=sum(st[3] for st in self._state.values()),
+            out_time_s=sum(min(st[0], self._tasks[k][0]) for k, st in self._state.items()),
+            total_s=sum(d for d, _ in self._tasks.values()),
+            percent=100.0 * fraction,
+            eta_s=eta,
+        )
+
 class IRenderEngine(abc.ABC):
     """
     Interface abstraite (le contrat) pour un moteur de rendu vidéo.
     """
-    
+
     @abc.abstractmethod
-    def render(self, 
-               project: Project, 
-               output_path: Path, 
-               profile: ExportProfile) -> None:
+    def render(self,
+               project: Project,
+               output_path: Path,
+               profile: ExportProfile,
+               monitor: Optional[RenderMonitor] = None) -> None:
         """
         Effectue le rendu d'un objet Project vers un fichier de sortie
         en utilisant un profil d'exportation spécifique.
-        
-        Doit lever une 'RenderError' en cas d'échec.
+
+        `monitor` (optionnel) reçoit la progression et porte l'annulation.
+
+        Doit lever une 'RenderError' en cas d'échec
+        (ou 'RenderCancelled' si le rendu a été annulé).
+        """
+        pass
+
+    def render_multi(self,
+                     project: Project,
+                     targets: List[Tuple[ExportProfile, Path]],
+                     monitor: Optional[RenderMonitor] = None) -> None:
+        """
+        Produit plusieurs sorties (profil, chemin) du même projet.
+
+        Implémentation par défaut : un rendu complet par sortie. Les moteurs
+        capables de partager le décodage et les filtres la redéfinissent.
         """
-        pass
\ No newline at end of file
+        for profile, output_path in targets:
+            self.render(project, output_path, profile, monitor)
@@ -0,0 +1,125 @@
+# core/export/export_job.py
+from __future__ import annotations
+import copy
+import threading
+from pathlib import Path
+from typing import Optional, Tuple, TYPE_CHECKING
+
+from PySide6.QtCore import QObject, Signal, QTimer, QCoreApplication
+
+from core.project import Project
+from core.export.engine_interface import RenderError, RenderCancelled, RenderMonitor, RenderProgress
+from core.export.export_profile import ExportProfile
+
+if TYPE_CHECKING:
+    from core.export.export_service import ExportService
+
+
+class ExportJob(QObject):
+    """
+    Export asynchrone : le moteur tourne dans un thread de travail, la
+    progression ('-progress' de ffmpeg) remonte par signaux Qt, et cancel()
+    tue les processus ffmpeg puis supprime la sortie partielle.
+
+    Le projet est copié au lancement : l'éditeur peut continuer à le modifier.
+    """
+    progress = Signal(object)   # RenderProgress (frame, fps, speed, eta_s, percent…)
+    finished = Signal(str)      # chemin du fichier exporté
+    failed = Signal(str)        # message d'erreur
+    cancelled = Signal()
+
+    def __init__(self,
+                 service: "ExportService",
+                 proj: Project,
+                 out_path: Path,
+                 profile: Optional[ExportProfile] = None,
+                 fallback_src: Optional[str] = None,
+                 parent: Optional[QObject] = None,
+                 time_range: Optional[Tuple[float, float]] = None,
+                 incremental: bool = False):
+        super().__init__(parent)
+        self._service = service
+        self._project = copy.deepcopy(proj)
+        self.out_path = Path(out_path)
+        self._profile = profile
+        self._fallback_src = fallback_src
+        self._time_range = time_range
+        self._incremental = incremental
+        self._monitor = RenderMonitor(on_progress=self._on_progress)
+        self._thread: Optional[threading.Thread] = None
+        self.last_progress: Optional[RenderProgress] = None
+        # État terminal consultable sans signaux : running/finished/failed/cancelled
+        self.state = "pending"
+        self.result: Optional[str] = None
+        self.error: Optional[str] = None
+
+    # --- API ---
+    def start_soon(self) -> "ExportJob":
+        """
+        Démarre au prochain tour de la boucle Qt, pour que l'appelant ait le
+        temps de connecter les signaux ; démarre tout de suite sans boucle Qt.
+        """
+        if QCoreApplication.instance() is not None:
+            QTimer.singleShot(0, self.start)
+        else:
+            self.start()
+        return self
+
+    def start(self) -> "ExportJob":
+        if self._thread is not None:
+            return self
+        self.state = "running"
+        self._thread = threading.Thread(target=self._run, name=f"export-{self.out_path.name}", daemon=True)
+        self._thread.start()
+        return self
+
+    def cancel(self) -> None:
+        """Demande l'arrêt : les processus ffmpeg en cours sont tués."""
+        self._monitor.cancel()
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Attend la fin du job (utile hors boucle Qt). Retourne False si timeout."""
+        if self._thread is None:
+            return self.state != "pending"
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    # --- Worker ---
+    def _on_progress(self, info: RenderProgress) -> None:
+        self.last_progress = info
+        self.progress.emit(info)
+
+    def _run(self) -> None:
+        try:
+            result = self._service.export_project(
+                self._project, self.out_path, self._profile,
+                fallback_src=self._fallback_src, monitor=self._monitor,
+                time_range=self._time_range, incremental=self._incremental)
+        except RenderCancelled:
+            self._cleanup_partial_output()
+            print(f"Export annulé : {self.out_path}")
+            self.state = "cancelled"
+            self.cancelled.emit()
+        except Exception as e:
+            self._cleanup_partial_output()
+            self.error = str(e) if isinstance(e, RenderError) else f"Erreur inattendue : {e}"
+            self.state = "failed"
+            self.failed.emit(self.error)
+        else:
+            self.result = result
+            self.state = "finished"
+            self.finished.emit(result)
+
+    def _cleanup_partial_output(self) -> None:
+        try:
+            self.out_path.unlink(missing_ok=True)
+            if self._profile is not None and self._profile.is_hls:
+                # segments et init déjà écrits à côté de la playlist
+                for seg in self.out_path.parent.glob(f"{self.out_path.stem}_*.m4s"):
+                    seg.unlink(missing_ok=True)
+                (self.out_path.parent / f"{self.out_path.stem}_init.mp4").unlink(missing_ok=True)
+        except OSError as e:
+            print(f"Impossible de supprimer la sortie partielle {self.out_path} : {e}")
@@ -1,5 +1,11 @@
 from dataclasses import dataclass, field
-from typing import Dict, Any
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+
+# MP4 fragmenté : lisible pendant l'écriture, sans passe de réécriture finale
+FRAGMENTED_MOVFLAGS = '+frag_keyframe+empty_moov+default_base_moof'
+# MP4 classique avec l'index en tête (réécrit tout le fichier en fin d'export)
+FASTSTART_MOVFLAGS = '+faststart'
 
 @dataclass
 class ExportProfile:
@@ -16,11 +22,27 @@ class ExportProfile:
     acodec: str = 'aac'
     audio_bitrate: str = '192k'
     
-    movflags: str = '+faststart'
+    movflags: str = FRAGMENTED_MOVFLAGS
+
+    # Conteneur : "mp4" (movflags ci-dessus) ou "hls" (playlist .m3u8 + segments
+    # fMP4, playlist mise à jour à chaque segment terminé)
+    container: str = 'mp4'
+    hls_time: float = 4.0
+
+    # Intervalle d'images clés forcé (s) ; fixe la taille des fragments/segments
+    gop_s: Optional[float] = None
+
+    # Sortie écrite au fil du rendu (un seul processus ffmpeg, pas de parties
+    # assemblées à la fin) : la relecture peut commencer pendant l'export
+    progressive: bool = False
+
+    # Résolution de sortie ; None = résolution du projet (sinon mise à l'échelle
+    # en fin de chaîne, après les filtres et overlays partagés)
+    resolution: Optional[Tuple[int, int]] = None
     
     extra_output_args: Dict[str, Any] = field(default_factory=dict)
 
-    def to_ffmpeg_args(self) -> Dict[str, Any]:
+    def to_ffmpeg_args(self, output_path: Optional[Path] = None) -> Dict[str, Any]:
         """Convertit le profil en dictionnaire pour ffmpeg.output()."""
         args = {
             "vcodec": self.vcodec,
@@ -29,15 +51,55 @@ class ExportProfile:
             "pix_fmt": self.pix_fmt,
             "acodec": self.acodec,
             "audio_bitrate": self.audio_bitrate,
-            "movflags": self.movflags,
         }
+        if self.gop_s:
+            args["force_key_frames"] = f"expr:gte(t,n_forced*{self.gop_s})"
+        args.update(self.to_container_args(output_path))
         args.update(self.extra_output_args)
-        
-        if not self.movflags:
-            del args["movflags"]
-            
         return args
 
+    def to_container_args(self, output_path: Optional[Path] = None) -> Dict[str, Any]:
+        """Options du conteneur de sortie (aussi utilisées pour l'assemblage en copie)."""
+        if self.container == 'hls':
+            args = {
+                "f": "hls",
+                "hls_time": self.hls_time,
+                # "event" : la playlist grandit à chaque segment, ENDLIST à la fin
+                "hls_playlist_type": "event",
+                "hls_segment_type": "fmp4",
+                "hls_flags": "independent_segments+temp_file",
+            }
+            if output_path is not None:
+                out = Path(output_path)
+                args["hls_segment_filename"] = str(out.parent / f"{out.stem}_%05d.m4s")
+                args["hls_fmp4_init_filename"] = f"{out.stem}_init.mp4"
+            return args
+        return {"movflags": self.movflags} if self.movflags else {}
+
+    @property
+    def is_hls(self) -> bool:
+        return self.container == 'hls'
+
+    def to_video_args(self) -> Dict[str, Any]:
+        """Paramètres d'encodage vidéo seuls (rendu de parties sans audio)."""
+        args = {
+            "vcodec": self.vcodec,
+            "preset": self.preset,
+            "crf": self.crf,
+            "pix_fmt": self.pix_fmt,
+        }
+        if self.gop_s:
+            args["force_key_frames"] = f"expr:gte(t,n_forced*{self.gop_s})"
+        args.update(self.extra_output_args)
+        return args
+
+    def to_audio_args(self) -> Dict[str, Any]:
+        """Paramètres d'encodage audio seuls (piste audio rendue à part)."""
+        return {
+            "acodec": self.acodec,
+            "audio_bitrate": self.audio_bitrate,
+        }
+
 DEFAULT_PROFILES = {
     "h264_medium": ExportProfile(
         name="H.264 Medium (MP4)",
@@ -49,4 +111,31 @@ DEFAULT_PROFILES = {
         preset="ultrafast",
         crf=26
     ),
+    "h264_web_720p": ExportProfile(
+        name="H.264 Web 720p (MP4)",
+        description="Version web allégée en 1280x720.",
+        preset="fast",
+        crf=23,
+        audio_bitrate="128k",
+        resolution=(1280, 720)
+    ),
+    "h264_review_proxy": ExportProfile(
+        name="H.264 Proxy de relecture (MP4)",
+        description="Proxy basse définition et bas débit pour les retours.",
+        preset="veryfast",
+        crf=30,
+        audio_bitrate="96k",
+        resolution=(640, 360)
+    ),
+    "h264_review_hls": ExportProfile(
+        name="H.264 Relecture progressive (HLS)",
+        description="Playlist HLS écrite pendant l'export : la relecture démarre après quelques secondes.",
+        preset="veryfast",
+        crf=26,
+        audio_bitrate="128k",
+        container="hls",
+        hls_time=4.0,
+        gop_s=2.0,
+        progressive=True
+    ),
 }
\ No newline at end of file
@@ -1,10 +1,12 @@
 from pathlib import Path
 from core.save_system.save_api import ProjectAPI
 from core.project import Project
-from typing import Optional
+from typing import Optional, Sequence, Tuple, List
 
-from core.export.engine_interface import IRenderEngine, RenderError
+from core.export.engine_interface import IRenderEngine, RenderError, RenderMonitor
 from core.export.export_profile import ExportProfile, DEFAULT_PROFILES
+from core.export.resumable import ResumableExport
+from core.export.timeline_slicing import slice_project
 
 class ExportService:
     def __init__(self, engine: IRenderEngine):
@@ -15,6 +17,10 @@ class ExportService:
             raise TypeError("L'objet 'engine' doit implémenter IRenderEngine.")
         self._engine = engine
 
+    @property
+    def engine(self) -> IRenderEngine:
+        return self._engine
+
     def _get_project_or_fallback(self, proj: Project, fallback_src: Optional[str]) -> Project:
         """Crée un projet de fallback si le projet principal est vide."""
         if not proj.clips and fallback_src:
@@ -31,23 +37,65 @@ class ExportService:
             
         return proj
 
+    def _restrict_to_range(self, proj: Project, time_range: Optional[Tuple[float, float]]) -> Project:
+        """
+        Réduit le projet à la plage [début, fin) de la timeline globale : seuls
+        les clips et overlays qui la croisent sont gardés (rognés), les temps
+        des overlays sont recalés sur le début de la plage.
+        """
+        if time_range is None:
+            return proj
+        total = proj.total_duration_s()
+        start, end = max(0.0, float(time_range[0])), min(total, float(time_range[1]))
+        if end <= start:
+            raise RenderError(f"Plage d'export vide ou hors de la timeline : "
+                              f"{time_range[0]:.2f}s – {time_range[1]:.2f}s (durée {total:.2f}s).")
+        if start <= 0.0 and end >= total:
+            return proj
+        return slice_project(proj, start, end)
+
     def export_project(self, 
                          proj: Project, 
                          out_path: Path,
                          profile: Optional[ExportProfile] = None,
-                         fallback_src: str = None) -> str:
+                         fallback_src: str = None,
+                         monitor: Optional[RenderMonitor] = None,
+                         resumable: bool = False,
+                         time_range: Optional[Tuple[float, float]] = None,
+                         incremental: bool = False) -> str:
         """
         Exporte un objet Project en mémoire.
-        C'est la méthode principale.
+        C'est la méthode principale (bloquante ; voir export_async).
+
+        `resumable=True` écrit des parties et un manifest dans
+        `<sortie>.parts/` : relancer le même export reprend où il s'était arrêté.
+        Ignoré (rendu par render() du moteur) si le moteur ne rend pas par
+        parties (voir ResumableExport.supports).
+
+        `time_range=(début, fin)` (secondes sur la timeline) n'exporte que
+        cette plage, par ex. entre les marques entrée/sortie de l'éditeur.
+
+        `incremental=True` garde les flux vidéo et audio de l'export dans le
+        cache de l'app : réexporter vers le même fichier ne re-rend que le
+        flux dont les entrées ont changé, puis réassemble en copie de flux.
         """
         active_profile = profile or DEFAULT_PROFILES["h264_medium"]
         
         try:
             effective_proj = self._get_project_or_fallback(proj, fallback_src)
+            effective_proj = self._restrict_to_range(effective_proj, time_range)
             
             print(f"Lancement de l'export vers {out_path} avec profil '{active_profile.name}'...")
             
-            self._engine.render(effective_proj, out_path, active_profile)
+            if (resumable or incremental) and not ResumableExport.supports(self._engine):
+                print(f"Export avec reprise indisponible avec {type(self._engine).__name__} : "
+                      f"rendu complet par le moteur.")
+                resumable = incremental = False
+            if resumable or incremental:
+                ResumableExport(self._engine, keep_streams=incremental).export(
+                    effective_proj, Path(out_path), active_profile, monitor)
+            else:
+                self._engine.render(effective_proj, out_path, active_profile, monitor)
             
             print(f"Exportation terminée avec succès : {out_path}")
             return str(out_path)
@@ -59,6 +107,55 @@ class ExportService:
             print(f"ERREUR INATTENDUE (ExportService) : {e}")
             raise RenderError(f"Erreur inattendue dans le service: {e}")
 
+    def export_project_multi(self,
+                             proj: Project,
+                             targets: Sequence[Tuple[ExportProfile, Path]],
+                             fallback_src: str = None,
+                             monitor: Optional[RenderMonitor] = None,
+                             time_range: Optional[Tuple[float, float]] = None) -> List[str]:
+        """
+        Exporte le projet vers plusieurs livrables (profil, chemin) en une
+        passe : décodage et filtres partagés, un encodeur par profil.
+        `time_range` : comme pour export_project.
+        """
+        if not targets:
+            raise RenderError("Aucune sortie demandée.")
+        targets = [(profile, Path(out_path)) for profile, out_path in targets]
+
+        try:
+            effective_proj = self._get_project_or_fallback(proj, fallback_src)
+            effective_proj = self._restrict_to_range(effective_proj, time_range)
+
+            names = ", ".join(f"{p.name} -> {o}" for p, o in targets)
+            print(f"Lancement de l'export multi-sorties : {names}")
+
+            self._engine.render_multi(effective_proj, targets, monitor)
+
+            print(f"Exportation multi-sorties terminée ({len(targets)} fichiers).")
+            return [str(o) for _, o in targets]
+
+        except RenderError as e:
+            print(f"ERREUR D'EXPORTATION : {e}")
+            raise
+        except Exception as e:
+            print(f"ERREUR INATTENDUE (ExportService) : {e}")
+            raise RenderError(f"Erreur inattendue dans le service: {e}")
+
+    def export_async(self,
+                     proj: Project,
+                     out_path: Path,
+                     profile: Optional[ExportProfile] = None,
+                     fallback_src: str = None,
+                     time_range: Optional[Tuple[float, float]] = None,
+                     incremental: bool = False):
+        """
+        Lance l'export dans un thread de travail et retourne immédiatement
+        un ExportJob (signaux progress/finished/failed/cancelled, cancel()).
+        """
+        # Import local : le chemin synchrone (rendu headless) n'a pas besoin de Qt
+        from core.export.export_job import ExportJob
+        return ExportJob(self, proj, out_path, profile, fallback_src,
+                         time_range=time_range, incremental=incremental).start_soon()
 
     def export_from_file(self, 
                          filename: str, 
@@ -1,52 +1,71 @@
 import ffmpeg
 from pathlib import Path
-from core.project import Project, Clip, TextOverlay, Filters
-from core.export.engine_interface import IRenderEngine, RenderError
+from typing import Optional
+from core.project import Project, Clip, TextOverlay, ImageOverlay
+from core.export.engine_interface import IRenderEngine, RenderError, RenderMonitor
+from core.export.ffmpeg_runner import run_ffmpeg
 from core.export.export_profile import ExportProfile
+from core.export.image_cache import OverlayImageCache
+from core.export import ass_subtitles
+from core.export import loudness
+from core.export.timeline_slicing import slice_project, plan_segments, TimeRange
+from core.export.render_graph import RenderGraph, SourceNode, FilterOp
 
 class FfmpegRenderEngine(IRenderEngine):
     """Implémentation du moteur de rendu utilisant ffmpeg-python."""
 
+    # Écart max (s) entre deux segments d'une même source pour partager l'entrée ;
+    # au-delà, une nouvelle entrée avec seek coûte moins que décoder le trou.
+    shared_input_max_gap_s: Optional[float] = 30.0
+
+    # Poids relatifs (vs. la vidéo) des tâches audio et d'assemblage dans la progression
+    AUDIO_TASK_WEIGHT = 0.1
+    CONCAT_TASK_WEIGHT = 0.02
+
+    # Rendu des titres : "drawtext" (un filtre par overlay), "ass" (un seul
+    # filtre libass pour tous) ou "auto" (ass dès ASS_MIN_OVERLAYS overlays)
+    text_backend: str = "auto"
+    ASS_MIN_OVERLAYS = 8
+
+    # Images d'overlay pré-redimensionnées (partagé entre les rendus)
+    overlay_cache = OverlayImageCache()
+
+    # Graphe vidéo : passes d'optimisation (render_graph) et affichage de l'IR
+    optimize_graph: bool = True
+    dump_graph: bool = False
+
+    # Normalisation audio en deux passes : mesures par plage source, en cache
+    loudness_analyzer = loudness.LoudnessAnalyzer()
+
+    @staticmethod
+    def part_task(start: float) -> str:
+        """Clé de progression d'une partie vidéo."""
+        return f"part:{start:.3f}"
+
+    def supports_resume(self) -> bool:
+        """
+        Vrai si le moteur peut rendre comme ResumableExport : parties vidéo
+        (plan_parts / render_part_file), piste audio, puis assemblage en
+        copie. Les moteurs qui rendent autrement (frame server, workers
+        distants) retournent False.
+        """
+        return True
+
     def render(self, 
                project: Project, 
                output_path: Path, 
-               profile: ExportProfile) -> None:
+               profile: ExportProfile,
+               monitor: Optional[RenderMonitor] = None) -> None:
         """
         Construit et exécute la commande FFmpeg 
         basée sur l'objet Project et le Profil.
         """
         try:
-            fps = project.fps
-            w, h = project.resolution
-
-            # Charger et trimmer chaque clip
-            videos, audios = [], []
-            for clip_data in project.clips:
-                v, a = self._make_trimmed_stream(clip_data, fps)
-                videos.append(v); audios.append(a)
-            
-            if not videos:
-                raise RenderError("Le projet est vide, aucun clip à exporter.")
-
-            # Concat
-            concat = ffmpeg.concat(*[x for pair in zip(videos, audios) for x in pair],
-                                   v=1, a=1).node
-            vcat, acat = concat[0], concat[1]
-
-            # Filtres vidéo globaux
-            v = self._build_filter_chain(vcat, project.filters, w, h)
-
-            # Overlays de texte
-            v = self._apply_text_overlays(v, project.text_overlays)
-
-            # Audio
-            a = acat
-            if project.audio_normalize:
-                a = a.filter('loudnorm', i='-16', tp='-1.5', lra='11')
+            v, a = self._build_streams(project, profile=profile)
 
             # Encodage (utilisation de profil)
-            encoding_args = profile.to_ffmpeg_args()
-            encoding_args['r'] = fps
+            encoding_args = profile.to_ffmpeg_args(output_path)
+            encoding_args['r'] = project.fps
 
             output_path.parent.mkdir(parents=True, exist_ok=True)
             stream = ffmpeg.output(
@@ -55,40 +74,382 @@ class FfmpegRenderEngine(IRenderEngine):
             )
             
             print("Commande FFmpeg :", ffmpeg.compile(stream))
-            ffmpeg.run(stream, overwrite_output=True) 
+            run_ffmpeg(stream, monitor, "main", project.total_duration_s())
+
+        except ffmpeg.Error as e:
+            error_msg = e.stderr.decode() if e.stderr else str(e)
+            print("Erreur FFmpeg :", error_msg)
+            raise RenderError(f"Échec du rendu FFmpeg : {error_msg}")
+        except RenderError:
+            raise
+        except Exception as e:
+            raise RenderError(f"Erreur inattendue lors du rendu : {e}")
+
+    def render_multi(self,
+                     project: Project,
+                     targets: list[tuple[ExportProfile, Path]],
+                     monitor: Optional[RenderMonitor] = None) -> None:
+        """
+        Un seul graphe pour plusieurs sorties : décodage, trim, concat, eq et
+        overlays sont faits une fois, puis 'split'/'asplit' alimentent une mise
+        à l'échelle et un encodeur par profil (encodés en parallèle par ffmpeg).
+        """
+        if len(targets) == 1:
+            profile, output_path = targets[0]
+            return self.render(project, output_path, profile, monitor)
+        try:
+            v, a = self._build_streams(project)
+            vsplit = v.split()
+            asplit = a.filter_multi_output('asplit')
+
+            outputs = []
+            for k, (profile, output_path) in enumerate(targets):
+                output_path.parent.mkdir(parents=True, exist_ok=True)
+                encoding_args = profile.to_ffmpeg_args(output_path)
+                encoding_args['r'] = project.fps
+                vk = self._scale_for_profile(vsplit[k], project, profile)
+                outputs.append(ffmpeg.output(vk, asplit[k], str(output_path), **encoding_args))
 
+            stream = ffmpeg.merge_outputs(*outputs)
+            print("Commande FFmpeg :", ffmpeg.compile(stream))
+            run_ffmpeg(stream, monitor, "main", project.total_duration_s())
         except ffmpeg.Error as e:
             error_msg = e.stderr.decode() if e.stderr else str(e)
             print("Erreur FFmpeg :", error_msg)
             raise RenderError(f"Échec du rendu FFmpeg : {error_msg}")
+        except RenderError:
+            raise
         except Exception as e:
             raise RenderError(f"Erreur inattendue lors du rendu : {e}")
+
+    # --- Rendu par parties (utilisé par les moteurs segmentés) ---
+
+    def plan_parts(self, project: Project, profile: ExportProfile, segment_s: float) -> list:
+        """Plages vidéo d'un export par parties (ResumableExport), dans l'ordre de la timeline."""
+        return plan_segments(project, segment_s)
+
+    @staticmethod
+    def part_from_dict(data: dict):
+        """Plage relue d'un manifest (inverse de dataclasses.asdict sur plan_parts)."""
+        return TimeRange(data["start"], data["end"])
+
+    def render_part_file(self,
+                         project: Project,
+                         rng,
+                         output_path: Path,
+                         profile: ExportProfile,
+                         monitor: Optional[RenderMonitor] = None) -> None:
+        """Produit la partie `rng` de plan_parts dans `output_path` (MPEG-TS)."""
+        self.render_video_part(project, rng.start, rng.end, output_path, profile, monitor)
+
+    def render_video_part(self,
+                          project: Project,
+                          start: float,
+                          end: float,
+                          output_path: Path,
+                          profile: ExportProfile,
+                          monitor: Optional[RenderMonitor] = None) -> None:
+        """
+        Encode uniquement la vidéo de la plage [start, end) de la timeline
+        dans un fichier MPEG-TS intermédiaire, concaténable sans ré-encodage.
+        """
+        self.render_video_part_multi(project, start, end, [(profile, output_path)], monitor)
+
+    def render_video_part_multi(self,
+                                project: Project,
+                                start: float,
+                                end: float,
+                                targets: list[tuple[ExportProfile, Path]],
+                                monitor: Optional[RenderMonitor] = None) -> None:
+        """Variante multi-sorties : une partie, un décodage, un fichier TS par profil."""
+        part = slice_project(project, start, end)
+        try:
+            single = targets[0][0] if len(targets) == 1 else None
+            v, _ = self._build_streams(part, audio=False, profile=single)
+            vsplit = v.split() if len(targets) > 1 else None
+            outputs = []
+            for k, (profile, output_path) in enumerate(targets):
+                args = profile.to_video_args()
+                args['r'] = project.fps
+                vk = vsplit[k] if vsplit else v
+                if vsplit:
+                    vk = self._scale_for_profile(vk, project, profile)
+                outputs.append(ffmpeg.output(vk, str(output_path), an=None, f='mpegts', **args))
+            stream = outputs[0] if len(outputs) == 1 else ffmpeg.merge_outputs(*outputs)
+            run_ffmpeg(stream, monitor, self.part_task(start), end - start)
+        except ffmpeg.Error as e:
+            error_msg = e.stderr.decode() if e.stderr else str(e)
+            raise RenderError(f"Échec du rendu de la partie [{start:.3f}, {end:.3f}) : {error_msg}")
+        except RenderError:
+            raise
+        except Exception as e:
+            raise RenderError(f"Erreur inattendue lors du rendu de la partie : {e}")
+
+    def render_audio_track(self,
+                           project: Project,
+                           output_path: Path,
+                           profile: ExportProfile,
+                           monitor: Optional[RenderMonitor] = None,
+                           task: str = "audio") -> None:
+        """
+        Encode la piste audio de toute la timeline en une seule passe (Matroska),
+        pour que 'loudnorm' mesure le programme entier et non chaque partie.
+        """
+        try:
+            _, a = self._build_streams(project, video=False)
+            stream = ffmpeg.output(a, str(output_path), vn=None, f='matroska',
+                                   **profile.to_audio_args())
+            total = project.total_duration_s()
+            run_ffmpeg(stream, monitor, task, total, weight=total * self.AUDIO_TASK_WEIGHT)
+        except ffmpeg.Error as e:
+            error_msg = e.stderr.decode() if e.stderr else str(e)
+            raise RenderError(f"Échec du rendu audio : {error_msg}")
+        except RenderError:
+            raise
+        except Exception as e:
+            raise RenderError(f"Erreur inattendue lors du rendu audio : {e}")
+
+    def concat_parts(self,
+                     part_paths: list[Path],
+                     audio_path: Optional[Path],
+                     output_path: Path,
+                     profile: ExportProfile,
+                     monitor: Optional[RenderMonitor] = None,
+                     duration_s: float = 0.0,
+                     task: str = "concat") -> None:
+        """
+        Assemble les parties vidéo via le démultiplexeur 'concat' et y ajoute
+        la piste audio, le tout en copie de flux (aucun ré-encodage).
+        """
+        list_path = output_path.parent / f".{output_path.name}.concat.txt"
+        try:
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            lines = []
+            for p in part_paths:
+                escaped = Path(p).resolve().as_posix().replace("'", "'\\''")
+                lines.append(f"file '{escaped}'")
+            list_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+            streams = [ffmpeg.input(str(list_path), f='concat', safe=0)['v']]
+            if audio_path is not None:
+                streams.append(ffmpeg.input(str(audio_path))['a'])
+
+            args = {'c': 'copy'}
+            args.update(profile.to_container_args(output_path))
+            stream = ffmpeg.output(*streams, str(output_path), **args)
+            run_ffmpeg(stream, monitor, task, duration_s,
+                       weight=duration_s * self.CONCAT_TASK_WEIGHT)
+        except ffmpeg.Error as e:
+            error_msg = e.stderr.decode() if e.stderr else str(e)
+            raise RenderError(f"Échec de l'assemblage des parties : {error_msg}")
+        finally:
+            list_path.unlink(missing_ok=True)
+
+    # --- Construction du graphe ---
+
+    def video_graph(self, project: Project, profile: Optional[ExportProfile] = None) -> RenderGraph:
+        """
+        Graphe vidéo (IR) du projet, optimisé si optimize_graph. Avec un
+        profil, il inclut la mise à l'échelle de sortie.
+        """
+        output_size = tuple(profile.resolution) if profile and profile.resolution else None
+        graph = RenderGraph.build(project, self._group_clip_sources(project.clips), output_size)
+        if self.optimize_graph:
+            graph.optimize()
+        return graph
+
+    def _build_streams(self, project: Project, video: bool = True, audio: bool = True,
+                       profile: Optional[ExportProfile] = None):
+        """
+        Construit les flux filtrés (vidéo, audio) de la timeline.
+        Le flux non demandé vaut None. Avec `profile`, la vidéo est déjà à
+        la résolution du profil (sinon, voir _scale_for_profile).
+        """
+        fps = project.fps
+        w, h = project.resolution
+
+        if not project.clips:
+            raise RenderError("Le projet est vide, aucun clip à exporter.")
+        if video:
+            graph = self.video_graph(project, profile)
+            if self.dump_graph:
+                print(graph.dump())
+        else:
+            # audio seul : mêmes entrées, inutile de sonder ou d'optimiser
+            graph = RenderGraph.build(project, self._group_clip_sources(project.clips))
+
+        # Une entrée par source, un trim par clip
+        pairs = [None] * len(project.clips)
+        for src in graph.sources:
+            inp = ffmpeg.input(src.path, **src.input_args)
+            vids = self._lower_source_video(inp, src) if video else [None] * len(src.segments)
+            auds = self._lower_source_audio(inp, src) if audio else [None] * len(src.segments)
+            for i, v, a in zip(src.clip_indices, vids, auds):
+                pairs[i] = (v, a)
+
+        # Concat
+        segments = []
+        for v, a in pairs:
+            if video:
+                segments.append(v)
+            if audio:
+                segments.append(a)
+        concat = ffmpeg.concat(*segments, v=int(video), a=int(audio)).node
+
+        v = a = None
+        if video:
+            # Filtres vidéo globaux
+            v = self._apply_ops(concat[0], graph.video_ops)
+
+            # Overlays d'images (logos, synthés), sous les titres
+            v = self._apply_image_overlays(v, project.image_overlays, w, h, fps,
+                                           project.total_duration_s())
+
+            # Overlays de texte
+            v = self._apply_text(v, project.text_overlays, w, h)
+
+            # Mise à l'échelle du profil (si elle n'a pas été avancée)
+            v = self._apply_ops(v, graph.output_ops)
+
+        if audio:
+            a = concat[1 if video else 0]
+            if project.audio_normalize:
+                a = self._normalize_audio(a, project)
+
+        return v, a
+
+    @staticmethod
+    def _apply_ops(stream, ops: list[FilterOp]):
+        for op in ops:
+            stream = stream.filter(op.name, *op.args, **op.kwargs)
+        return stream
+
+    def _lower_source_video(self, inp, src: SourceNode) -> list:
+        """
+        Chaîne commune de la source (une seule fois), puis 'split' vers un
+        trim par segment quand plusieurs clips partagent l'entrée.
+        """
+        vid = self._apply_ops(inp['v'], src.ops)
+        branches = vid.split() if len(src.segments) > 1 else None
+        streams = []
+        for k, (start, dur) in enumerate(src.segments):
+            trim = {'start': start, 'duration': dur} if start > 0 else {'duration': dur}
+            streams.append((branches[k] if branches else vid).trim(**trim).setpts('PTS-STARTPTS'))
+        return streams
+
+    def _lower_source_audio(self, inp, src: SourceNode) -> list:
+        aud = inp['a'].filter_('asetpts', 'PTS-STARTPTS')
+        branches = aud.filter_multi_output('asplit') if len(src.segments) > 1 else None
+        streams = []
+        for k, (start, dur) in enumerate(src.segments):
+            trim = {'start': start, 'duration': dur} if start > 0 else {'duration': dur}
+            streams.append((branches[k] if branches else aud)
+                           .filter_('atrim', **trim)
+                           .filter_('asetpts', 'PTS-STARTPTS'))
+        return streams
     
-    def _make_trimmed_stream(self, clip: Clip, fps: int):
-        inp = ffmpeg.input(clip.path)
-        start = clip.in_s
-        end = clip.out_s if clip.out_s > 0 else (clip.in_s + clip.duration_s)
-        dur = max(0, end - start)
-        
-        vid_stream = (inp['v']
-                      .trim(start=start, duration=dur).setpts('PTS-STARTPTS')
-                      .filter('fps', fps=fps))
-        aud_stream = (inp['a']
-                      .filter_('atrim', start=start, duration=dur)
-                      .filter_('asetpts', 'PTS-STARTPTS'))
-
-        return vid_stream, aud_stream
-
-    def _build_filter_chain(self, vid, filters: Filters, w: int, h: int):
-        vid = vid.filter("scale", w, h)
-        vid = vid.filter('eq',
-                         brightness=filters.brightness,
-                         contrast=filters.contrast,
-                         saturation=filters.saturation)
-        if filters.vignette:
-            vid = vid.filter('vignette', angle='PI/4', x0='w/2', y0='h/2')
+    def _normalize_audio(self, aud, project: Project):
+        """
+        Seconde passe de loudnorm, linéaire : un gain constant calculé depuis
+        les mesures des plages sources (première passe, en cache). Sans mesure
+        exploitable, on retombe sur le loudnorm dynamique en une passe.
+        """
+        target = dict(i=loudness.TARGET_I, tp=loudness.TARGET_TP, lra=loudness.TARGET_LRA)
+        try:
+            measured = self.loudness_analyzer.measure_timeline(project.clips)
+        except Exception as e:
+            print(f"Analyse de loudness échouée, normalisation dynamique : {e}")
+            measured = None
+        if measured is None:
+            return aud.filter('loudnorm', **target)
+
+        # loudnorm repasse en mode dynamique si la LRA mesurée dépasse la cible
+        target['lra'] = max(loudness.TARGET_LRA, round(measured.input_lra + 0.1, 1))
+        return aud.filter('loudnorm', **target,
+                          measured_i=round(measured.input_i, 2),
+                          measured_tp=round(measured.input_tp, 2),
+                          measured_lra=round(measured.input_lra, 2),
+                          measured_thresh=round(measured.input_thresh, 2),
+                          offset=0.0, linear='true')
+
+    def _scale_for_profile(self, vid, project: Project, profile: ExportProfile):
+        """Mise à l'échelle finale si le profil impose une autre résolution."""
+        if profile.resolution and tuple(profile.resolution) != tuple(project.resolution):
+            w, h = profile.resolution
+            vid = vid.filter('scale', w, h)
         return vid
 
+    def _group_clip_sources(self, clips: list[Clip]) -> list[list[int]]:
+        """
+        Regroupe (dans l'ordre de la timeline) les indices des clips pouvant
+        partager une même entrée ffmpeg : même fichier, points d'entrée croissants
+        sans chevauchement, et écart limité entre deux segments consécutifs.
+
+        La monotonie garantit que le 'split' ne met jamais d'images en attente :
+        la source est lue une seule fois, dans l'ordre où la concat la consomme.
+        """
+        eps = 1e-6
+        runs: list[list[int]] = []
+        open_runs: dict[str, tuple[list[int], float]] = {}
+        for i, c in enumerate(clips):
+            start = c.in_s
+            end = c.out_s if c.out_s > 0 else (c.in_s + c.duration_s)
+            if end - start <= 0:
+                runs.append([i])
+                continue
+            current = open_runs.get(c.path)
+            if current is not None:
+                run, last_end = current
+                gap = start - last_end
+                if gap >= -eps and (self.shared_input_max_gap_s is None
+                                    or gap <= self.shared_input_max_gap_s):
+                    run.append(i)
+                    open_runs[c.path] = (run, end)
+                    continue
+            run = [i]
+            runs.append(run)
+            open_runs[c.path] = (run, end)
+        return runs
+
+    def render_options(self) -> dict:
+        """Réglages du moteur qui changent l'image rendue (clé du cache de segments)."""
+        return {
+            "text_backend": self.text_backend,
+            "ass_min_overlays": self.ASS_MIN_OVERLAYS,
+            "ass_available": self.text_backend != "drawtext" and ass_subtitles.ass_filter_available(),
+            # l'optimiseur déplace la réduction du profil avant eq/vignette
+            "optimize_graph": self.optimize_graph,
+        }
+
+    def _apply_text(self, vid, overlays: list[TextOverlay], w: int, h: int):
+        """Titres via le backend configuré (voir text_backend)."""
+        backend = self.text_backend
+        if backend == "auto":
+            backend = "ass" if (len(overlays) >= self.ASS_MIN_OVERLAYS
+                                and ass_subtitles.ass_filter_available()) else "drawtext"
+        if backend == "ass" and overlays:
+            return self._apply_ass_overlays(vid, overlays, w, h)
+        return self._apply_text_overlays(vid, overlays)
+
+    def _apply_ass_overlays(self, vid, overlays: list[TextOverlay], w: int, h: int):
+        """
+        Compile les overlays en un document ASS brûlé par un seul filtre 'ass' :
+        libass ne rend que les événements actifs, au lieu d'évaluer N drawtext
+        par image. Les overlays non convertibles (expression de position
+        dépendant du temps, couleur inconnue…) restent en drawtext.
+        """
+        document, rest = ass_subtitles.build_ass(overlays, w, h)
+        if len(rest) < len(overlays):
+            args = {}
+            fontdirs = [Path(ov.fontfile.replace("\\", "/")).parent
+                        for ov in overlays if ov.fontfile]
+            fontdir = next((d for d in fontdirs if d.is_dir()), None)
+            if fontdir is not None:
+                args['fontsdir'] = fontdir.as_posix()
+            ass_path = ass_subtitles.write_ass(document)
+            vid = vid.filter('ass', ass_path.resolve().as_posix(), **args)
+        return self._apply_text_overlays(vid, rest)
+
     def _apply_text_overlays(self, vid, overlays: list[TextOverlay]):
         for ov in overlays:
             fontfile = ov.fontfile.replace("\\", "/") if ov.fontfile else ""
@@ -108,4 +469,75 @@ class FfmpegRenderEngine(IRenderEngine):
                     'boxborderw': ov.boxborderw
                 })
             vid = vid.filter('drawtext', **draw)
-        return vid
\ No newline at end of file
+        return vid
+
+    @staticmethod
+    def _image_overlay_lanes(overlays: list[ImageOverlay]) -> list[list[ImageOverlay]]:
+        """
+        Répartit les overlays en couloirs dont les membres ne se chevauchent
+        pas dans le temps. Un overlay va juste au-dessus du plus haut couloir
+        contenant un overlay antérieur qui le chevauche : l'ordre de la liste
+        reste l'ordre d'empilement là où ils se superposent.
+        """
+        lanes: list[list[ImageOverlay]] = []
+        for ov in overlays:
+            if ov.end <= ov.start:
+                continue
+            level = 0
+            for k, lane in enumerate(lanes):
+                if any(o.start < ov.end and ov.start < o.end for o in lane):
+                    level = k + 1
+            if level == len(lanes):
+                lanes.append([])
+            lanes[level].append(ov)
+        return [sorted(lane, key=lambda o: o.start) for lane in lanes]
+
+    def _apply_image_overlays(self, vid, overlays: list[ImageOverlay],
+                              w: int, h: int, fps: float, duration: float):
+        """
+        Compose les overlays d'images : un seul filtre 'overlay' par couloir.
+        Le flux d'un couloir enchaîne ses images (PNG pré-calculés, tous à la
+        taille du couloir) et des trous transparents ; la position change avec
+        le temps (eval=frame) et 'enable' saute le mélange entre deux images.
+        """
+        for lane in self._image_overlay_lanes(overlays):
+            sizes = [(max(1, round(ov.w * w)), max(1, round(ov.h * h))) for ov in lane]
+            lane_w = max(sw for sw, _ in sizes)
+            lane_h = max(sh for _, sh in sizes)
+
+            pieces, x_expr, y_expr, windows = [], "0", "0", []
+            cursor = 0.0
+            for ov, (sw, sh) in zip(lane, sizes):
+                start = max(cursor, ov.start)
+                end = min(ov.end, duration) if duration > 0 else ov.end
+                if end - start <= 1e-6:
+                    continue
+                if start - cursor > 1e-6:
+                    pieces.append(self._transparent_stream(lane_w, lane_h, fps, start - cursor))
+                png = self.overlay_cache.prepare(ov.path, sw, sh, lane_w, lane_h, ov.opacity)
+                pieces.append(ffmpeg.input(str(png), loop=1, framerate=fps, t=end - start)
+                              ['v'].filter('setsar', 1))
+                cursor = end
+
+                # x/y : centre normalisé de l'image dans le cadre
+                px = round(ov.x * w - sw / 2)
+                py = round(ov.y * h - sh / 2)
+                cond = f"between(t,{start},{end})"
+                x_expr = f"if({cond},{px},{x_expr})"
+                y_expr = f"if({cond},{py},{y_expr})"
+                windows.append(cond)
+
+            if not pieces:
+                continue
+            lane_stream = pieces[0] if len(pieces) == 1 else ffmpeg.concat(*pieces, v=1, a=0)
+            vid = ffmpeg.filter([vid, lane_stream], 'overlay',
+                                x=x_expr, y=y_expr, eval='frame',
+                                eof_action='pass', format='auto',
+                                enable="+".join(windows))
+        return vid
+
+    @staticmethod
+    def _transparent_stream(w: int, h: int, fps: float, duration: float):
+        return (ffmpeg.input(f"color=c=black@0.0:s={w}x{h}:r={fps}:d={duration}", f='lavfi')
+                .filter('format', 'rgba')
+                .filter('setsar', 1))
@@ -0,0 +1,106 @@
+# core/export/ffmpeg_runner.py
+from __future__ import annotations
+import threading
+from collections import deque
+from typing import Optional
+
+import ffmpeg
+
+from core.export.engine_interface import RenderMonitor, RenderCancelled
+
+
+def _parse_out_time(values: dict) -> float:
+    """Position courante (s) depuis les clés out_time_us / out_time_ms / out_time."""
+    for key in ("out_time_us", "out_time_ms"):
+        raw = values.get(key)
+        if raw and raw != "N/A":
+            try:
+                return int(raw) / 1_000_000.0  # out_time_ms est aussi en µs (historique)
+            except ValueError:
+                pass
+    raw = values.get("out_time", "")
+    try:
+        h, m, s = raw.split(":")
+        return int(h) * 3600 + int(m) * 60 + float(s)
+    except ValueError:
+        return 0.0
+
+
+def _to_float(raw: Optional[str]) -> float:
+    try:
+        return float((raw or "0").rstrip("x"))
+    except ValueError:
+        return 0.0
+
+
+def run_ffmpeg(stream,
+               monitor: Optional[RenderMonitor] = None,
+               task: str = "main",
+               duration_s: float = 0.0,
+               weight: Optional[float] = None) -> None:
+    """
+    Exécute une commande ffmpeg-python.
+
+    Sans monitor : équivalent à ffmpeg.run(..., quiet=True).
+    Avec monitor : ajoute '-progress pipe:1', transmet chaque bloc de
+    progression au monitor sous la clé `task`, et tue le processus si
+    l'annulation est demandée (RenderCancelled). `weight` pondère la tâche
+    dans la progression globale (voir RenderMonitor.add_task).
+
+    Lève ffmpeg.Error si ffmpeg échoue, comme ffmpeg.run.
+    """
+    if monitor is None:
+        ffmpeg.run(stream, overwrite_output=True, quiet=True)
+        return
+
+    monitor.check()
+    monitor.add_task(task, duration_s, weight)
+
+    stream = stream.global_args("-progress", "pipe:1", "-nostats")
+    proc = ffmpeg.run_async(stream, pipe_stdout=True, pipe_stderr=True, overwrite_output=True)
+
+    # stderr est vidé en parallèle pour éviter un blocage du pipe
+    err_tail = deque(maxlen=200)
+    def _drain_stderr():
+        for line in iter(proc.stderr.readline, b""):
+            err_tail.append(line)
+    err_thread = threading.Thread(target=_drain_stderr, daemon=True)
+    err_thread.start()
+
+    # Surveille l'annulation même si ffmpeg n'écrit plus rien
+    done = threading.Event()
+    def _watch_cancel():
+        while not done.wait(0.2):
+            if monitor.cancelled:
+                proc.kill()
+                return
+    watcher = threading.Thread(target=_watch_cancel, daemon=True)
+    watcher.start()
+
+    values: dict = {}
+    try:
+        for raw in iter(proc.stdout.readline, b""):
+            key, _, value = raw.decode("utf-8", "replace").strip().partition("=")
+            if not key:
+                continue
+            values[key] = value
+            if key == "progress":
+                monitor.update(task,
+                               out_time_s=_parse_out_time(values),
+                               frame=int(_to_float(values.get("frame"))),
+                               fps=_to_float(values.get("fps")),
+                               speed=_to_float(values.get("speed")))
+                values = {}
+        proc.wait()
+    finally:
+        done.set()
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+        err_thread.join(timeout=1.0)
+
+    if monitor.cancelled:
+        raise RenderCancelled("Rendu annulé.")
+    if proc.returncode != 0:
+        raise ffmpeg.Error("ffmpeg", b"", b"".join(err_tail))
+    monitor.finish(task)
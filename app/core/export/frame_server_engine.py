@@ -0,0 +1,340 @@
+# core/export/frame_server_engine.py
+from __future__ import annotations
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+import cv2
+import ffmpeg
+import numpy as np
+
+from core.project import Project, Clip
+from core.frame_filters import FrameFilterProcessor, ImageOverlayCompositor
+from core.export.engine_interface import IRenderEngine, RenderError, RenderCancelled, RenderMonitor
+from core.export.export_profile import ExportProfile
+from core.export.ffmpeg_engine import FfmpegRenderEngine
+
+# Marque de fin de flux dans les files entre étages
+_EOS = None
+
+
+@dataclass
+class FrameStats:
+    """Instrumentation d'un rendu : temps cumulés par étage et attentes de file."""
+    frames: int = 0
+    decode_s: float = 0.0
+    process_s: float = 0.0
+    encode_s: float = 0.0
+    decode_wait_s: float = 0.0     # décodeur bloqué faute de tampon libre
+    encode_wait_s: float = 0.0     # encodeur en attente d'images traitées
+    wall_s: float = 0.0
+    per_frame: List[tuple] = field(default_factory=list)
+
+    def summary(self) -> str:
+        n = max(1, self.frames)
+        fps = self.frames / self.wall_s if self.wall_s > 0 else 0.0
+        return (f"{self.frames} images en {self.wall_s:.2f}s ({fps:.1f} i/s) — "
+                f"décodage {1000 * self.decode_s / n:.2f} ms/i, "
+                f"traitement {1000 * self.process_s / n:.2f} ms/i, "
+                f"encodage {1000 * self.encode_s / n:.2f} ms/i, "
+                f"attente tampon {self.decode_wait_s:.2f}s, attente encodeur {self.encode_wait_s:.2f}s")
+
+
+class FrameServerRenderEngine(FfmpegRenderEngine):
+    """
+    Moteur "frame server" : les images sont décodées par OpenCV, traitées en
+    NumPy (Filters via LUT, vignette par masque en cache, overlays d'images)
+    avec le même code que l'aperçu (core.frame_filters), puis envoyées brutes
+    à un ffmpeg encodeur sur son stdin.
+
+    Trois threads (décodage -> traitement -> encodage) s'échangent des lots
+    d'images préalloués par des files bornées ; les tampons sont recyclés, le
+    régime établi n'alloue plus de mémoire. L'audio et les titres restent
+    construits par le graphe ffmpeg (mêmes filtres que FfmpegRenderEngine).
+
+    `on_frame(index, process_s)` est appelé pour chaque image traitée ;
+    `keep_per_frame=True` conserve ces mesures dans last_stats.per_frame.
+    """
+
+    def __init__(self,
+                 batch_frames: int = 8,
+                 queue_depth: int = 4,
+                 on_frame: Optional[Callable[[int, float], None]] = None,
+                 keep_per_frame: bool = False):
+        self.batch_frames = max(1, int(batch_frames))
+        self.queue_depth = max(1, int(queue_depth))
+        self.on_frame = on_frame
+        self.keep_per_frame = keep_per_frame
+        self.last_stats: Optional[FrameStats] = None
+
+    def render(self,
+               project: Project,
+               output_path: Path,
+               profile: ExportProfile,
+               monitor: Optional[RenderMonitor] = None) -> None:
+        if not project.clips:
+            raise RenderError("Le projet est vide, aucun clip à exporter.")
+
+        w, h = (int(x) for x in project.resolution)
+        fps = float(project.fps) or 30.0
+        total = project.total_duration_s()
+        total_frames = int(round(total * fps))
+        monitor = monitor or RenderMonitor()
+        monitor.add_task("main", total)
+
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        proc = self._start_encoder(project, output_path, profile, w, h, fps)
+
+        stats = FrameStats()
+        free: "queue.Queue[np.ndarray]" = queue.Queue()
+        for _ in range(2 * self.queue_depth + 2):
+            free.put(np.empty((self.batch_frames, h, w, 3), dtype=np.uint8))
+        decoded: "queue.Queue" = queue.Queue(maxsize=self.queue_depth)
+        processed: "queue.Queue" = queue.Queue(maxsize=self.queue_depth)
+        errors: List[BaseException] = []
+        stop = threading.Event()
+
+        stderr_tail: List[bytes] = []
+        drain = threading.Thread(target=self._drain, args=(proc.stderr, stderr_tail), daemon=True)
+        drain.start()
+
+        def guarded(fn):
+            def run():
+                try:
+                    fn()
+                except BaseException as e:
+                    errors.append(e)
+                    stop.set()
+            return run
+
+        def decode_stage():
+            index = 0
+            batch, n = None, 0
+            for clip in project.clips:
+                writers = self._decode_clip(clip, fps, w, h)
+                while True:
+                    if stop.is_set() or monitor.cancelled:
+                        return
+                    if batch is None:
+                        t0 = time.perf_counter()
+                        batch = self._get(free, stop)
+                        stats.decode_wait_s += time.perf_counter() - t0
+                        if batch is None:
+                            return
+                    t0 = time.perf_counter()
+                    write = next(writers, None)
+                    if write is None:
+                        break
+                    write(batch[n])
+                    stats.decode_s += time.perf_counter() - t0
+                    n += 1
+                    index += 1
+                    if n == self.batch_frames:
+                        self._put(decoded, (batch, n, index - n), stop)
+                        batch, n = None, 0
+            if batch is not None and n:
+                self._put(decoded, (batch, n, index - n), stop)
+            self._put(decoded, _EOS, stop)
+
+        processor = FrameFilterProcessor(project.filters)
+        compositor = ImageOverlayCompositor(project.image_overlays, w, h)
+
+        def process_stage():
+            while True:
+                item = self._get(decoded, stop)
+                if item is _EOS or item is None:
+                    self._put(processed, _EOS, stop)
+                    return
+                batch, n, first = item
+                for i in range(n):
+                    t0 = time.perf_counter()
+                    processor.apply(batch[i])
+                    if compositor:
+                        compositor.apply(batch[i], (first + i) / fps)
+                    dt = time.perf_counter() - t0
+                    stats.process_s += dt
+                    if self.on_frame:
+                        self.on_frame(first + i, dt)
+                    if self.keep_per_frame:
+                        stats.per_frame.append((first + i, dt))
+                self._put(processed, item, stop)
+
+        def encode_stage():
+            written = 0
+            while True:
+                t0 = time.perf_counter()
+                item = self._get(processed, stop)
+                stats.encode_wait_s += time.perf_counter() - t0
+                if item is _EOS or item is None:
+                    return
+                batch, n, _first = item
+                t0 = time.perf_counter()
+                proc.stdin.write(batch[:n].data)
+                stats.encode_s += time.perf_counter() - t0
+                free.put(batch)
+                written += n
+                stats.frames = written
+                monitor.update("main", written / fps, frame=written,
+                               fps=written / max(1e-6, time.perf_counter() - started))
+
+        started = time.perf_counter()
+        threads = [threading.Thread(target=guarded(fn), name=f"frame-server-{name}", daemon=True)
+                   for name, fn in (("decode", decode_stage), ("process", process_stage),
+                                    ("encode", encode_stage))]
+        try:
+            for t in threads:
+                t.start()
+            while any(t.is_alive() for t in threads):
+                if monitor.cancelled:
+                    stop.set()
+                for t in threads:
+                    t.join(0.2)
+            try:
+                proc.stdin.close()
+            except OSError:
+                pass
+
+            if monitor.cancelled:
+                proc.kill()
+                proc.wait()
+                raise RenderCancelled("Rendu annulé.")
+            if errors:
+                proc.kill()
+                proc.wait()
+                err = errors[0]
+                if isinstance(err, (BrokenPipeError, OSError)):
+                    raise RenderError("L'encodeur ffmpeg s'est arrêté : "
+                                      + b"".join(stderr_tail).decode(errors="replace"))
+                if isinstance(err, RenderError):
+                    raise err
+                raise RenderError(f"Erreur inattendue lors du rendu : {err}")
+
+            code = proc.wait()
+            drain.join(timeout=5)
+            if code != 0:
+                raise RenderError("Échec de l'encodage : " + b"".join(stderr_tail).decode(errors="replace"))
+            if stats.frames < total_frames - 1:
+                print(f"Frame server : {stats.frames} images produites sur {total_frames} attendues")
+            monitor.finish("main")
+        finally:
+            stop.set()
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+            stats.wall_s = time.perf_counter() - started
+            self.last_stats = stats
+            print("Frame server :", stats.summary())
+
+    def supports_resume(self) -> bool:
+        return False
+
+    def render_multi(self,
+                     project: Project,
+                     targets: List[Tuple[ExportProfile, Path]],
+                     monitor: Optional[RenderMonitor] = None) -> None:
+        """Une passe du frame server par sortie (pas de graphe ffmpeg partagé)."""
+        IRenderEngine.render_multi(self, project, targets, monitor)
+
+    def render_video_part_multi(self, project: Project, start: float, end: float,
+                                targets: List[Tuple[ExportProfile, Path]],
+                                monitor: Optional[RenderMonitor] = None) -> None:
+        # Le rendu par parties passerait par le graphe ffmpeg, pas par le frame server
+        raise RenderError("Le moteur frame server ne rend pas par parties "
+                          "(export avec reprise ou incrémental indisponible).")
+
+    # --- Décodage ---
+
+    def _decode_clip(self, clip: Clip, fps: float, w: int, h: int):
+        """
+        Générateur d'écritures d'images (une par image de sortie) pour le clip :
+        chaque élément est une fonction qui copie l'image, redimensionnée, dans
+        le tampon fourni. La cadence est ramenée à `fps` en répétant/sautant des
+        images source d'après leur horodatage.
+        """
+        dur = clip.effective_duration
+        if dur <= 0:
+            return
+        cap = cv2.VideoCapture(clip.path)
+        if not cap.isOpened():
+            raise RenderError(f"Impossible d'ouvrir {clip.path}")
+        try:
+            if clip.in_s > 0:
+                cap.set(cv2.CAP_PROP_POS_MSEC, clip.in_s * 1000.0)
+            n_out = int(round(dur * fps))
+            src, nxt, nxt_t = None, None, -1.0
+            for k in range(n_out):
+                t = clip.in_s + k / fps
+                # avance jusqu'à la dernière image source dont l'instant <= t
+                while nxt_t <= t + 1e-6:
+                    if nxt is not None:
+                        src = nxt
+                    ok, frame = cap.read()
+                    if not ok:
+                        nxt, nxt_t = None, float("inf")
+                        break
+                    nxt, nxt_t = frame, cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+                if src is None:
+                    src = nxt
+                if src is None:
+                    raise RenderError(f"Aucune image décodée dans {clip.path} à {t:.3f}s")
+                yield self._writer(src, w, h)
+        finally:
+            cap.release()
+
+    @staticmethod
+    def _writer(src: np.ndarray, w: int, h: int):
+        def write(dst: np.ndarray) -> None:
+            if src.shape[1] == w and src.shape[0] == h:
+                np.copyto(dst, src)
+            else:
+                interp = cv2.INTER_AREA if src.shape[1] > w else cv2.INTER_LINEAR
+                cv2.resize(src, (w, h), dst=dst, interpolation=interp)
+        return write
+
+    # --- Encodage ---
+
+    def _start_encoder(self, project: Project, output_path: Path, profile: ExportProfile,
+                       w: int, h: int, fps: float):
+        """ffmpeg encodeur : vidéo brute sur stdin (+ titres), audio depuis les sources."""
+        try:
+            v = ffmpeg.input('pipe:', f='rawvideo', pix_fmt='bgr24', s=f"{w}x{h}", r=fps)
+            v = self._apply_text(v, project.text_overlays, w, h)
+            v = self._scale_for_profile(v, project, profile)
+            _, a = self._build_streams(project, video=False)
+            args = profile.to_ffmpeg_args(output_path)
+            args['r'] = fps
+            stream = ffmpeg.output(v, a, str(output_path), **args).overwrite_output()
+            print("Commande FFmpeg :", ffmpeg.compile(stream))
+            return stream.run_async(pipe_stdin=True, pipe_stderr=True)
+        except ffmpeg.Error as e:
+            raise RenderError(f"Échec du démarrage de l'encodeur : {e}")
+
+    @staticmethod
+    def _drain(pipe, tail: List[bytes], keep: int = 200) -> None:
+        for line in iter(pipe.readline, b""):
+            tail.append(line)
+            if len(tail) > keep:
+                del tail[0]
+
+    # --- Files ---
+
+    @staticmethod
+    def _put(q: queue.Queue, item, stop: threading.Event) -> None:
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    @staticmethod
+    def _get(q: queue.Queue, stop: threading.Event):
+        while not stop.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return None
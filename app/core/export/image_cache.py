@@ -0,0 +1,80 @@
+# core/export/image_cache.py
+from __future__ import annotations
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+import ffmpeg
+
+from core.export.engine_interface import RenderError
+from core.runtime_env import app_cache_dir
+
+
+class OverlayImageCache:
+    """
+    Cache disque des images d'overlay déjà prêtes à composer : décodées une
+    seule fois, mises à la taille finale en pixels, opacité appliquée au canal
+    alpha et complétées en transparent jusqu'à la taille du "couloir" (lane)
+    qui les affiche. Le rendu n'a plus qu'à superposer un PNG RGBA, au lieu de
+    redimensionner l'image source à chaque image vidéo.
+
+    Clé : chemin/mtime/taille de la source + géométrie + opacité.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        self.cache_dir = Path(cache_dir) if cache_dir else app_cache_dir("overlays")
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+
+    def _key(self, path: str, width: int, height: int,
+             pad_w: int, pad_h: int, opacity: float) -> str:
+        try:
+            st = os.stat(path)
+            sig = [os.path.abspath(path), st.st_mtime, st.st_size]
+        except OSError:
+            raise RenderError(f"Image d'overlay introuvable : {path}")
+        raw = json.dumps([sig, width, height, pad_w, pad_h, round(opacity, 4)])
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+    def prepare(self, path: str, width: int, height: int,
+                pad_w: int = 0, pad_h: int = 0, opacity: float = 1.0) -> Path:
+        """
+        Retourne un PNG RGBA de `pad_w`x`pad_h` (par défaut `width`x`height`)
+        contenant l'image redimensionnée en `width`x`height` dans son coin
+        haut-gauche. Le fichier est produit au premier appel puis réutilisé.
+        """
+        width, height = max(1, int(width)), max(1, int(height))
+        pad_w, pad_h = max(width, int(pad_w)), max(height, int(pad_h))
+        opacity = min(1.0, max(0.0, float(opacity)))
+
+        key = self._key(path, width, height, pad_w, pad_h, opacity)
+        dest = self.cache_dir / f"{key}.png"
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        # Plusieurs parties peuvent demander la même image en parallèle
+        with key_lock:
+            if dest.exists() and dest.stat().st_size > 0:
+                return dest
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp = dest.with_suffix(f".{threading.get_ident()}.tmp.png")
+            try:
+                img = (ffmpeg.input(path)
+                       .filter('scale', width, height, flags='lanczos')
+                       .filter('format', 'rgba'))
+                if opacity < 1.0:
+                    img = img.filter('colorchannelmixer', aa=opacity)
+                if (pad_w, pad_h) != (width, height):
+                    img = img.filter('pad', pad_w, pad_h, 0, 0, color='black@0')
+                (ffmpeg.output(img, str(tmp), vframes=1)
+                 .run(quiet=True, overwrite_output=True))
+                os.replace(tmp, dest)
+            except ffmpeg.Error as e:
+                error_msg = e.stderr.decode() if e.stderr else str(e)
+                raise RenderError(f"Préparation de l'image {path} impossible : {error_msg}")
+            finally:
+                if tmp.exists():
+                    tmp.unlink()
+            return dest
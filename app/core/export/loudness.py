@@ -0,0 +1,188 @@
+# core/export/loudness.py
+from __future__ import annotations
+import hashlib
+import json
+import math
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import List, Optional
+
+import ffmpeg
+
+from core.project import Clip
+from core.runtime_env import app_cache_dir
+
+# Cibles EBU R128 de la normalisation à l'export
+TARGET_I = -16.0
+TARGET_TP = -1.5
+TARGET_LRA = 11.0
+
+_JSON_BLOCK = re.compile(r"\{[^{}]*\"input_i\"[^{}]*\}", re.S)
+
+
+@dataclass
+class LoudnessStats:
+    """Mesure EBU R128 d'une plage : intégrée (LUFS), true peak (dBTP), LRA (LU)."""
+    input_i: float
+    input_tp: float
+    input_lra: float
+    input_thresh: float
+    duration_s: float = 0.0
+
+    @property
+    def silent(self) -> bool:
+        return not math.isfinite(self.input_i)
+
+
+def _to_float(v) -> float:
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return float("-inf")
+
+
+def combine(stats: List[LoudnessStats]) -> Optional[LoudnessStats]:
+    """
+    Estime la mesure de la timeline à partir de celles des clips : loudness
+    intégrée moyennée en énergie (pondérée par la durée), true peak maximal.
+    Les plages silencieuses n'entrent pas dans la moyenne (comme le gating
+    absolu de R128). None si tout est silencieux.
+
+    La LRA vient de la distribution regroupée du loudness court terme (voir
+    _pooled_lra) : elle tient compte des écarts de niveau entre clips, et
+    n'est jamais inférieure à la plus grande LRA d'un clip.
+    """
+    audible = [s for s in stats if not s.silent and s.duration_s > 0]
+    if not audible:
+        return None
+    total = sum(s.duration_s for s in audible)
+    energy = sum(s.duration_s * 10 ** (s.input_i / 10.0) for s in audible) / total
+    integrated = 10.0 * math.log10(energy)
+    return LoudnessStats(
+        input_i=integrated,
+        input_tp=max(s.input_tp for s in audible),
+        input_lra=_pooled_lra(audible, integrated),
+        # seuil relatif du gating : intégrée - 10 LU
+        input_thresh=integrated - 10.0,
+        duration_s=sum(s.duration_s for s in stats),
+    )
+
+
+def _pooled_lra(audible: List[LoudnessStats], integrated: float) -> float:
+    """
+    LRA (EBU Tech 3342) de la timeline : écart entre les percentiles 10 et 95
+    du loudness court terme, après le gating relatif à -20 LU. Chaque clip n'a
+    qu'un résumé, sa distribution est donc modélisée uniforme sur
+    [I - LRA/2, I + LRA/2], pondérée par sa durée.
+    """
+    gated = [s for s in audible if s.input_i >= integrated - 20.0] or audible
+    total = sum(s.duration_s for s in gated)
+    spans = [(s.input_i - s.input_lra / 2.0, s.input_i + s.input_lra / 2.0, s.duration_s / total)
+             for s in gated]
+
+    def cdf(x: float) -> float:
+        acc = 0.0
+        for lo, hi, w in spans:
+            if hi <= lo:
+                acc += w if x >= lo else 0.0
+            else:
+                acc += w * min(1.0, max(0.0, (x - lo) / (hi - lo)))
+        return acc
+
+    def percentile(q: float) -> float:
+        lo, hi = min(a for a, _, _ in spans), max(b for _, b, _ in spans)
+        for _ in range(60):
+            mid = (lo + hi) / 2.0
+            if cdf(mid) >= q:
+                hi = mid
+            else:
+                lo = mid
+        return hi
+
+    pooled = percentile(0.95) - percentile(0.10)
+    return max(pooled, max(s.input_lra for s in audible))
+
+
+class LoudnessAnalyzer:
+    """
+    Première passe de la normalisation : mesure (filtre loudnorm en mode
+    analyse) chaque plage source utilisée par la timeline, avec un cache
+    disque par (chemin, mtime, in, out). Un ré-export du même matériau ne
+    relance aucune mesure.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None, workers: Optional[int] = None):
+        self.cache_dir = Path(cache_dir) if cache_dir else app_cache_dir("loudness")
+        self.workers = max(1, workers or min(4, os.cpu_count() or 1))
+        self._lock = threading.Lock()
+
+    def _key(self, path: str, start: float, duration: float) -> str:
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            mtime = 0.0
+        raw = json.dumps([os.path.abspath(path), mtime, round(start, 3), round(start + duration, 3)])
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+    def measure_range(self, path: str, start: float, duration: float) -> LoudnessStats:
+        """Mesure (ou relit du cache) la plage [start, start+duration) de `path`."""
+        cache_file = self.cache_dir / f"{self._key(path, start, duration)}.json"
+        if cache_file.exists():
+            try:
+                return LoudnessStats(**json.loads(cache_file.read_text(encoding="utf-8")))
+            except (OSError, ValueError, TypeError):
+                pass
+
+        stats = self._run_analysis(path, start, duration)
+        if stats is None:
+            # Échec (pas de piste audio…) : compté comme silence, non mis en cache
+            return LoudnessStats(float("-inf"), float("-inf"), 0.0, float("-inf"), duration)
+        with self._lock:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = cache_file.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(asdict(stats)), encoding="utf-8")
+        os.replace(tmp, cache_file)
+        return stats
+
+    def measure_clips(self, clips: List[Clip]) -> List[LoudnessStats]:
+        """Mesure les plages de tous les clips (en parallèle pour celles hors cache)."""
+        ranges = [(c.path, c.in_s, c.effective_duration) for c in clips if c.effective_duration > 0]
+        if len(ranges) <= 1:
+            return [self.measure_range(*r) for r in ranges]
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            return list(pool.map(lambda r: self.measure_range(*r), ranges))
+
+    def measure_timeline(self, clips: List[Clip]) -> Optional[LoudnessStats]:
+        return combine(self.measure_clips(clips))
+
+    @staticmethod
+    def _run_analysis(path: str, start: float, duration: float) -> Optional[LoudnessStats]:
+        input_args = {'t': duration}
+        if start > 0:
+            input_args['ss'] = start
+        try:
+            _, err = (ffmpeg.input(path, **input_args)['a']
+                      .filter('loudnorm', i=TARGET_I, tp=TARGET_TP, lra=TARGET_LRA,
+                              print_format='json')
+                      .output('-', f='null')
+                      .run(capture_stdout=True, capture_stderr=True))
+        except ffmpeg.Error as e:
+            print(f"Mesure de loudness impossible pour {path} : "
+                  f"{e.stderr.decode(errors='replace')[-300:] if e.stderr else e}")
+            return None
+
+        matches = _JSON_BLOCK.findall(err.decode(errors="replace"))
+        if not matches:
+            return None
+        data = json.loads(matches[-1])
+        return LoudnessStats(
+            input_i=_to_float(data.get("input_i")),
+            input_tp=_to_float(data.get("input_tp")),
+            input_lra=max(0.0, _to_float(data.get("input_lra"))),
+            input_thresh=_to_float(data.get("input_thresh")),
+            duration_s=duration,
+        )
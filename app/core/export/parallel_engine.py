@@ -0,0 +1,264 @@
+import copy
+import os
+import shutil
+import tempfile
+from dataclasses import replace
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from core.project import Project
+from core.export.engine_interface import RenderError, RenderMonitor
+from core.export.export_profile import ExportProfile
+from core.export.ffmpeg_engine import FfmpegRenderEngine
+from core.export.render_cache import SegmentRenderCache
+from core.export.timeline_slicing import plan_segments, TimeRange
+
+class ParallelFfmpegRenderEngine(FfmpegRenderEngine):
+    """
+    Moteur de rendu segmenté : la timeline est découpée en plages rendues
+    par un pool de processus ffmpeg, puis assemblées sans ré-encodage.
+
+    - chaque partie est rendue vidéo seule, avec les overlays rebasés ;
+    - l'audio (et donc 'loudnorm') est rendu en une passe sur toute la timeline ;
+    - l'assemblage final passe par le démultiplexeur 'concat' en copie de flux.
+
+    Avec un SegmentRenderCache, chaque clip est découpé en fenêtres de
+    `cache_segment_s` depuis sa première image : seules les parties dont la
+    clé a changé sont ré-encodées, les autres sont reprises du cache (export
+    incrémental). Raccourcir la fin d'un clip ne touche que sa dernière partie.
+    """
+
+    def __init__(self,
+                 workers: Optional[int] = None,
+                 threads_per_worker: Optional[int] = None,
+                 min_segment_s: float = 2.0,
+                 cache: Optional[SegmentRenderCache] = None,
+                 cache_segment_s: float = 10.0):
+        cpus = os.cpu_count() or 1
+        self.workers = max(1, workers or cpus)
+        self.threads_per_worker = threads_per_worker or max(1, cpus // self.workers)
+        self.min_segment_s = max(0.1, float(min_segment_s))
+        self.cache = cache
+        self.cache_segment_s = max(self.min_segment_s, float(cache_segment_s))
+
+    def with_cpu_share(self, cpus: int) -> "ParallelFfmpegRenderEngine":
+        """
+        Copie du moteur limitée à `cpus` cœurs (workers et threads par
+        worker), pour plusieurs rendus simultanés ; le cache reste partagé.
+        """
+        engine = copy.copy(self)
+        cpus = max(1, int(cpus))
+        engine.workers = max(1, min(self.workers, cpus))
+        engine.threads_per_worker = max(1, cpus // engine.workers)
+        return engine
+
+    def _use_segments(self, total: float) -> bool:
+        if self.cache is not None:
+            return total > 0
+        return self.workers > 1 and total >= 2 * self.min_segment_s
+
+    def _segment_length(self, total: float) -> float:
+        # Avec cache : fenêtres fixes (voir _plan). Sinon ~2 parties par
+        # worker pour lisser la charge.
+        if self.cache is not None:
+            return self.cache_segment_s
+        return max(self.min_segment_s, total / (self.workers * 2))
+
+    def _plan(self, project: Project, total: float) -> List[TimeRange]:
+        # avec cache, des fenêtres fixes gardent les clés des parties inchangées
+        return plan_segments(project, self._segment_length(total), fixed=self.cache is not None)
+
+    def render(self,
+               project: Project,
+               output_path: Path,
+               profile: ExportProfile,
+               monitor: Optional[RenderMonitor] = None) -> None:
+        total = project.total_duration_s()
+        # Sortie progressive : un seul ffmpeg écrit le fichier au fil du rendu
+        if profile.progressive or not self._use_segments(total):
+            return super().render(project, output_path, profile, monitor)
+
+        ranges = self._plan(project, total)
+        if not ranges:
+            raise RenderError("Le projet est vide, aucun clip à exporter.")
+
+        part_profile = self._worker_profile(profile)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        work_dir = Path(tempfile.mkdtemp(prefix=f".{output_path.stem}.parts-",
+                                         dir=output_path.parent))
+        parts: List[Path] = []
+        cache_session = self.cache.begin() if self.cache is not None else None
+        try:
+            audio_path = work_dir / "audio.mka"
+
+            print(f"Rendu parallèle : {len(ranges)} parties sur {self.workers} workers "
+                  f"({self.threads_per_worker} threads chacun)")
+
+            if monitor:
+                # Toutes les tâches sont déclarées d'avance : l'ETA couvre le rendu entier
+                monitor.add_task("audio", total, weight=total * self.AUDIO_TASK_WEIGHT)
+                monitor.add_task("concat", total, weight=total * self.CONCAT_TASK_WEIGHT)
+                for rng in ranges:
+                    monitor.add_task(self.part_task(rng.start), rng.duration)
+
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                audio_future = pool.submit(self.render_audio_track, project, audio_path, profile, monitor)
+                part_futures = [
+                    pool.submit(self._render_part, project, rng,
+                                [(part_profile, profile, work_dir / f"part_{i:05d}.ts")], monitor)
+                    for i, rng in enumerate(ranges)
+                ]
+                self._wait_all([audio_future] + part_futures)
+                parts = [f.result()[0] for f in part_futures]
+
+            self.concat_parts(parts, audio_path, output_path, profile, monitor, total)
+        except RenderError:
+            raise
+        except Exception as e:
+            raise RenderError(f"Erreur inattendue lors du rendu parallèle : {e}")
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+            if cache_session is not None:
+                self.cache.end(cache_session, protect=parts)
+
+    def render_multi(self,
+                     project: Project,
+                     targets: List[Tuple[ExportProfile, Path]],
+                     monitor: Optional[RenderMonitor] = None) -> None:
+        """
+        Multi-sorties segmenté : chaque partie est décodée et filtrée une fois
+        puis encodée pour tous les profils ; l'audio est rendu une fois par
+        réglage audio distinct, puis chaque sortie est assemblée en copie.
+        """
+        total = project.total_duration_s()
+        if len(targets) == 1:
+            profile, output_path = targets[0]
+            return self.render(project, output_path, profile, monitor)
+        if any(p.progressive for p, _ in targets) or not self._use_segments(total):
+            return super().render_multi(project, targets, monitor)
+
+        ranges = self._plan(project, total)
+        if not ranges:
+            raise RenderError("Le projet est vide, aucun clip à exporter.")
+
+        first_out = targets[0][1]
+        first_out.parent.mkdir(parents=True, exist_ok=True)
+        work_dir = Path(tempfile.mkdtemp(prefix=f".{first_out.stem}.parts-", dir=first_out.parent))
+        parts: List[List[Path]] = []
+        cache_session = self.cache.begin() if self.cache is not None else None
+        try:
+            worker_profiles = [self._worker_profile(p) for p, _ in targets]
+
+            # Une piste audio par réglage audio distinct : {réglage: (tâche, chemin, profil)}
+            audio_tracks: Dict[Tuple, Tuple[str, Path, ExportProfile]] = {}
+            audio_for_target = []
+            for profile, _ in targets:
+                key = tuple(sorted(profile.to_audio_args().items()))
+                if key not in audio_tracks:
+                    n = len(audio_tracks)
+                    audio_tracks[key] = (f"audio:{n}", work_dir / f"audio_{n}.mka", profile)
+                audio_for_target.append(audio_tracks[key][1])
+
+            if monitor:
+                for task, _, _ in audio_tracks.values():
+                    monitor.add_task(task, total, weight=total * self.AUDIO_TASK_WEIGHT)
+                for k in range(len(targets)):
+                    monitor.add_task(f"concat:{k}", total, weight=total * self.CONCAT_TASK_WEIGHT)
+                for rng in ranges:
+                    monitor.add_task(self.part_task(rng.start), rng.duration)
+
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                audio_futures = [pool.submit(self.render_audio_track, project, audio_path, profile,
+                                             monitor, task=task)
+                                 for task, audio_path, profile in audio_tracks.values()]
+                part_futures = []
+                for i, rng in enumerate(ranges):
+                    part_targets = [(worker_profiles[k], targets[k][0], work_dir / f"out{k}_part_{i:05d}.ts")
+                                    for k in range(len(targets))]
+                    part_futures.append(pool.submit(self._render_part, project, rng, part_targets, monitor))
+                self._wait_all(audio_futures + part_futures)
+                # parts[k] = parties de la sortie k, dans l'ordre de la timeline
+                per_range = [f.result() for f in part_futures]
+                parts = [[paths[k] for paths in per_range] for k in range(len(targets))]
+
+            for k, (profile, output_path) in enumerate(targets):
+                self.concat_parts(parts[k], audio_for_target[k], output_path, profile,
+                                  monitor, total, task=f"concat:{k}")
+        except RenderError:
+            raise
+        except Exception as e:
+            raise RenderError(f"Erreur inattendue lors du rendu parallèle : {e}")
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+            if cache_session is not None:
+                self.cache.end(cache_session, protect=[p for out_parts in parts for p in out_parts])
+
+    # --- Parties ---
+
+    def _render_part(self,
+                     project: Project,
+                     rng: TimeRange,
+                     targets: List[Tuple[ExportProfile, ExportProfile, Path]],
+                     monitor: Optional[RenderMonitor] = None) -> List[Path]:
+        """
+        Produit une partie pour chaque cible (profil d'encodage, profil de
+        référence pour la clé de cache, chemin de travail) et retourne les
+        fichiers à concaténer : segments du cache s'ils existent, sinon rendus.
+        """
+        if self.cache is None:
+            self.render_video_part_multi(project, rng.start, rng.end,
+                                         [(enc, path) for enc, _, path in targets], monitor)
+            return [path for _, _, path in targets]
+
+        options = self.render_options()
+        keys = [self.cache.segment_key(project, rng.start, rng.end, ref, options) for _, ref, _ in targets]
+        results: List[Optional[Path]] = [self.cache.lookup(k) for k in keys]
+        missing = [k for k, hit in enumerate(results) if hit is None]
+        if missing:
+            self.render_video_part_multi(project, rng.start, rng.end,
+                                         [(targets[k][0], targets[k][2]) for k in missing], monitor)
+            for k in missing:
+                results[k] = self.cache.store(keys[k], targets[k][2])
+        elif monitor:
+            monitor.finish(self.part_task(rng.start))
+        return results
+
+    def plan_parts(self, project: Project, profile: ExportProfile, segment_s: float) -> List[TimeRange]:
+        # avec cache : les fenêtres du cache, pour reprendre ses segments
+        if self.cache is not None:
+            return self._plan(project, project.total_duration_s())
+        return super().plan_parts(project, profile, segment_s)
+
+    def render_part_file(self,
+                         project: Project,
+                         rng,
+                         output_path: Path,
+                         profile: ExportProfile,
+                         monitor: Optional[RenderMonitor] = None) -> None:
+        """
+        Partie limitée en threads ; avec cache, le segment est repris ou
+        rendu, puis copié (l'appelant encadre par cache.begin()/end()).
+        """
+        part_profile = self._worker_profile(profile)
+        if self.cache is None:
+            return super().render_part_file(project, rng, output_path, part_profile, monitor)
+        cached = self._render_part(project, rng, [(part_profile, profile, output_path)], monitor)
+        shutil.copyfile(cached[0], output_path)
+
+    @staticmethod
+    def _wait_all(futures) -> None:
+        """Attend toutes les tâches ; à la première erreur, annule celles en attente."""
+        try:
+            for fut in as_completed(futures):
+                fut.result()
+        except Exception:
+            for fut in futures:
+                fut.cancel()
+            raise
+
+    def _worker_profile(self, profile: ExportProfile) -> ExportProfile:
+        """Limite les threads de l'encodeur pour ne pas sursouscrire les cœurs."""
+        extra = dict(profile.extra_output_args)
+        extra.setdefault("threads", self.threads_per_worker)
+        return replace(profile, extra_output_args=extra)
@@ -0,0 +1,127 @@
+# core/export/probe.py
+from __future__ import annotations
+import os
+from functools import lru_cache
+from typing import Optional, List, Dict, Any
+
+import ffmpeg
+
+# Correspondance encodeur ffmpeg -> nom de codec rapporté par ffprobe
+ENCODER_CODECS = {
+    "libx264": "h264",
+    "h264": "h264",
+    "libx265": "hevc",
+    "hevc": "hevc",
+    "libvpx-vp9": "vp9",
+    "libaom-av1": "av1",
+    "libsvtav1": "av1",
+    "prores_ks": "prores",
+}
+
+
+def _mtime(path: str) -> float:
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return 0.0
+
+
+@lru_cache(maxsize=256)
+def _probe_cached(path: str, mtime: float) -> Dict[str, Any]:
+    return ffmpeg.probe(path)
+
+
+def probe_media(path: str) -> Dict[str, Any]:
+    """
+    Résultat de ffprobe (format + streams) pour `path`, mis en cache
+    tant que le fichier n'est pas modifié. Retourne {} si la sonde échoue.
+    """
+    try:
+        return _probe_cached(path, _mtime(path))
+    except (ffmpeg.Error, OSError, ValueError) as e:
+        print(f"Sonde ffprobe impossible pour {path} : {e}")
+        return {}
+
+
+def video_stream(path: str) -> Optional[Dict[str, Any]]:
+    """Premier flux vidéo de la source, ou None."""
+    for st in probe_media(path).get("streams", []):
+        if st.get("codec_type") == "video":
+            return st
+    return None
+
+
+def audio_stream(path: str) -> Optional[Dict[str, Any]]:
+    """Premier flux audio de la source, ou None."""
+    for st in probe_media(path).get("streams", []):
+        if st.get("codec_type") == "audio":
+            return st
+    return None
+
+
+def stream_fps(stream: Dict[str, Any]) -> float:
+    """Cadence d'un flux vidéo ('30000/1001' -> 29.97), 0.0 si inconnue."""
+    for key in ("avg_frame_rate", "r_frame_rate"):
+        rate = stream.get(key) or "0/0"
+        try:
+            num, den = rate.split("/")
+            if float(den) > 0 and float(num) > 0:
+                return float(num) / float(den)
+        except ValueError:
+            continue
+    return 0.0
+
+
+def stream_rotation(stream: Dict[str, Any]) -> int:
+    """Rotation d'affichage en degrés (tag 'rotate' ou side data 'Display Matrix'), 0 si aucune."""
+    for side in stream.get("side_data_list") or []:
+        if "rotation" in side:
+            try:
+                return int(round(float(side["rotation"]))) % 360
+            except (TypeError, ValueError):
+                pass
+    try:
+        return int(round(float((stream.get("tags") or {}).get("rotate", 0)))) % 360
+    except (TypeError, ValueError):
+        return 0
+
+
+def display_size(stream: Dict[str, Any]) -> Optional[tuple]:
+    """
+    Taille (largeur, hauteur) des images décodées, rotation appliquée
+    (ffmpeg tourne automatiquement les sources à ±90°) ; None si inconnue.
+    """
+    w, h = int(stream.get("width") or 0), int(stream.get("height") or 0)
+    if not w or not h:
+        return None
+    return (h, w) if stream_rotation(stream) % 180 == 90 else (w, h)
+
+
+@lru_cache(maxsize=512)
+def _keyframes_cached(path: str, mtime: float, start: float, end: float) -> tuple:
+    data = ffmpeg.probe(path,
+                        select_streams="v:0",
+                        skip_frame="nokey",
+                        show_entries="frame=pts_time,best_effort_timestamp_time",
+                        read_intervals=f"{start}%{end}")
+    times = []
+    for fr in data.get("frames", []):
+        t = fr.get("pts_time", fr.get("best_effort_timestamp_time"))
+        try:
+            times.append(float(t))
+        except (TypeError, ValueError):
+            continue
+    return tuple(sorted(set(times)))
+
+
+def keyframe_times(path: str, start: float, end: float) -> List[float]:
+    """
+    Instants (s) des images clés du premier flux vidéo dans [start, end].
+    Seuls les paquets clés sont décodés (-skip_frame nokey).
+    """
+    try:
+        times = _keyframes_cached(path, _mtime(path), round(start, 3), round(end, 3))
+    except (ffmpeg.Error, OSError, ValueError) as e:
+        print(f"Lecture des images clés impossible pour {path} : {e}")
+        return []
+    return [t for t in times if start - 1e-3 <= t <= end + 1e-3]
@@ -0,0 +1,162 @@
+# core/export/render_cache.py
+from __future__ import annotations
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Dict, Any, Iterable, List
+
+from core.project import Project
+from core.export.export_profile import ExportProfile
+from core.export.timeline_slicing import slice_project
+from core.runtime_env import app_cache_dir
+
+# À incrémenter quand la construction du graphe change le rendu d'un segment
+# 2 : overlays d'images composités (les segments du format 1 n'en ont pas)
+# 3 : réglages du moteur dans la clé (backend des titres : drawtext ou ASS)
+# 4 : graphe vidéo optimisé (ordre des filtres modifié, optimize_graph dans la clé)
+CACHE_FORMAT = 4
+
+
+def _file_signature(path: str) -> Dict[str, Any]:
+    try:
+        st = os.stat(path)
+        return {"path": os.path.abspath(path), "mtime": st.st_mtime, "size": st.st_size}
+    except OSError:
+        return {"path": os.path.abspath(path), "mtime": 0.0, "size": 0}
+
+
+def _profile_signature(profile: ExportProfile) -> Dict[str, Any]:
+    """Paramètres qui influencent l'image encodée (les threads n'en font pas partie)."""
+    args = {k: v for k, v in profile.to_video_args().items() if k != "threads"}
+    return {"video": args, "resolution": profile.resolution}
+
+
+class SegmentRenderCache:
+    """
+    Cache disque des segments vidéo rendus (fichiers .ts concaténables).
+
+    La clé d'un segment est un hash de tout ce qui détermine son image : source
+    (chemin, mtime, taille), in/out, Filters, overlays qui l'intersectent
+    (rebasés sur le segment), résolution/cadence du projet, profil vidéo et
+    réglages du moteur qui changent l'image (voir render_options du moteur).
+    Éviction LRU (date de dernier usage = mtime, rafraîchie à chaque accès)
+    dès que le dossier dépasse `budget_bytes`.
+
+    Chaque export encadre son usage du cache par begin()/end() : l'éviction
+    ne touche qu'aux segments inutilisés depuis le début du plus ancien
+    export en cours, les segments que lisent les autres exports de la file
+    (ou d'un autre processus, depuis notre début) restent en place.
+    """
+
+    def __init__(self,
+                 cache_dir: Optional[Path] = None,
+                 budget_bytes: int = 20 * 1024 ** 3):
+        self.cache_dir = Path(cache_dir) if cache_dir else app_cache_dir("segments")
+        self.budget_bytes = int(budget_bytes)
+        self._lock = threading.Lock()
+        # dates de début des exports en cours (begin/end)
+        self._sessions: List[float] = []
+
+    # --- Clés ---
+    def segment_key(self, project: Project, start: float, end: float,
+                    profile: ExportProfile,
+                    render_options: Optional[Dict[str, Any]] = None) -> str:
+        part = slice_project(project, start, end)
+        payload = {
+            "format": CACHE_FORMAT,
+            "resolution": list(project.resolution),
+            "fps": float(project.fps),
+            "profile": _profile_signature(profile),
+            "render": render_options or {},
+            "filters": vars(part.filters),
+            "clips": [dict(_file_signature(c.path),
+                           in_s=round(c.in_s, 6), dur=round(c.effective_duration, 6))
+                      for c in part.clips],
+            "text_overlays": [vars(ov) for ov in part.text_overlays],
+            "image_overlays": [dict(vars(ov), file=_file_signature(ov.path))
+                               for ov in part.image_overlays],
+        }
+        raw = json.dumps(payload, sort_keys=True, default=str)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def path_for(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.ts"
+
+    # --- Accès ---
+    def lookup(self, key: str) -> Optional[Path]:
+        """Chemin du segment en cache (et marque l'usage), ou None."""
+        path = self.path_for(key)
+        try:
+            if path.stat().st_size <= 0:
+                return None
+            os.utime(path, None)
+            return path
+        except OSError:
+            return None
+
+    def store(self, key: str, rendered: Path) -> Path:
+        """
+        Déplace un segment fraîchement rendu dans le cache. Le budget n'est pas
+        appliqué ici (evict) pour ne pas supprimer un segment de l'export en cours.
+        """
+        dest = self.path_for(key)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dest.with_suffix(f".{threading.get_ident()}.tmp")
+        shutil.move(str(rendered), str(tmp))
+        os.replace(tmp, dest)
+        return dest
+
+    def begin(self) -> float:
+        """Début d'un export utilisant le cache ; à clore par end()."""
+        started = time.time()
+        with self._lock:
+            self._sessions.append(started)
+        return started
+
+    def end(self, started: float, protect: Iterable[Path] = ()) -> int:
+        """Fin d'un export : applique le budget sans toucher aux exports encore en cours."""
+        with self._lock:
+            if started in self._sessions:
+                self._sessions.remove(started)
+        return self.evict(protect=protect, older_than=started)
+
+    def evict(self, protect: Iterable[Path] = (), older_than: Optional[float] = None) -> int:
+        """
+        Supprime les segments les moins récemment utilisés au-delà du budget,
+        sauf ceux de `protect` et ceux utilisés depuis `older_than` ou depuis
+        le début d'un export en cours (lookup/store rafraîchissent le mtime).
+        """
+        protect = {Path(p) for p in protect}
+        with self._lock:
+            cutoff = min(self._sessions + ([older_than] if older_than is not None else []),
+                         default=None)
+            entries = []
+            total = 0
+            for p in self.cache_dir.glob("*/*.ts"):
+                try:
+                    st = p.stat()
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, p))
+                total += st.st_size
+
+            freed = 0
+            for mtime, size, p in sorted(entries):
+                if total <= self.budget_bytes:
+                    break
+                if p in protect or (cutoff is not None and mtime >= cutoff):
+                    continue
+                try:
+                    p.unlink()
+                    total -= size
+                    freed += size
+                except OSError:
+                    pass
+            return freed
+
+    def clear(self) -> None:
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
@@ -0,0 +1,329 @@
+# core/export/render_graph.py
+"""
+Représentation intermédiaire de la partie vidéo d'un rendu.
+
+FfmpegRenderEngine décrit d'abord le graphe sous forme de données (entrées,
+chaînes de filtres par source, chaîne globale après la concat, mise à
+l'échelle du profil), l'optimise par passes, puis seulement le traduit en
+nœuds ffmpeg-python. Les passes :
+
+  - drop_identity_filters : retire 'eq' neutre et les 'scale' vers la taille
+    déjà connue (sonde ffprobe) ;
+  - move_downscale_ahead : sans overlay, la réduction du profil passe avant
+    les filtres par pixel (eq, vignette), qui traitent alors moins de pixels ;
+  - merge_scales : deux 'scale' consécutifs n'en font qu'un ;
+  - hoist_scale_to_sources : la mise à la résolution du projet se fait par
+    source, avant la concat (et disparaît pour les sources déjà à la taille) ;
+  - skip_redundant_fps : pas de 'fps' quand la source est à cadence
+    constante égale à celle du projet.
+
+dump() produit une description lisible du graphe et des passes appliquées.
+"""
+from __future__ import annotations
+import json
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from core.project import Project, Clip, Filters
+from core.export import probe
+
+# Filtres qui recalculent chaque pixel, indépendants de la position absolue :
+# ils donnent le même résultat avant ou après une mise à l'échelle.
+PER_PIXEL_FILTERS = {"eq", "vignette"}
+
+# Écart de cadence toléré pour considérer 'fps' inutile
+FPS_TOLERANCE = 0.01
+
+
+@dataclass
+class FilterOp:
+    """Un filtre vidéo : nom ffmpeg, arguments positionnels et nommés."""
+    name: str
+    args: Tuple[Any, ...] = ()
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def size(self) -> Optional[Tuple[int, int]]:
+        """Taille de sortie d'un 'scale', None pour les autres filtres."""
+        if self.name != "scale":
+            return None
+        return int(self.args[0]), int(self.args[1])
+
+    def is_identity(self) -> bool:
+        if self.name == "eq":
+            return (float(self.kwargs.get("brightness", 0.0)) == 0.0
+                    and float(self.kwargs.get("contrast", 1.0)) == 1.0
+                    and float(self.kwargs.get("saturation", 1.0)) == 1.0)
+        return False
+
+    def describe(self) -> str:
+        params = [str(a) for a in self.args] + [f"{k}={v}" for k, v in self.kwargs.items()]
+        return f"{self.name}={':'.join(params)}" if params else self.name
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"name": self.name, "args": list(self.args), "kwargs": dict(self.kwargs)}
+
+
+@dataclass
+class SourceNode:
+    """
+    Une entrée ffmpeg (seek -ss/-t) alimentant un ou plusieurs clips de la
+    timeline : chaîne `ops` commune, puis un trim par segment.
+    """
+    path: str
+    clip_indices: List[int]
+    input_args: Dict[str, Any]
+    segments: List[Tuple[float, float]]          # (début relatif à l'entrée, durée)
+    ops: List[FilterOp] = field(default_factory=list)
+    # Sonde (remplie par probe_sources ; None = inconnu)
+    width: Optional[int] = None
+    height: Optional[int] = None
+    fps: Optional[float] = None
+    constant_rate: bool = False
+
+    @property
+    def size(self) -> Optional[Tuple[int, int]]:
+        if self.width and self.height:
+            return self.width, self.height
+        return None
+
+
+@dataclass
+class RenderGraph:
+    width: int
+    height: int
+    fps: float
+    sources: List[SourceNode] = field(default_factory=list)
+    video_ops: List[FilterOp] = field(default_factory=list)    # après la concat, avant les overlays
+    image_overlays: int = 0
+    text_overlays: int = 0
+    output_ops: List[FilterOp] = field(default_factory=list)   # après les overlays (profil)
+    log: List[str] = field(default_factory=list)
+    probed: bool = False
+
+    @property
+    def has_overlays(self) -> bool:
+        return bool(self.image_overlays or self.text_overlays)
+
+    # --- Construction ---
+
+    @classmethod
+    def build(cls,
+              project: Project,
+              runs: List[List[int]],
+              output_size: Optional[Tuple[int, int]] = None) -> "RenderGraph":
+        """
+        Graphe non optimisé, équivalent au rendu historique : chaque source
+        remise à zéro et convertie à la cadence du projet, puis concat,
+        scale à la résolution du projet, eq, vignette, overlays, et enfin le
+        scale du profil si sa résolution diffère.
+        `runs` : groupes d'indices de clips partageant une entrée.
+        """
+        w, h = (int(x) for x in project.resolution)
+        graph = cls(width=w, height=h, fps=float(project.fps),
+                    image_overlays=len(project.image_overlays),
+                    text_overlays=len(project.text_overlays))
+        for run in runs:
+            graph.sources.append(_source_for_run(project.clips, run, project.fps))
+        graph.video_ops = _filter_ops(project.filters, w, h)
+        if output_size and tuple(output_size) != (w, h):
+            graph.output_ops.append(FilterOp("scale", (int(output_size[0]), int(output_size[1]))))
+        return graph
+
+    def probe_sources(self) -> None:
+        """Renseigne taille et cadence de chaque source (ffprobe, en cache)."""
+        if self.probed:
+            return
+        for src in self.sources:
+            st = probe.video_stream(src.path)
+            if not st:
+                continue
+            # taille affichée : un clip de téléphone 1920x1080 tourné de 90° sort en 1080x1920
+            src.width, src.height = probe.display_size(st) or (None, None)
+            src.fps = probe.stream_fps(st) or None
+            src.constant_rate = (st.get("avg_frame_rate") or "0/0") == (st.get("r_frame_rate") or "")
+        self.probed = True
+
+    # --- Optimisation ---
+
+    def optimize(self) -> "RenderGraph":
+        self.probe_sources()
+        for opt_pass in OPTIMIZATION_PASSES:
+            opt_pass(self)
+        return self
+
+    # --- Inspection ---
+
+    def dump(self) -> str:
+        lines = [f"RenderGraph {self.width}x{self.height} @ {self.fps:g} i/s"]
+        for k, src in enumerate(self.sources):
+            args = ", ".join(f"{key}={val:g}" for key, val in src.input_args.items())
+            probed = (f"{src.width}x{src.height} @ {src.fps:.3f} i/s"
+                      + ("" if src.constant_rate else " (variable)")) if src.size and src.fps else "non sondée"
+            lines.append(f"  source[{k}] {src.path} ({args}) — {probed}")
+            chain = " -> ".join(op.describe() for op in src.ops) or "(aucun filtre)"
+            lines.append(f"      {chain}")
+            segs = ", ".join(f"clip {i}: {start:.3f}+{dur:.3f}s"
+                             for i, (start, dur) in zip(src.clip_indices, src.segments))
+            lines.append(f"      trim {segs}")
+        lines.append(f"  concat ({sum(len(s.segments) for s in self.sources)} segments)")
+        lines.append("  vidéo : " + (" -> ".join(op.describe() for op in self.video_ops) or "(aucun filtre)"))
+        if self.has_overlays:
+            lines.append(f"  overlays : {self.image_overlays} image(s), {self.text_overlays} titre(s)")
+        if self.output_ops:
+            lines.append("  sortie : " + " -> ".join(op.describe() for op in self.output_ops))
+        if self.log:
+            lines.append("  passes :")
+            lines.extend(f"    - {entry}" for entry in self.log)
+        return "\n".join(lines)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "width": self.width, "height": self.height, "fps": self.fps,
+            "sources": [{
+                "path": s.path, "clips": s.clip_indices, "input": s.input_args,
+                "segments": s.segments, "ops": [op.to_dict() for op in s.ops],
+                "probe": {"width": s.width, "height": s.height, "fps": s.fps,
+                          "constant_rate": s.constant_rate},
+            } for s in self.sources],
+            "video_ops": [op.to_dict() for op in self.video_ops],
+            "overlays": {"image": self.image_overlays, "text": self.text_overlays},
+            "output_ops": [op.to_dict() for op in self.output_ops],
+            "passes": list(self.log),
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2, default=str)
+
+
+def _clip_end(c: Clip) -> float:
+    return c.out_s if c.out_s > 0 else (c.in_s + c.duration_s)
+
+
+def _source_for_run(clips: List[Clip], run: List[int], fps: float) -> SourceNode:
+    bounds = [(clips[i].in_s, max(0, _clip_end(clips[i]) - clips[i].in_s)) for i in run]
+    run_start = bounds[0][0]
+    run_end = max(s + d for s, d in bounds)
+    input_args: Dict[str, Any] = {}
+    if run_start > 0:
+        input_args['ss'] = run_start
+    if run_end - run_start > 0:
+        input_args['t'] = run_end - run_start
+    return SourceNode(
+        path=clips[run[0]].path,
+        clip_indices=list(run),
+        input_args=input_args,
+        segments=[(start - run_start, dur) for start, dur in bounds],
+        ops=[FilterOp("setpts", ("PTS-STARTPTS",)), FilterOp("fps", kwargs={"fps": fps})],
+    )
+
+
+def _filter_ops(filters: Filters, w: int, h: int) -> List[FilterOp]:
+    ops = [FilterOp("scale", (w, h)),
+           FilterOp("eq", kwargs={"brightness": filters.brightness,
+                                  "contrast": filters.contrast,
+                                  "saturation": filters.saturation})]
+    if filters.vignette:
+        ops.append(FilterOp("vignette", kwargs={"angle": "PI/4", "x0": "w/2", "y0": "h/2"}))
+    return ops
+
+
+# --- Passes ---
+
+def drop_identity_filters(graph: RenderGraph) -> None:
+    """Retire les filtres sans effet : eq neutre, scale vers la taille déjà connue."""
+    def prune(ops: List[FilterOp], size: Optional[Tuple[int, int]], where: str) -> List[FilterOp]:
+        kept = []
+        for op in ops:
+            if op.is_identity() or (op.size is not None and op.size == size):
+                graph.log.append(f"drop_identity_filters : {op.describe()} retiré ({where})")
+                continue
+            if op.size is not None:
+                size = op.size
+            kept.append(op)
+        return kept
+
+    out_sizes = set()
+    for k, src in enumerate(graph.sources):
+        src.ops = prune(src.ops, src.size, f"source {k}")
+        scaled = [op.size for op in src.ops if op.size is not None]
+        out_sizes.add(scaled[-1] if scaled else src.size)
+    # taille après la concat : connue si toutes les sources la partagent
+    concat_size = out_sizes.pop() if len(out_sizes) == 1 else None
+    graph.video_ops = prune(graph.video_ops, concat_size, "vidéo")
+    video_scales = [op.size for op in graph.video_ops if op.size is not None]
+    size = video_scales[-1] if video_scales else concat_size
+    # les overlays gardent la taille de l'image principale
+    graph.output_ops = prune(graph.output_ops, size, "sortie")
+
+
+def move_downscale_ahead(graph: RenderGraph) -> None:
+    """
+    Sans overlay (positions et tailles exprimées en pixels du projet), la
+    réduction finale du profil peut se faire avant eq/vignette.
+    """
+    if graph.has_overlays or not graph.output_ops:
+        return
+    op = graph.output_ops[-1]
+    if op.size is None or len(graph.output_ops) != 1:
+        return
+    if op.size[0] * op.size[1] >= graph.width * graph.height:
+        return   # agrandissement : le plus tard possible
+    pos = next((i for i, o in enumerate(graph.video_ops) if o.name in PER_PIXEL_FILTERS),
+               len(graph.video_ops))
+    graph.video_ops.insert(pos, op)
+    graph.output_ops = []
+    graph.log.append(f"move_downscale_ahead : {op.describe()} avant les filtres par pixel")
+
+
+def merge_scales(graph: RenderGraph) -> None:
+    """scale(a) -> scale(b) devient scale(b)."""
+    def merge(ops: List[FilterOp], where: str) -> List[FilterOp]:
+        merged: List[FilterOp] = []
+        for op in ops:
+            if op.size is not None and merged and merged[-1].size is not None:
+                graph.log.append(f"merge_scales : {merged[-1].describe()} + {op.describe()} ({where})")
+                merged[-1] = op
+                continue
+            merged.append(op)
+        return merged
+
+    for k, src in enumerate(graph.sources):
+        src.ops = merge(src.ops, f"source {k}")
+    graph.video_ops = merge(graph.video_ops, "vidéo")
+
+
+def hoist_scale_to_sources(graph: RenderGraph) -> None:
+    """
+    Un scale en tête de la chaîne globale passe dans chaque source, avant la
+    concat : les sources déjà à la bonne taille n'auront plus de scale, et
+    la concat reçoit des tailles homogènes.
+    """
+    if not graph.video_ops or graph.video_ops[0].size is None:
+        return
+    op = graph.video_ops.pop(0)
+    for src in graph.sources:
+        # après 'fps' : on ne redimensionne que les images conservées
+        src.ops.append(FilterOp(op.name, op.args, dict(op.kwargs)))
+    graph.log.append(f"hoist_scale_to_sources : {op.describe()} déplacé dans {len(graph.sources)} source(s)")
+
+
+def skip_redundant_fps(graph: RenderGraph) -> None:
+    """Pas de conversion de cadence pour une source à cadence constante égale."""
+    for k, src in enumerate(graph.sources):
+        if not src.constant_rate or not src.fps or abs(src.fps - graph.fps) >= FPS_TOLERANCE:
+            continue
+        before = len(src.ops)
+        src.ops = [op for op in src.ops if op.name != "fps"]
+        if len(src.ops) < before:
+            graph.log.append(f"skip_redundant_fps : source {k} déjà à {src.fps:.3f} i/s")
+
+
+OPTIMIZATION_PASSES: List[Callable[[RenderGraph], None]] = [
+    drop_identity_filters,
+    move_downscale_ahead,
+    merge_scales,
+    hoist_scale_to_sources,
+    skip_redundant_fps,
+    drop_identity_filters,
+]
@@ -0,0 +1,283 @@
+# core/export/render_queue.py
+from __future__ import annotations
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, asdict, replace
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from core.save_system.save_api import ProjectAPI
+from core.save_system.serializers import LMPRJChunkedSerializer
+from core.export.engine_interface import RenderError, RenderCancelled, RenderMonitor
+from core.export.export_profile import ExportProfile, DEFAULT_PROFILES
+from core.export.export_service import ExportService
+from core.export.resumable import ResumableExport
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+
+
+@dataclass
+class RenderQueueJob:
+    """Un export en file : (.lmprj, profil, sortie) + état et mesures."""
+    project_file: str
+    output: str
+    profile: Dict[str, Any]
+    id: str = field(default_factory=lambda: uuid.uuid4().hex[:12])
+    status: str = QUEUED
+    error: Optional[str] = None
+    queued_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    media_duration_s: float = 0.0
+    frames: int = 0
+
+    def export_profile(self) -> ExportProfile:
+        return ExportProfile(**self.profile)
+
+    @property
+    def wall_s(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+    def throughput(self) -> Dict[str, float]:
+        """Débit du job : secondes média/s (x temps réel) et images/s."""
+        wall = self.wall_s
+        return {
+            "wall_s": wall,
+            "media_s": self.media_duration_s,
+            "realtime_factor": (self.media_duration_s / wall) if wall > 0 else 0.0,
+            "fps": (self.frames / wall) if wall > 0 else 0.0,
+        }
+
+
+class RenderQueue:
+    """
+    File de rendus persistante (JSON dans le dossier de sauvegarde).
+
+    - max_concurrent : nombre de jobs simultanés ; avec un moteur parallèle,
+      chaque job n'en utilise qu'une copie limitée à cpu_count // max_concurrent
+      cœurs (workers ffmpeg et threads), le total reste proche du nombre de cœurs ;
+    - threads_per_job : option 'threads' de l'encodeur imposée à chaque job
+      (None = laisser le profil / le moteur décider).
+
+    La file est réécrite à chaque changement d'état ; au rechargement, un job
+    resté "running" (arrêt brutal) repart en "queued" et son export reprend
+    à partir des parties déjà rendues (voir ResumableExport ; seulement avec
+    les moteurs qui rendent par parties, les autres refont le rendu).
+    """
+
+    QUEUE_FILENAME = "render_queue.json"
+
+    def __init__(self,
+                 service: ExportService,
+                 queue_file: Optional[Union[str, Path]] = None,
+                 max_concurrent: int = 1,
+                 threads_per_job: Optional[int] = None):
+        self._service = service
+        self.queue_file = Path(queue_file) if queue_file else \
+            Path(LMPRJChunkedSerializer.get_save_dir()) / self.QUEUE_FILENAME
+        self.max_concurrent = max(1, int(max_concurrent))
+        self.threads_per_job = threads_per_job
+
+        self._lock = threading.RLock()
+        self._jobs: List[RenderQueueJob] = []
+        self._monitors: Dict[str, RenderMonitor] = {}
+        self._wakeup = threading.Condition(self._lock)
+        self._stopping = False
+        self._dispatcher: Optional[threading.Thread] = None
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._running = 0
+        self.load()
+
+    # --- Persistance ---
+    def load(self) -> None:
+        with self._lock:
+            if not self.queue_file.exists():
+                self._jobs = []
+                return
+            try:
+                data = json.loads(self.queue_file.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as e:
+                print(f"File de rendu illisible ({self.queue_file}) : {e}")
+                self._jobs = []
+                return
+            self._jobs = []
+            for d in data.get("jobs", []):
+                job = RenderQueueJob(**d)
+                if job.status == RUNNING:
+                    job.status, job.started_at, job.finished_at = QUEUED, None, None
+                self._jobs.append(job)
+
+    def save(self) -> None:
+        with self._lock:
+            payload = {"version": 1, "jobs": [asdict(j) for j in self._jobs]}
+            self.queue_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.queue_file.with_suffix(self.queue_file.suffix + ".tmp")
+            tmp.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+            os.replace(tmp, self.queue_file)
+
+    # --- Gestion de la file ---
+    def add(self,
+            project_file: str,
+            output: Union[str, Path],
+            profile: Union[str, ExportProfile, None] = None) -> RenderQueueJob:
+        """Ajoute un job ; `profile` = clé de DEFAULT_PROFILES ou ExportProfile."""
+        if profile is None:
+            profile = DEFAULT_PROFILES["h264_medium"]
+        elif isinstance(profile, str):
+            if profile not in DEFAULT_PROFILES:
+                raise KeyError(f"Profil inconnu : {profile}")
+            profile = DEFAULT_PROFILES[profile]
+        job = RenderQueueJob(project_file=project_file, output=str(output), profile=asdict(profile))
+        with self._lock:
+            self._jobs.append(job)
+            self.save()
+            self._wakeup.notify_all()
+        return job
+
+    def remove(self, job_id: str) -> bool:
+        """Retire un job non démarré (ou annule puis retire un job en cours)."""
+        with self._lock:
+            job = self.get(job_id)
+            if job is None:
+                return False
+            if job.status == RUNNING:
+                self.cancel(job_id)
+            self._jobs.remove(job)
+            self.save()
+            return True
+
+    def cancel(self, job_id: str) -> None:
+        with self._lock:
+            job = self.get(job_id)
+            if job is None:
+                return
+            if job.status == QUEUED:
+                job.status = CANCELLED
+                self.save()
+            elif job.id in self._monitors:
+                self._monitors[job.id].cancel()
+
+    def get(self, job_id: str) -> Optional[RenderQueueJob]:
+        with self._lock:
+            return next((j for j in self._jobs if j.id == job_id), None)
+
+    def jobs(self) -> List[RenderQueueJob]:
+        with self._lock:
+            return list(self._jobs)
+
+    def clear_finished(self) -> None:
+        with self._lock:
+            self._jobs = [j for j in self._jobs if j.status in (QUEUED, RUNNING)]
+            self.save()
+
+    # --- Ordonnanceur ---
+    def start(self) -> None:
+        """Démarre l'ordonnanceur (thread de fond)."""
+        with self._lock:
+            if self._dispatcher and self._dispatcher.is_alive():
+                return
+            self._stopping = False
+            self._pool = ThreadPoolExecutor(max_workers=self.max_concurrent,
+                                            thread_name_prefix="render-queue")
+            self._dispatcher = threading.Thread(target=self._dispatch_loop,
+                                                name="render-queue-dispatcher", daemon=True)
+            self._dispatcher.start()
+
+    def stop(self, cancel_running: bool = False) -> None:
+        """Arrête de lancer de nouveaux jobs ; attend (ou annule) ceux en cours."""
+        with self._lock:
+            self._stopping = True
+            if cancel_running:
+                for mon in self._monitors.values():
+                    mon.cancel()
+            self._wakeup.notify_all()
+        if self._dispatcher:
+            self._dispatcher.join()
+        if self._pool:
+            self._pool.shutdown(wait=True)
+        self._dispatcher = self._pool = None
+
+    def run_until_complete(self) -> List[RenderQueueJob]:
+        """Traite toute la file puis rend la main (usage batch / nuit)."""
+        self.start()
+        with self._lock:
+            while any(j.status in (QUEUED, RUNNING) for j in self._jobs):
+                self._wakeup.wait(1.0)
+        self.stop()
+        return self.jobs()
+
+    def _dispatch_loop(self) -> None:
+        with self._lock:
+            while not self._stopping:
+                job = next((j for j in self._jobs if j.status == QUEUED), None)
+                if job is None or self._running >= self.max_concurrent:
+                    self._wakeup.wait(1.0)
+                    continue
+                job.status = RUNNING
+                job.started_at, job.finished_at, job.error = time.time(), None, None
+                self._monitors[job.id] = RenderMonitor(
+                    on_progress=lambda info, j=job: setattr(j, "frames", info.frame))
+                self._running += 1
+                self.save()
+                self._pool.submit(self._run_job, job)
+
+    def _run_job(self, job: RenderQueueJob) -> None:
+        monitor = self._monitors[job.id]
+        status, error = DONE, None
+        try:
+            proj = ProjectAPI.load(job.project_file)
+            job.media_duration_s = proj.total_duration_s()
+            profile = job.export_profile()
+            if self.threads_per_job:
+                extra = dict(profile.extra_output_args)
+                extra["threads"] = self.threads_per_job
+                profile = replace(profile, extra_output_args=extra)
+            # Reprise : un job relancé après un arrêt brutal repart de ses parties déjà
+            # rendues, si le moteur rend par parties (sinon render() du moteur)
+            service = self._job_service()
+            service.export_project(proj, Path(job.output), profile, monitor=monitor,
+                                   resumable=ResumableExport.supports(service.engine))
+        except RenderCancelled:
+            status = CANCELLED
+            Path(job.output).unlink(missing_ok=True)
+            shutil.rmtree(ResumableExport.checkpoint_dir(Path(job.output)), ignore_errors=True)
+        except (RenderError, OSError) as e:
+            status, error = FAILED, str(e)
+        except Exception as e:
+            status, error = FAILED, f"Erreur inattendue : {e}"
+        finally:
+            with self._lock:
+                job.status, job.error = status, error
+                job.finished_at = time.time()
+                self._monitors.pop(job.id, None)
+                self._running -= 1
+                self.save()
+                self._wakeup.notify_all()
+            t = job.throughput()
+            print(f"[render-queue] {job.id} {status} : {job.output} — {t['wall_s']:.1f}s, "
+                  f"x{t['realtime_factor']:.2f} temps réel, {t['fps']:.1f} i/s")
+
+    def _job_service(self) -> ExportService:
+        """Service d'un job : moteur parallèle limité à sa part des cœurs si plusieurs jobs tournent."""
+        engine = self._service.engine
+        if self.max_concurrent > 1 and hasattr(engine, "with_cpu_share"):
+            return ExportService(engine.with_cpu_share((os.cpu_count() or 1) // self.max_concurrent))
+        return self._service
+
+    # --- Rapport ---
+    def report(self) -> List[Dict[str, Any]]:
+        """Débit par job (pour affichage ou export JSON)."""
+        rows = []
+        for job in self.jobs():
+            row = {"id": job.id, "project": job.project_file, "output": job.output,
+                   "status": job.status, "error": job.error}
+            row.update(job.throughput())
+            rows.append(row)
+        return rows
@@ -0,0 +1,303 @@
+# core/export/resumable.py
+from __future__ import annotations
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from core.project import Project
+from core.export.engine_interface import RenderError, RenderMonitor
+from core.export.export_profile import ExportProfile
+from core.export.ffmpeg_engine import FfmpegRenderEngine
+from core.export import loudness
+from core.runtime_env import app_cache_dir
+
+MANIFEST_VERSION = 3
+
+# Flux gardés après export (mode incrémental) : dossiers dans app_cache_dir("streams")
+MAX_KEPT_EXPORTS = 8
+# Manifest écrit depuis moins longtemps : export sans doute en cours dans un
+# autre processus, son dossier n'est pas supprimé
+ACTIVE_GRACE_S = 15 * 60
+
+# Dossiers de travail des exports en cours dans ce processus (file de rendu,
+# jobs simultanés) : jamais supprimés par _prune_streams
+_active_dirs: List[Path] = []
+_active_lock = threading.Lock()
+
+
+def _media_signature(paths) -> list:
+    sig = []
+    for path in sorted(set(paths)):
+        try:
+            st = os.stat(path)
+            sig.append([path, st.st_mtime, st.st_size])
+        except OSError:
+            sig.append([path, 0, 0])
+    return sig
+
+
+def _hash(data) -> str:
+    raw = json.dumps(data, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def video_inputs_hash(project: Project, profile: ExportProfile,
+                      render_options: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Tout ce dont dépend la vidéo rendue : clips, filtres, overlays, cadence,
+    résolution, fichiers sources (mtime, taille), paramètres vidéo du profil
+    et réglages du moteur (render_options, comme la clé du cache de segments).
+    """
+    data = project.to_dict()
+    for key in ("name", "output", "imported_assets", "audio_normalize"):
+        data.pop(key, None)
+    files = [c.path for c in project.clips] + [o.path for o in project.image_overlays] \
+        + [t.fontfile for t in project.text_overlays if t.fontfile]
+    return _hash([data, _media_signature(files), profile.to_video_args(), profile.resolution,
+                  render_options or {}])
+
+
+def audio_inputs_hash(project: Project, profile: ExportProfile) -> str:
+    """Tout ce dont dépend la piste audio : clips, normalisation, sources, paramètres audio."""
+    clips = [[c.path, c.in_s, c.out_s, c.duration_s] for c in project.clips]
+    return _hash([clips, project.audio_normalize,
+                  [loudness.TARGET_I, loudness.TARGET_TP, loudness.TARGET_LRA],
+                  _media_signature(c.path for c in project.clips), profile.to_audio_args()])
+
+
+class ResumableExport:
+    """
+    Export avec points de reprise : les parties vidéo (MPEG-TS, décodables
+    seules) et la piste audio sont écrites dans `<sortie>.parts/` avec un
+    manifest.json mis à jour à chaque partie terminée.
+
+    Le manifest retient séparément les entrées de chaque flux (hash vidéo :
+    clips, filtres, overlays, paramètres vidéo ; hash audio : clips,
+    normalisation, paramètres audio). Relancé, l'export ne refait que le flux
+    dont les entrées ont changé, les parties déjà présentes sont sautées, et
+    la sortie est réassemblée en copie de flux. Le dossier est supprimé une
+    fois la sortie assemblée ; il est conservé en cas d'échec ou d'annulation.
+
+    Les parties sont planifiées et produites par le moteur (plan_parts,
+    render_part_file) : le smart render y copie les plages intactes depuis
+    la source, un moteur avec cache de segments reprend ceux du cache.
+
+    `keep_streams=True` (export incrémental) garde les flux après l'export,
+    dans le cache de l'app (streams/) : un réglage audio ne coûte alors
+    qu'un rendu audio et un remux, et inversement pour un changement de
+    titre ou de filtre. Seuls les MAX_KEPT_EXPORTS derniers sont gardés.
+    """
+
+    MANIFEST = "manifest.json"
+
+    def __init__(self, engine: FfmpegRenderEngine, segment_s: float = 30.0,
+                 keep_streams: bool = False):
+        if not self.supports(engine):
+            raise RenderError(f"L'export avec reprise n'est pas disponible avec {type(engine).__name__}.")
+        self.engine = engine
+        self.segment_s = max(1.0, float(segment_s))
+        self.keep_streams = keep_streams
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def supports(engine) -> bool:
+        """Le moteur rend par parties comme l'export avec reprise (voir supports_resume)."""
+        return isinstance(engine, FfmpegRenderEngine) and engine.supports_resume()
+
+    @staticmethod
+    def checkpoint_dir(output_path: Path) -> Path:
+        return output_path.parent / f"{output_path.name}.parts"
+
+    @staticmethod
+    def streams_dir(output_path: Path) -> Path:
+        key = hashlib.sha1(str(Path(output_path).resolve()).encode("utf-8")).hexdigest()
+        return app_cache_dir("streams", key)
+
+    def work_dir(self, output_path: Path) -> Path:
+        return self.streams_dir(output_path) if self.keep_streams else self.checkpoint_dir(output_path)
+
+    def export(self, project: Project, output_path: Path, profile: ExportProfile,
+               monitor: Optional[RenderMonitor] = None) -> None:
+        output_path = Path(output_path)
+        work_dir = self.work_dir(output_path)
+        with _active_lock:
+            _active_dirs.append(work_dir)
+        try:
+            self._export(project, output_path, work_dir, profile, monitor)
+        finally:
+            with _active_lock:
+                _active_dirs.remove(work_dir)
+
+    def _export(self, project: Project, output_path: Path, work_dir: Path,
+                profile: ExportProfile, monitor: Optional[RenderMonitor]) -> None:
+        manifest = self._open_manifest(work_dir, project, profile)
+        ranges = [self.engine.part_from_dict(r) for r in manifest["ranges"]]
+        total = project.total_duration_s()
+
+        done = {int(i) for i, part in manifest["parts"].items()
+                if (work_dir / part["file"]).exists()
+                and (work_dir / part["file"]).stat().st_size == part["size"]}
+        audio_path = work_dir / "audio.mka"
+        audio_done = manifest.get("audio") is not None and audio_path.exists() \
+            and audio_path.stat().st_size == manifest["audio"]["size"]
+
+        if done or audio_done:
+            print(f"Reprise de l'export : {len(done)}/{len(ranges)} parties vidéo déjà rendues"
+                  + (", audio réutilisé" if audio_done else ", audio à rendre"))
+
+        if monitor:
+            monitor.add_task("audio", total, weight=total * self.engine.AUDIO_TASK_WEIGHT)
+            monitor.add_task("concat", total, weight=total * self.engine.CONCAT_TASK_WEIGHT)
+            for rng in ranges:
+                monitor.add_task(self.engine.part_task(rng.start), rng.duration)
+            for i in done:
+                monitor.finish(self.engine.part_task(ranges[i].start))
+            if audio_done:
+                monitor.finish("audio")
+
+        todo = [i for i in range(len(ranges)) if i not in done]
+        workers = max(1, int(getattr(self.engine, "workers", 1)))
+
+        def render_part(i: int) -> None:
+            rng = ranges[i]
+            name = f"part_{i:05d}.ts"
+            tmp = work_dir / f"{name}.tmp"
+            self.engine.render_part_file(project, rng, tmp, profile, monitor)
+            os.replace(tmp, work_dir / name)
+            self._checkpoint(work_dir, manifest, part=(i, name))
+
+        def render_audio() -> None:
+            tmp = work_dir / "audio.tmp.mka"
+            self.engine.render_audio_track(project, tmp, profile, monitor)
+            os.replace(tmp, audio_path)
+            self._checkpoint(work_dir, manifest, audio=True)
+
+        # segments copiés depuis le cache du moteur : pas d'éviction pendant le rendu
+        cache = getattr(self.engine, "cache", None)
+        cache_session = cache.begin() if cache is not None else None
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = [] if audio_done else [pool.submit(render_audio)]
+                # dans l'ordre : la reprise repart de la première partie manquante
+                futures += [pool.submit(render_part, i) for i in todo]
+                try:
+                    for fut in futures:
+                        fut.result()
+                except BaseException:
+                    for fut in futures:
+                        fut.cancel()
+                    raise
+        finally:
+            if cache_session is not None:
+                cache.end(cache_session)
+
+        parts = [work_dir / f"part_{i:05d}.ts" for i in range(len(ranges))]
+        self.engine.concat_parts(parts, audio_path, output_path, profile, monitor, total)
+        if self.keep_streams:
+            os.utime(work_dir)
+            self._prune_streams(keep=work_dir)
+        else:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    # --- Manifest ---
+
+    def _open_manifest(self, work_dir: Path, project: Project, profile: ExportProfile) -> Dict[str, Any]:
+        v_hash = video_inputs_hash(project, profile, self.engine.render_options())
+        a_hash = audio_inputs_hash(project, profile)
+        path = work_dir / self.MANIFEST
+        if path.exists():
+            try:
+                manifest = json.loads(path.read_text(encoding="utf-8"))
+                if manifest.get("version") == MANIFEST_VERSION:
+                    return self._refresh_manifest(work_dir, manifest, project, profile, v_hash, a_hash)
+            except (OSError, ValueError):
+                pass
+            print(f"Points de reprise illisibles ou d'un ancien format, on repart de zéro : {work_dir}")
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+        work_dir.mkdir(parents=True, exist_ok=True)
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "video_hash": v_hash,
+            "audio_hash": a_hash,
+            "ranges": self._plan(project, profile),
+            "parts": {},
+            "audio": None,
+        }
+        self._write_manifest(work_dir, manifest)
+        return manifest
+
+    def _refresh_manifest(self, work_dir: Path, manifest: Dict[str, Any], project: Project,
+                          profile: ExportProfile, v_hash: str, a_hash: str) -> Dict[str, Any]:
+        """Invalide uniquement le flux dont les entrées ont changé."""
+        if manifest.get("video_hash") != v_hash:
+            if manifest.get("parts"):
+                print("Entrées vidéo modifiées : la vidéo sera re-rendue")
+            for part in manifest.get("parts", {}).values():
+                (work_dir / part["file"]).unlink(missing_ok=True)
+            manifest.update(video_hash=v_hash, ranges=self._plan(project, profile), parts={})
+        if manifest.get("audio_hash") != a_hash:
+            if manifest.get("audio"):
+                print("Entrées audio modifiées : l'audio sera re-rendu")
+            (work_dir / "audio.mka").unlink(missing_ok=True)
+            manifest.update(audio_hash=a_hash, audio=None)
+        self._write_manifest(work_dir, manifest)
+        return manifest
+
+    def _plan(self, project: Project, profile: ExportProfile) -> list:
+        # plages du moteur (ex. copies de flux du smart render), relues par part_from_dict
+        ranges = self.engine.plan_parts(project, profile, self.segment_s)
+        if not ranges:
+            raise RenderError("Le projet est vide, aucun clip à exporter.")
+        return [asdict(r) for r in ranges]
+
+    @classmethod
+    def _prune_streams(cls, keep: Path) -> None:
+        """
+        Ne garde que les MAX_KEPT_EXPORTS flux d'export les plus récents ;
+        les dossiers d'exports en cours (ce processus, ou manifest récent)
+        ne sont jamais supprimés.
+        """
+        try:
+            dirs = sorted((d for d in keep.parent.iterdir() if d.is_dir()),
+                          key=lambda d: d.stat().st_mtime, reverse=True)
+        except OSError:
+            return
+        recent = time.time() - ACTIVE_GRACE_S
+        with _active_lock:
+            active = set(_active_dirs)
+        for d in dirs[MAX_KEPT_EXPORTS:]:
+            if d == keep or d in active:
+                continue
+            try:
+                if (d / cls.MANIFEST).stat().st_mtime > recent:
+                    continue
+            except OSError:
+                pass
+            shutil.rmtree(d, ignore_errors=True)
+
+    def _checkpoint(self, work_dir: Path, manifest: Dict[str, Any],
+                    part: Optional[tuple] = None, audio: bool = False) -> None:
+        # appelé depuis les threads du pool : une écriture atomique à la fois
+        with self._lock:
+            if part is not None:
+                i, name = part
+                manifest["parts"][str(i)] = {"file": name, "size": (work_dir / name).stat().st_size}
+            if audio:
+                manifest["audio"] = {"size": (work_dir / "audio.mka").stat().st_size}
+            self._write_manifest(work_dir, manifest)
+
+    def _write_manifest(self, work_dir: Path, manifest: Dict[str, Any]) -> None:
+        tmp = work_dir / f"{self.MANIFEST}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, work_dir / self.MANIFEST)
@@ -0,0 +1,249 @@
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import ffmpeg
+
+from core.project import Project, Clip, Filters
+from core.export.engine_interface import RenderError, RenderMonitor
+from core.export.ffmpeg_runner import run_ffmpeg
+from core.export.export_profile import ExportProfile
+from core.export.parallel_engine import ParallelFfmpegRenderEngine
+from core.export.timeline_slicing import clip_spans, split_range
+from core.export import probe
+
+
+@dataclass
+class PlannedRange:
+    """Plage de timeline [start, end) et la façon de la produire."""
+    start: float
+    end: float
+    copy: bool = False
+    # Pour une plage copiée : source et instant d'entrée (image clé)
+    path: Optional[str] = None
+    src_start: float = 0.0
+
+    @property
+    def duration(self) -> float:
+        return max(0.0, self.end - self.start)
+
+
+class SmartRenderEngine(ParallelFfmpegRenderEngine):
+    """
+    Rendu "intelligent" : les portions intactes de la timeline sont copiées
+    GOP par GOP depuis la source (-c:v copy) ; seuls les bords de coupe et
+    les plages filtrées ou recouvertes par un overlay sont ré-encodés.
+
+    Une plage est copiable si :
+    - les Filters du projet sont aux valeurs par défaut ;
+    - aucun overlay (texte ou image) n'est actif sur la plage ;
+    - le flux vidéo source a le codec, le pix_fmt, la résolution et la
+      cadence attendus par le projet et le profil.
+    L'audio est toujours rendu en une passe, comme dans le moteur parallèle.
+    """
+
+    def __init__(self, min_copy_s: float = 1.0, **kwargs):
+        super().__init__(**kwargs)
+        self.min_copy_s = max(0.0, float(min_copy_s))
+
+    def render(self,
+               project: Project,
+               output_path: Path,
+               profile: ExportProfile,
+               monitor: Optional[RenderMonitor] = None) -> None:
+        plan = [] if profile.progressive else self.plan(project, profile)
+        if not any(r.copy for r in plan):
+            return super().render(project, output_path, profile, monitor)
+
+        copied = sum(r.duration for r in plan if r.copy)
+        print(f"Smart render : {copied:.1f}s copiées sur {project.total_duration_s():.1f}s "
+              f"({sum(1 for r in plan if not r.copy)} plages à ré-encoder)")
+
+        part_profile = self._worker_profile(profile)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        work_dir = Path(tempfile.mkdtemp(prefix=f".{output_path.stem}.parts-",
+                                         dir=output_path.parent))
+        parts: List[Path] = []
+        cache_session = self.cache.begin() if self.cache is not None else None
+        try:
+            audio_path = work_dir / "audio.mka"
+
+            total = project.total_duration_s()
+            if monitor:
+                monitor.add_task("audio", total, weight=total * self.AUDIO_TASK_WEIGHT)
+                monitor.add_task("concat", total, weight=total * self.CONCAT_TASK_WEIGHT)
+                for rng in plan:
+                    # une copie de flux ne coûte presque rien face à un encodage
+                    weight = rng.duration * self.CONCAT_TASK_WEIGHT if rng.copy else None
+                    monitor.add_task(self.part_task(rng.start), rng.duration, weight)
+
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                audio_future = pool.submit(self.render_audio_track, project, audio_path, profile, monitor)
+                part_futures = []
+                for i, rng in enumerate(plan):
+                    part = work_dir / f"part_{i:05d}.ts"
+                    if rng.copy:
+                        part_futures.append(pool.submit(self._copy_part, rng, part, monitor))
+                    else:
+                        part_futures.append(pool.submit(self._render_part, project, rng,
+                                                        [(part_profile, profile, part)], monitor))
+                self._wait_all([audio_future] + part_futures)
+                parts = [work_dir / f"part_{i:05d}.ts" if rng.copy else fut.result()[0]
+                         for i, (rng, fut) in enumerate(zip(plan, part_futures))]
+
+            self.concat_parts(parts, audio_path, output_path, profile, monitor, total)
+        except RenderError:
+            raise
+        except Exception as e:
+            raise RenderError(f"Erreur inattendue lors du smart render : {e}")
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+            if cache_session is not None:
+                self.cache.end(cache_session, protect=parts)
+
+    # --- Planification ---
+
+    def plan(self, project: Project, profile: ExportProfile,
+             segment_s: Optional[float] = None) -> List[PlannedRange]:
+        """
+        Classe la timeline en plages "copiables" et "à rendre", dans l'ordre.
+        Les plages à rendre font au plus `segment_s` (par défaut, selon le
+        nombre de workers ou la fenêtre du cache).
+        """
+        total = project.total_duration_s()
+        if segment_s is None or self.cache is not None:
+            segment_s = self._segment_length(total) if total else self.min_segment_s
+
+        filters_default = project.filters == Filters()
+        windows = self._overlay_windows(project)
+
+        plan: List[PlannedRange] = []
+        for t0, t1, clip in clip_spans(project):
+            pieces = []
+            if filters_default and self._source_matches(clip, project, profile):
+                pieces = self._copy_pieces(clip, t0, t1, windows)
+            cursor = t0
+            for piece in pieces:
+                if piece.start > cursor:
+                    plan.append(PlannedRange(cursor, piece.start))
+                plan.append(piece)
+                cursor = piece.end
+            if t1 > cursor:
+                plan.append(PlannedRange(cursor, t1))
+
+        return self._merge_and_split(plan, segment_s, project.fps)
+
+    def _overlay_windows(self, project: Project) -> List[Tuple[float, float]]:
+        """Fenêtres temporelles (fusionnées) où un overlay est actif."""
+        spans = sorted((ov.start, ov.end)
+                       for ov in list(project.text_overlays) + list(project.image_overlays)
+                       if ov.end > ov.start)
+        merged: List[Tuple[float, float]] = []
+        for s, e in spans:
+            if merged and s <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], e))
+            else:
+                merged.append((s, e))
+        return merged
+
+    def _source_matches(self, clip: Clip, project: Project, profile: ExportProfile) -> bool:
+        st = probe.video_stream(clip.path)
+        if not st:
+            return False
+        if st.get("codec_name") != probe.ENCODER_CODECS.get(profile.vcodec, profile.vcodec):
+            return False
+        if st.get("pix_fmt") != profile.pix_fmt:
+            return False
+        if (int(st.get("width", 0)), int(st.get("height", 0))) != tuple(project.resolution):
+            return False
+        if profile.resolution and tuple(profile.resolution) != tuple(project.resolution):
+            return False
+        return abs(probe.stream_fps(st) - float(project.fps)) < 0.01
+
+    def _copy_pieces(self, clip: Clip, t0: float, t1: float,
+                     windows: List[Tuple[float, float]]) -> List[PlannedRange]:
+        """Plages copiables d'un clip : zones sans overlay, recalées sur les images clés."""
+        clean = []
+        cursor = t0
+        for s, e in windows:
+            if e <= cursor or s >= t1:
+                continue
+            if s > cursor:
+                clean.append((cursor, s))
+            cursor = max(cursor, e)
+        if cursor < t1:
+            clean.append((cursor, t1))
+
+        pieces = []
+        for a, b in clean:
+            sa = clip.in_s + (a - t0)
+            sb = clip.in_s + (b - t0)
+            kfs = probe.keyframe_times(clip.path, sa, sb)
+            if len(kfs) < 2:
+                continue
+            k0, k1 = kfs[0], kfs[-1]
+            if k1 - k0 < self.min_copy_s:
+                continue
+            pieces.append(PlannedRange(start=t0 + (k0 - clip.in_s),
+                                       end=t0 + (k1 - clip.in_s),
+                                       copy=True, path=clip.path, src_start=k0))
+        return pieces
+
+    def _merge_and_split(self, plan: List[PlannedRange], segment_s: float,
+                         fps: float) -> List[PlannedRange]:
+        """Fusionne les plages à rendre contiguës puis les redécoupe pour le pool."""
+        merged: List[PlannedRange] = []
+        for r in plan:
+            if r.duration <= 1e-6:
+                continue
+            if merged and not r.copy and not merged[-1].copy:
+                merged[-1].end = r.end
+            else:
+                merged.append(r)
+
+        out: List[PlannedRange] = []
+        fps = float(fps) or 30.0
+        for r in merged:
+            if r.copy or r.duration <= segment_s:
+                out.append(r)
+                continue
+            # avec cache, fenêtres fixes depuis le début de la plage (voir plan_segments)
+            out.extend(PlannedRange(a, b)
+                       for a, b in split_range(r.start, r.end, segment_s, fps, fixed=self.cache is not None))
+        return out
+
+    # --- Export par parties (ResumableExport) ---
+
+    def plan_parts(self, project: Project, profile: ExportProfile, segment_s: float) -> List[PlannedRange]:
+        return self.plan(project, profile, segment_s)
+
+    @staticmethod
+    def part_from_dict(data: dict) -> PlannedRange:
+        return PlannedRange(**data)
+
+    def render_part_file(self,
+                         project: Project,
+                         rng,
+                         output_path: Path,
+                         profile: ExportProfile,
+                         monitor: Optional[RenderMonitor] = None) -> None:
+        if getattr(rng, "copy", False):
+            return self._copy_part(rng, output_path, monitor)
+        super().render_part_file(project, rng, output_path, profile, monitor)
+
+    # --- Copie de flux ---
+
+    def _copy_part(self, rng: PlannedRange, output_path: Path,
+                   monitor: Optional[RenderMonitor] = None) -> None:
+        """Extrait la plage depuis la source sans ré-encodage (début sur image clé)."""
+        try:
+            inp = ffmpeg.input(rng.path, ss=rng.src_start, t=rng.duration)
+            stream = ffmpeg.output(inp['v'], str(output_path), c='copy', an=None, f='mpegts')
+            weight = rng.duration * self.CONCAT_TASK_WEIGHT
+            run_ffmpeg(stream, monitor, self.part_task(rng.start), rng.duration, weight)
+        except ffmpeg.Error as e:
+            error_msg = e.stderr.decode() if e.stderr else str(e)
+            raise RenderError(f"Échec de la copie de {rng.path} : {error_msg}")
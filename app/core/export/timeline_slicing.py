@@ -0,0 +1,114 @@
+# core/export/timeline_slicing.py
+from __future__ import annotations
+import math
+from dataclasses import dataclass, replace
+from typing import List, Tuple
+
+from core.project import Project, Clip
+
+
+@dataclass(frozen=True)
+class TimeRange:
+    """Intervalle [start, end) exprimé en secondes sur la timeline globale."""
+    start: float
+    end: float
+
+    @property
+    def duration(self) -> float:
+        return max(0.0, self.end - self.start)
+
+
+def clip_spans(project: Project) -> List[Tuple[float, float, Clip]]:
+    """
+    Retourne [(t0, t1, clip)] : la position de chaque clip sur la timeline
+    globale (séquence sans trous, dans l'ordre de Project.clips).
+    """
+    spans = []
+    acc = 0.0
+    for c in project.clips:
+        dur = max(0.0, c.effective_duration)
+        if dur <= 0.0:
+            continue
+        spans.append((acc, acc + dur, c))
+        acc += dur
+    return spans
+
+
+def plan_segments(project: Project, max_segment_s: float, fixed: bool = False) -> List[TimeRange]:
+    """
+    Découpe la timeline en plages de rendu indépendantes.
+
+    Les coupes tombent toujours sur les bords de clips, puis chaque clip trop
+    long est subdivisé sur la grille d'images (relative au début du clip) :
+    une plage ne dépend ainsi que de son clip, et les parties concaténées
+    gardent un nombre entier d'images.
+
+    Par défaut les morceaux d'un clip sont égaux. Avec `fixed`, ce sont des
+    fenêtres de `max_segment_s` depuis la première image du clip, la dernière
+    prenant le reste : raccourcir la fin d'un clip ne change que sa dernière
+    plage (cache de segments).
+    """
+    fps = float(project.fps) or 30.0
+    max_segment_s = max(1.0 / fps, float(max_segment_s))
+    ranges: List[TimeRange] = []
+    for t0, t1, _clip in clip_spans(project):
+        ranges.extend(TimeRange(a, b) for a, b in split_range(t0, t1, max_segment_s, fps, fixed))
+    return ranges
+
+
+def split_range(start: float, end: float, max_segment_s: float, fps: float,
+                fixed: bool = False) -> List[Tuple[float, float]]:
+    """Subdivise [start, end) en morceaux d'au plus `max_segment_s`, coupés sur la grille d'images."""
+    dur = end - start
+    frames = int(round(dur * fps))
+    if fixed:
+        step = max(1, int(round(max_segment_s * fps)))
+        cuts = [start + k / fps for k in range(step, frames, step)]
+    else:
+        n = max(1, math.ceil(dur / max_segment_s - 1e-9))
+        cuts = [start + round(frames * k / n) / fps for k in range(1, n)]
+    pieces = []
+    prev = start
+    for cut in cuts:
+        if cut - prev <= 0.0 or end - cut <= 0.0:
+            continue
+        pieces.append((prev, cut))
+        prev = cut
+    pieces.append((prev, end))
+    return pieces
+
+
+def slice_project(project: Project, start: float, end: float) -> Project:
+    """
+    Construit un Project ne contenant que la portion [start, end) de la timeline.
+
+    Les clips sont recoupés (in_s/out_s/duration_s) et les overlays qui
+    intersectent la plage sont conservés avec des temps rebasés sur `start`,
+    de sorte que leurs fenêtres 'enable' restent exactes dans la partie.
+    """
+    start = max(0.0, float(start))
+    end = float(end)
+
+    sub = replace(project, clips=[], text_overlays=[], image_overlays=[])
+    sub.imported_assets = list(project.imported_assets)
+
+    for t0, t1, c in clip_spans(project):
+        a, b = max(t0, start), min(t1, end)
+        if b - a <= 1e-9:
+            continue
+        in_s = c.in_s + (a - t0)
+        dur = b - a
+        sub.clips.append(Clip(path=c.path, in_s=in_s, out_s=in_s + dur, duration_s=dur))
+
+    length = max(0.0, end - start)
+    for ov in project.text_overlays:
+        if ov.end <= start or ov.start >= end:
+            continue
+        sub.text_overlays.append(replace(ov, start=max(0.0, ov.start - start),
+                                         end=min(length, ov.end - start)))
+    for ov in project.image_overlays:
+        if ov.end <= start or ov.start >= end:
+            continue
+        sub.image_overlays.append(replace(ov, start=max(0.0, ov.start - start),
+                                          end=min(length, ov.end - start)))
+    return sub
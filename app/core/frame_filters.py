@@ -0,0 +1,174 @@
+# core/frame_filters.py
+"""
+Traitements image par image en NumPy/OpenCV, communs à l'aperçu de
+l'éditeur et au moteur de rendu FrameServerRenderEngine.
+
+Les images sont des tableaux uint8 BGR (convention OpenCV), H x W x 3.
+Les réglages reproduisent ceux de ffmpeg utilisés à l'export :
+- 'eq' (brightness/contrast sur la luma, saturation sur la chroma) ;
+- 'vignette' (angle PI/4, centre de l'image).
+"""
+from __future__ import annotations
+import functools
+import math
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from core.project import Filters, ImageOverlay
+
+VIGNETTE_ANGLE = math.pi / 4
+
+
+def eq_luts(filters: Filters) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Tables 256 entrées : (luma, chroma). Même formule que le filtre 'eq' :
+    Y' = (Y - 0.5) * contrast + 0.5 + brightness, chroma centrée * saturation.
+    """
+    v = np.arange(256, dtype=np.float32) / 255.0
+    brightness = min(1.0, max(-1.0, float(filters.brightness)))
+    luma = ((v - 0.5) * float(filters.contrast) + 0.5 + brightness) * 255.0
+    chroma = (np.arange(256, dtype=np.float32) - 128.0) * float(filters.saturation) + 128.0
+    return (np.clip(np.rint(luma), 0, 255).astype(np.uint8),
+            np.clip(np.rint(chroma), 0, 255).astype(np.uint8))
+
+
+@functools.lru_cache(maxsize=8)
+def vignette_mask(width: int, height: int, angle: float = VIGNETTE_ANGLE) -> np.ndarray:
+    """
+    Masque de vignettage en virgule fixe (0..256, uint16, H x W x 1) :
+    facteur cos(angle * d / dmax)^4 comme le filtre 'vignette'. Mis en cache
+    par taille, il n'est calculé qu'une fois par rendu.
+    """
+    ys, xs = np.mgrid[0:height, 0:width].astype(np.float32)
+    x0, y0 = width / 2.0, height / 2.0
+    dmax = math.hypot(x0, y0) or 1.0
+    dnorm = np.hypot(xs - x0, ys - y0) / dmax
+    c = np.cos(angle * np.minimum(dnorm, 1.0))
+    factor = (c * c) * (c * c)
+    mask = np.rint(factor * 256.0).astype(np.uint16)
+    mask.setflags(write=False)
+    return mask[..., None]
+
+
+class FrameFilterProcessor:
+    """
+    Applique les Filters du projet à des images BGR. Les LUT sont recalculées
+    seulement quand les Filters changent ; le masque de vignette est mis en
+    cache par taille d'image.
+    """
+
+    def __init__(self, filters: Optional[Filters] = None):
+        self._key = None
+        self._luts = None
+        self._identity = True
+        self.set_filters(filters or Filters())
+
+    def set_filters(self, filters: Filters) -> None:
+        key = (filters.brightness, filters.contrast, filters.saturation, filters.vignette)
+        if key == self._key:
+            return
+        self._key = key
+        self._vignette = bool(filters.vignette)
+        self._eq_identity = (filters.brightness == 0 and filters.contrast == 1
+                             and filters.saturation == 1)
+        self._identity = self._eq_identity and not self._vignette
+        self._luts = eq_luts(filters)
+
+    @property
+    def is_identity(self) -> bool:
+        return self._identity
+
+    def apply(self, frame: np.ndarray) -> np.ndarray:
+        """Traite l'image en place (et la retourne)."""
+        if self._identity:
+            return frame
+        if not self._eq_identity:
+            luma_lut, chroma_lut = self._luts
+            ycc = cv2.cvtColor(frame, cv2.COLOR_BGR2YCrCb)
+            y, cr, cb = cv2.split(ycc)
+            cv2.LUT(y, luma_lut, dst=y)
+            cv2.LUT(cr, chroma_lut, dst=cr)
+            cv2.LUT(cb, chroma_lut, dst=cb)
+            cv2.cvtColor(cv2.merge((y, cr, cb)), cv2.COLOR_YCrCb2BGR, dst=frame)
+        if self._vignette:
+            h, w = frame.shape[:2]
+            mask = vignette_mask(w, h)
+            np.right_shift(frame * mask, 8, out=frame, casting="unsafe")
+        return frame
+
+    def apply_batch(self, frames: np.ndarray, count: Optional[int] = None) -> np.ndarray:
+        """Traite les `count` premières images d'un tampon N x H x W x 3."""
+        if self._identity:
+            return frames
+        for i in range(frames.shape[0] if count is None else count):
+            self.apply(frames[i])
+        return frames
+
+
+@functools.lru_cache(maxsize=32)
+def load_overlay_rgba(path: str, width: int, height: int, opacity: float = 1.0) -> Optional[np.ndarray]:
+    """
+    Image d'overlay décodée une fois, redimensionnée à sa taille finale et
+    opacité appliquée : tableau (BGR float32 prémultiplié, alpha float32).
+    """
+    img = cv2.imread(path, cv2.IMREAD_UNCHANGED)
+    if img is None:
+        return None
+    if img.ndim == 2:
+        img = cv2.cvtColor(img, cv2.COLOR_GRAY2BGRA)
+    elif img.shape[2] == 3:
+        img = cv2.cvtColor(img, cv2.COLOR_BGR2BGRA)
+    interp = cv2.INTER_AREA if img.shape[1] > width else cv2.INTER_LINEAR
+    img = cv2.resize(img, (max(1, width), max(1, height)), interpolation=interp)
+    alpha = img[..., 3:4].astype(np.float32) * (min(1.0, max(0.0, opacity)) / 255.0)
+    bgr = img[..., :3].astype(np.float32) * alpha
+    return np.ascontiguousarray(np.concatenate([bgr, alpha], axis=2))
+
+
+def blend_rgba(frame: np.ndarray, rgba: np.ndarray, x: int, y: int) -> None:
+    """Compose (en place) une image BGRA prémultipliée en (x, y), avec découpe aux bords."""
+    fh, fw = frame.shape[:2]
+    oh, ow = rgba.shape[:2]
+    x0, y0 = max(0, x), max(0, y)
+    x1, y1 = min(fw, x + ow), min(fh, y + oh)
+    if x1 <= x0 or y1 <= y0:
+        return
+    src = rgba[y0 - y:y1 - y, x0 - x:x1 - x]
+    roi = frame[y0:y1, x0:x1]
+    alpha = src[..., 3:4]
+    out = roi.astype(np.float32) * (1.0 - alpha) + src[..., :3]
+    np.clip(out, 0, 255, out=out)
+    roi[...] = out.astype(np.uint8)
+
+
+class ImageOverlayCompositor:
+    """
+    Overlays d'images à un instant t de la timeline : mêmes conventions que
+    l'export ffmpeg (x/y = centre normalisé, w/h = taille normalisée).
+    """
+
+    def __init__(self, overlays: List[ImageOverlay], width: int, height: int):
+        self.width, self.height = int(width), int(height)
+        self._items = []
+        for ov in overlays:
+            if ov.end <= ov.start:
+                continue
+            sw = max(1, round(ov.w * self.width))
+            sh = max(1, round(ov.h * self.height))
+            px = round(ov.x * self.width - sw / 2)
+            py = round(ov.y * self.height - sh / 2)
+            self._items.append((ov, sw, sh, px, py))
+
+    def __bool__(self) -> bool:
+        return bool(self._items)
+
+    def apply(self, frame: np.ndarray, t: float) -> np.ndarray:
+        for ov, sw, sh, px, py in self._items:
+            if not (ov.start <= t <= ov.end):
+                continue
+            rgba = load_overlay_rgba(ov.path, sw, sh, float(ov.opacity))
+            if rgba is not None:
+                blend_rgba(frame, rgba, px, py)
+        return frame
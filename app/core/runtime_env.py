@@ -0,0 +1,40 @@
+# core/runtime_env.py
+"""Préparation de l'environnement d'exécution, commune à l'app et au rendu headless."""
+import os
+import platform
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent
+CACHE_DIR_ENV = "LUMINARE_CACHE_DIR"
+
+
+def app_cache_dir(*parts: str) -> Path:
+    """
+    Dossier de cache (absolu) : app/cache/<parts>, ou $LUMINARE_CACHE_DIR/<parts>.
+    Ne dépend pas du dossier courant : l'app, luminare-render et les appels
+    en bibliothèque partagent les mêmes caches.
+    """
+    base = os.environ.get(CACHE_DIR_ENV)
+    root = Path(base).expanduser().resolve() if base else APP_DIR / "cache"
+    return root.joinpath(*parts)
+
+
+def bootstrap_ffmpeg_on_path(root: Path):
+    """Ajoute un FFmpeg portable au PATH si disponible sous vendor/ffmpeg."""
+    system = platform.system().lower()
+    candidates = []
+    if system.startswith("win"):
+        candidates += [
+            root / "vendor" / "ffmpeg" / "windows" / "bin",
+            root / "vendor" / "ffmpeg" / "win64" / "bin",
+        ]
+    elif system == "darwin":
+        candidates += [root / "vendor" / "ffmpeg" / "macos" / "bin"]
+    else:
+        candidates += [root / "vendor" / "ffmpeg" / "linux" / "bin"]
+
+    for p in candidates:
+        if p.exists():
+            os.environ["PATH"] = str(p) + os.pathsep + os.environ.get("PATH", "")
+            print(f"FFmpeg bootstrapped from: {p}")
+            break
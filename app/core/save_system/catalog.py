@@ -0,0 +1,187 @@
+# core/save_system/catalog.py
+"""
+Catalogue des projets du dossier de sauvegarde (SQLite, catalog.sqlite).
+
+Une ligne par .lmprj : mtime, taille, nom, durée, nombres de clips et
+d'overlays, miniature. refresh() ne relit que les fichiers dont (mtime,
+taille) a changé, et seulement leur en-tête (read_header) ; les listes et
+recherches de l'écran d'accueil sont ensuite des requêtes indexées, sans
+ouvrir les projets.
+"""
+from __future__ import annotations
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from core.save_system.serializers import LMPRJChunkedSerializer
+
+SCHEMA_VERSION = 1
+THUMBNAIL_DIR = "thumbnails"
+THUMBNAIL_EXTS = (".png", ".jpg", ".jpeg")
+
+# Colonnes autorisées pour le tri (nom exposé -> expression SQL)
+SORT_KEYS = {
+    "mtime": "mtime",
+    "name": "name COLLATE NOCASE",
+    "duration": "duration_s",
+    "clips": "clip_count",
+    "size": "size",
+}
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    filename: str
+    name: str
+    mtime: float
+    size: int
+    duration_s: float
+    clip_count: int
+    text_overlay_count: int
+    image_overlay_count: int
+    thumbnail: Optional[str]
+
+
+class ProjectCatalog:
+    DB_NAME = "catalog.sqlite"
+    COLUMNS = ("filename", "name", "mtime", "size", "duration_s", "clip_count",
+               "text_overlay_count", "image_overlay_count", "thumbnail")
+
+    def __init__(self, save_dir: Optional[str] = None):
+        self.save_dir = save_dir or LMPRJChunkedSerializer.get_save_dir()
+        self.db_path = os.path.join(self.save_dir, self.DB_NAME)
+        # stockage partagé : on attend un verrou tenu par une autre instance
+        self._db = sqlite3.connect(self.db_path, timeout=10.0, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._migrate()
+
+    def close(self) -> None:
+        self._db.close()
+
+    def _migrate(self) -> None:
+        with self._lock, self._db:
+            version = self._db.execute("PRAGMA user_version").fetchone()[0]
+            if version == SCHEMA_VERSION:
+                return
+            self._db.execute("DROP TABLE IF EXISTS projects")
+            self._db.execute("""
+                CREATE TABLE projects (
+                    filename TEXT PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    mtime REAL NOT NULL,
+                    size INTEGER NOT NULL,
+                    duration_s REAL NOT NULL DEFAULT 0,
+                    clip_count INTEGER NOT NULL DEFAULT 0,
+                    text_overlay_count INTEGER NOT NULL DEFAULT 0,
+                    image_overlay_count INTEGER NOT NULL DEFAULT 0,
+                    thumbnail TEXT
+                )""")
+            self._db.execute("CREATE INDEX idx_projects_mtime ON projects (mtime)")
+            self._db.execute("CREATE INDEX idx_projects_name ON projects (name COLLATE NOCASE)")
+            self._db.execute("CREATE INDEX idx_projects_duration ON projects (duration_s)")
+            self._db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    # --- Mise à jour ---
+
+    def refresh(self) -> Tuple[int, int]:
+        """
+        Synchronise le catalogue avec le dossier : (fichiers relus, supprimés).
+        Un fichier n'est relu (en-tête seul) que si son mtime ou sa taille change.
+        """
+        on_disk = {}
+        with os.scandir(self.save_dir) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith(LMPRJChunkedSerializer.EXTENSION):
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    on_disk[entry.name] = (st.st_mtime, st.st_size)
+
+        with self._lock:
+            known = {row[0]: (row[1], row[2]) for row in
+                     self._db.execute("SELECT filename, mtime, size FROM projects")}
+        stale = [f for f, sig in on_disk.items() if known.get(f) != sig]
+        removed = [f for f in known if f not in on_disk]
+
+        rows = []
+        for filename in stale:
+            row = self._read_row(filename, *on_disk[filename])
+            if row is not None:
+                rows.append(row)
+
+        with self._lock, self._db:
+            self._db.executemany("DELETE FROM projects WHERE filename = ?", [(f,) for f in removed])
+            self._db.executemany(
+                f"INSERT OR REPLACE INTO projects ({', '.join(self.COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(self.COLUMNS))})", rows)
+        return len(rows), len(removed)
+
+    def _read_row(self, filename: str, mtime: float, size: int) -> Optional[tuple]:
+        try:
+            header = LMPRJChunkedSerializer.read_header(filename)
+        except Exception as e:
+            print(f"Catalogue : en-tête illisible pour {filename} : {e}")
+            return None
+        return (filename, header.get("name") or filename, mtime, size,
+                float(header.get("total_duration_s") or 0.0), int(header.get("clip_count") or 0),
+                int(header.get("text_overlay_count") or 0), int(header.get("image_overlay_count") or 0),
+                self._find_thumbnail(filename))
+
+    def _find_thumbnail(self, filename: str) -> Optional[str]:
+        """Miniature par convention : <dossier>/thumbnails/<projet>.png|jpg."""
+        stem = filename[:-len(LMPRJChunkedSerializer.EXTENSION)]
+        for ext in THUMBNAIL_EXTS:
+            path = os.path.join(self.save_dir, THUMBNAIL_DIR, stem + ext)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def set_thumbnail(self, filename: str, path: Optional[str]) -> None:
+        with self._lock, self._db:
+            self._db.execute("UPDATE projects SET thumbnail = ? WHERE filename = ?", (path, filename))
+
+    # --- Requêtes ---
+
+    def query(self,
+              name_contains: Optional[str] = None,
+              sort: str = "mtime",
+              descending: bool = True,
+              min_clips: Optional[int] = None,
+              min_duration_s: Optional[float] = None,
+              max_duration_s: Optional[float] = None,
+              limit: Optional[int] = None,
+              offset: int = 0) -> List[CatalogEntry]:
+        """Projets filtrés et triés (sort : mtime, name, duration, clips, size)."""
+        if sort not in SORT_KEYS:
+            raise ValueError(f"Tri inconnu : {sort} (attendu : {', '.join(SORT_KEYS)})")
+        where, params = [], []
+        if name_contains:
+            where.append("(name LIKE ? ESCAPE '\\' OR filename LIKE ? ESCAPE '\\')")
+            pattern = "%" + name_contains.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            params += [pattern, pattern]
+        if min_clips is not None:
+            where.append("clip_count >= ?")
+            params.append(min_clips)
+        if min_duration_s is not None:
+            where.append("duration_s >= ?")
+            params.append(min_duration_s)
+        if max_duration_s is not None:
+            where.append("duration_s <= ?")
+            params.append(max_duration_s)
+
+        sql = f"SELECT {', '.join(self.COLUMNS)} FROM projects"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {SORT_KEYS[sort]} {'DESC' if descending else 'ASC'}, filename"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [int(limit), int(offset)]
+        with self._lock:
+            return [CatalogEntry(*row) for row in self._db.execute(sql, params)]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM projects").fetchone()[0]
@@ -0,0 +1,127 @@
+# core/save_system/columnar.py
+"""
+Tables en colonnes du format .lmprj (format 2).
+
+    STRT  table de chaînes : "<I" nombre, "<I" x (nombre+1) décalages, UTF-8
+    CLPT  clips : "<II" (nombre, colonnes), "<I" x nombre indices de chemin
+          (dans STRT), bourrage à 8 octets, puis in_s, out_s, duration_s en
+          float64 little-endian contigus
+    IMGT  overlays d'images : même disposition, colonnes x, y, w, h, start,
+          end, opacity
+
+Le sérialiseur aligne le début des données de ces chunks sur 8 octets dans
+le fichier : chaque colonne se lit telle quelle avec
+numpy.frombuffer(buf, '<f8', count=n, offset=o) ou struct.iter_unpack("<d", …),
+sans copie via un memoryview (voir table_columns / table_layout).
+"""
+from __future__ import annotations
+import struct
+import sys
+from array import array
+from typing import Dict, List, Sequence, Tuple, Union
+
+from core.project import Clip, ImageOverlay
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+CLIP_COLUMNS = ("in_s", "out_s", "duration_s")
+IMAGE_COLUMNS = ("x", "y", "w", "h", "start", "end", "opacity")
+
+_LITTLE = sys.byteorder == "little"
+
+
+class StringTable:
+    """Chaînes internées (chemins) : une seule copie par valeur distincte."""
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self._index: Dict[str, int] = {}
+
+    def intern(self, s: str) -> int:
+        idx = self._index.get(s)
+        if idx is None:
+            idx = self._index[s] = len(self.strings)
+            self.strings.append(s)
+        return idx
+
+    def encode(self) -> bytes:
+        blobs = [s.encode("utf-8") for s in self.strings]
+        offsets = array("I", [0])
+        for b in blobs:
+            offsets.append(offsets[-1] + len(b))
+        return struct.pack("<I", len(blobs)) + _le(offsets) + b"".join(blobs)
+
+
+def decode_strings(buf: Buffer) -> List[str]:
+    mv = memoryview(buf)
+    (n,) = struct.unpack_from("<I", mv, 0)
+    offsets = _column(mv, 4, n + 1, "I")
+    base = 4 + 4 * (n + 1)
+    return [bytes(mv[base + offsets[k]:base + offsets[k + 1]]).decode("utf-8") for k in range(n)]
+
+
+# --- Tables ---
+
+def _le(arr: array) -> bytes:
+    if not _LITTLE:
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def _column(mv: memoryview, offset: int, count: int, typecode: str):
+    """Colonne en lecture : vue sans copie (little-endian), sinon copie inversée."""
+    size = array(typecode).itemsize * count
+    view = mv[offset:offset + size]
+    if _LITTLE:
+        return view.cast(typecode)
+    arr = array(typecode, bytes(view))
+    arr.byteswap()
+    return arr
+
+
+def encode_table(indices: Sequence[int], columns: Sequence[Sequence[float]]) -> bytes:
+    n = len(indices)
+    head = struct.pack("<II", n, len(columns)) + _le(array("I", indices))
+    head += b"\0" * (-len(head) % 8)
+    return head + b"".join(_le(array("d", col)) for col in columns)
+
+
+def table_layout(buf: Buffer) -> Tuple[int, int, List[int]]:
+    """(nombre de lignes, décalage des indices, décalages des colonnes float64)."""
+    n, ncols = struct.unpack_from("<II", buf, 0)
+    first = 8 + 4 * n
+    first += -first % 8
+    return n, 8, [first + 8 * n * k for k in range(ncols)]
+
+
+def table_columns(buf: Buffer):
+    """(indices de chaînes, [colonnes float64]) sans copie sur machine little-endian."""
+    mv = memoryview(buf)
+    n, idx_off, col_offs = table_layout(mv)
+    return _column(mv, idx_off, n, "I"), [_column(mv, off, n, "d") for off in col_offs]
+
+
+# --- Clips et overlays d'images ---
+
+def encode_clips(clips: Sequence[Clip], strings: StringTable) -> bytes:
+    return encode_table([strings.intern(c.path) for c in clips],
+                        [[float(c.in_s) for c in clips],
+                         [float(c.out_s) for c in clips],
+                         [float(c.duration_s) for c in clips]])
+
+
+def decode_clips(buf: Buffer, strings: Sequence[str]) -> List[Clip]:
+    idx, (in_s, out_s, dur) = table_columns(buf)
+    return [Clip(path=strings[i], in_s=a, out_s=b, duration_s=d)
+            for i, a, b, d in zip(idx, in_s, out_s, dur)]
+
+
+def encode_image_overlays(overlays: Sequence[ImageOverlay], strings: StringTable) -> bytes:
+    return encode_table([strings.intern(o.path) for o in overlays],
+                        [[float(getattr(o, name)) for o in overlays] for name in IMAGE_COLUMNS])
+
+
+def decode_image_overlays(buf: Buffer, strings: Sequence[str]) -> List[ImageOverlay]:
+    idx, cols = table_columns(buf)
+    return [ImageOverlay(strings[i], *values) for i, *values in zip(idx, *cols)]
@@ -0,0 +1,246 @@
+# core/save_system/journal.py
+"""
+Sauvegarde journalisée des .lmprj.
+
+Le fichier commence par un snapshot complet (les chunks habituels), suivi de
+chunks "DELT" ajoutés en fin de fichier : chacun contient les modifications
+depuis la sauvegarde précédente (clips insérés/supprimés/rognés, overlays
+modifiés, filtres, métadonnées). Une sauvegarde n'écrit donc que la taille
+de la modification. LMPRJChunkedSerializer.load rejoue les deltas sur le
+snapshot : après un crash, on retrouve l'état de la dernière sauvegarde (un
+delta interrompu en cours d'écriture est ignoré).
+
+Quand les deltas dépassent `compact_threshold` octets, un thread réécrit un
+snapshot à jour dans un fichier temporaire qui remplace l'original
+(os.replace) ; les deltas écrits pendant ce temps y sont recopiés.
+"""
+from __future__ import annotations
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+from core.project import Project, Clip, TextOverlay, ImageOverlay, Filters
+from core.save_system.serializers import LMPRJChunkedSerializer
+
+DELTA_CHUNK = "DELT"
+COMPACT_THRESHOLD = 256 * 1024
+
+# Listes journalisées élément par élément, et leur type
+LISTS = {"clips": Clip, "text_overlays": TextOverlay, "image_overlays": ImageOverlay}
+META_FIELDS = ("name", "resolution", "fps", "output", "audio_normalize")
+
+
+def journal_state(project: Project) -> Dict[str, Any]:
+    """État comparable (types JSON) de tout ce qui est sauvegardé."""
+    return {
+        "meta": {"name": project.name, "resolution": list(project.resolution),
+                 "fps": float(project.fps), "output": project.output,
+                 "audio_normalize": bool(project.audio_normalize)},
+        "filters": dict(vars(project.filters)),
+        "imported_assets": [dict(a) for a in project.imported_assets],
+        "clips": [{"path": c.path, "in_s": c.in_s, "out_s": c.out_s, "duration_s": c.duration_s}
+                  for c in project.clips],
+        "text_overlays": [dict(vars(ov)) for ov in project.text_overlays],
+        "image_overlays": [dict(vars(ov)) for ov in project.image_overlays],
+    }
+
+
+def state_stats(state: Dict[str, Any]) -> Dict[str, Any]:
+    """Statistiques d'en-tête (voir LMPRJChunkedSerializer.header_stats) depuis un état."""
+    proj = Project(name=state["meta"]["name"])
+    proj.clips = [Clip(**c) for c in state["clips"]]
+    stats = LMPRJChunkedSerializer.header_stats(proj)
+    stats["text_overlay_count"] = len(state["text_overlays"])
+    stats["image_overlay_count"] = len(state.get("image_overlays", ()))
+    return stats
+
+
+def project_from_state(state: Dict[str, Any]) -> Project:
+    proj = Project()
+    apply_delta(proj, [{"op": "set", "field": f, "value": v} for f, v in state["meta"].items()]
+                + [{"op": "set", "field": "filters", "value": state["filters"]},
+                   {"op": "set", "field": "imported_assets", "value": state["imported_assets"]}]
+                + [{"op": "splice", "list": name, "at": 0, "delete": 0, "insert": state[name]}
+                   for name in LISTS])
+    return proj
+
+
+def _diff_list(name: str, old: List[dict], new: List[dict]) -> List[Dict[str, Any]]:
+    """Un 'splice' couvrant la zone modifiée (préfixe et suffixe communs exclus)."""
+    n = min(len(old), len(new))
+    start = 0
+    while start < n and old[start] == new[start]:
+        start += 1
+    end = 0
+    while end < n - start and old[len(old) - 1 - end] == new[len(new) - 1 - end]:
+        end += 1
+    if start == len(old) - end and start == len(new) - end:
+        return []
+    return [{"op": "splice", "list": name, "at": start,
+             "delete": len(old) - end - start, "insert": new[start:len(new) - end]}]
+
+
+def diff_states(old: Dict[str, Any], new: Dict[str, Any]) -> List[Dict[str, Any]]:
+    ops: List[Dict[str, Any]] = []
+    for field in META_FIELDS:
+        if old["meta"].get(field) != new["meta"][field]:
+            ops.append({"op": "set", "field": field, "value": new["meta"][field]})
+    for field in ("filters", "imported_assets"):
+        if old[field] != new[field]:
+            ops.append({"op": "set", "field": field, "value": new[field]})
+    for name in LISTS:
+        ops += _diff_list(name, old[name], new[name])
+    return ops
+
+
+def apply_delta(proj: Project, ops: List[Dict[str, Any]]) -> None:
+    """Rejoue une liste d'opérations (un chunk DELT) sur le projet."""
+    if isinstance(ops, dict):
+        ops = ops.get("ops", [])
+    for op in ops:
+        if op["op"] == "splice":
+            items = getattr(proj, op["list"])
+            cls = LISTS[op["list"]]
+            at = max(0, min(int(op["at"]), len(items)))
+            items[at:at + int(op["delete"])] = [cls(**d) for d in op["insert"]]
+        elif op["op"] == "set":
+            field, value = op["field"], op["value"]
+            if field == "filters":
+                proj.filters = Filters(**value)
+            elif field == "resolution":
+                proj.resolution = tuple(value)
+            elif field in META_FIELDS or field == "imported_assets":
+                setattr(proj, field, value)
+        else:
+            print(f"Opération de journal inconnue ignorée : {op.get('op')}")
+
+
+class ProjectJournal:
+    """
+    Sauvegardes successives d'un projet dans un même fichier : snapshot à la
+    première sauvegarde, puis deltas ajoutés (voir le module).
+    """
+
+    def __init__(self, filename: str, compact_threshold: int = COMPACT_THRESHOLD):
+        self.filename = filename
+        self.path = LMPRJChunkedSerializer.path_for(filename)
+        self.compact_threshold = compact_threshold
+        self._state: Optional[Dict[str, Any]] = None
+        self._journal_bytes = 0
+        self._seq = 0
+        self._lock = threading.Lock()
+        # deltas écrits pendant une compaction (None hors compaction)
+        self._pending: Optional[List[bytes]] = None
+        self._compactor: Optional[threading.Thread] = None
+
+    def save(self, project: Project) -> int:
+        """Sauvegarde le projet ; retourne le nombre d'octets écrits (0 si inchangé)."""
+        state = journal_state(project)
+        if self._state is None:
+            return self._write_base(state)
+
+        ops = diff_states(self._state, state)
+        if not ops:
+            return 0
+        self._seq += 1
+        data = json.dumps({"seq": self._seq, "ops": ops}).encode("utf-8")
+        with self._lock:
+            try:
+                self._append(self.path, [data])
+            except OSError:
+                # fichier peut-être incohérent : la prochaine sauvegarde réécrit un snapshot
+                self._state = None
+                raise
+            # le delta est sur disque : l'état suit tout de suite, sinon le
+            # prochain diff rejouerait ces modifications une seconde fois
+            if self._pending is not None:
+                self._pending.append(data)
+            self._journal_bytes += len(data) + 8
+            self._state = state
+            try:
+                # l'en-tête (nombre de clips, durée…) suit les deltas
+                LMPRJChunkedSerializer.update_header(self.path, LMPRJChunkedSerializer.header_stats(project))
+            except Exception:
+                # en-tête périmé : la prochaine sauvegarde réécrit un snapshot complet
+                self._state = None
+                raise
+            compact = self._journal_bytes > self.compact_threshold and self._pending is None
+            if compact:
+                self._pending = []
+        if compact:
+            self._compactor = threading.Thread(target=self._compact, args=(state,),
+                                               name="lmprj-compaction", daemon=True)
+            self._compactor.start()
+        return len(data) + 8
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """Attend la fin d'une compaction en cours."""
+        if self._compactor is not None:
+            self._compactor.join(timeout)
+
+    # --- Écriture ---
+
+    def _write_base(self, state: Dict[str, Any]) -> int:
+        self.wait()
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "wb") as f:
+            LMPRJChunkedSerializer.write_snapshot(f, project_from_state(state))
+            f.flush()
+            os.fsync(f.fileno())
+            size = f.tell()
+        os.replace(tmp, self.path)
+        self._state = state
+        self._journal_bytes = 0
+        return size
+
+    @staticmethod
+    def _append(path: str, payloads: List[bytes]) -> None:
+        """
+        Ajoute les deltas en fin de fichier. En cas d'échec (disque plein…),
+        le fichier est ramené à sa taille d'avant : un chunk DELT partiel
+        fausserait la lecture de tous les deltas ajoutés ensuite.
+        """
+        with open(path, "ab") as f:
+            size = f.tell()
+            try:
+                for data in payloads:
+                    LMPRJChunkedSerializer.write_chunk(f, DELTA_CHUNK, data)
+                f.flush()
+                os.fsync(f.fileno())
+            except OSError:
+                try:
+                    f.truncate(size)
+                except OSError:
+                    pass
+                raise
+
+    def _compact(self, state: Dict[str, Any]) -> None:
+        """
+        Réécrit un snapshot de `state` (l'état juste après le delta qui a
+        déclenché la compaction), y recopie les deltas arrivés entre-temps,
+        puis remplace le fichier.
+        """
+        tmp = f"{self.path}.compact.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                LMPRJChunkedSerializer.write_snapshot(f, project_from_state(state))
+                f.flush()
+                os.fsync(f.fileno())
+            with self._lock:
+                pending = self._pending or []
+                if pending:
+                    self._append(tmp, pending)
+                    LMPRJChunkedSerializer.update_header(tmp, state_stats(self._state))
+                os.replace(tmp, self.path)
+                self._journal_bytes = sum(len(d) + 8 for d in pending)
+                self._pending = None
+            print(f"Journal compacté : {self.path}")
+        except OSError as e:
+            print(f"Compaction du journal échouée ({self.path}) : {e}")
+            with self._lock:
+                self._pending = None
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
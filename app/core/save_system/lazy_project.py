@@ -0,0 +1,317 @@
+# core/save_system/lazy_project.py
+"""
+Lecture d'un .lmprj par projection mémoire (mmap), sans copie.
+
+À l'ouverture, seuls les en-têtes de chunks sont parcourus (memoryview et
+struct.unpack_from) ; la table des chunks de l'en-tête HEAD évite même ce
+parcours pour le snapshot, seuls les deltas (après journal_offset) sont
+alors parcourus. Chaque chunk n'est décodé qu'à la demande, par les
+accesseurs (clips, text_overlays, image_overlays…), puis gardé en cache :
+ouvrir un gros projet ne coûte que les pages réellement lues.
+
+Les colonnes des tables (clip_columns, format 2) sont des vues directes sur
+le fichier, valides jusqu'à close().
+"""
+from __future__ import annotations
+import json
+import mmap
+import os
+import struct
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.project import Project, Clip, TextOverlay, ImageOverlay, Filters
+from core.save_system import columnar
+from core.save_system.serializers import LMPRJChunkedSerializer
+
+_CHUNK_HEADER = struct.Struct("4sI")
+
+
+class LazyProject:
+    """
+    Projet .lmprj ouvert en lecture seule, décodé à la demande.
+
+        with LazyProject(path) as lazy:
+            n = lazy.clip_count          # sans décoder les clips
+            first = lazy.clip(0)
+            project = lazy.to_project()  # projet complet (deltas rejoués)
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        # un fichier vide ne peut pas être projeté
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        self._buf = memoryview(self._mm) if self._mm is not None else memoryview(b"")
+        self._views: List[memoryview] = [self._buf]
+        self._cache: Dict[str, Any] = {}
+        self.header: Optional[Dict[str, Any]] = None
+        # id -> [(début des données, longueur)], dans l'ordre du fichier
+        self._chunks: Dict[str, List[Tuple[int, int]]] = {}
+        self._index()
+
+    def __enter__(self) -> "LazyProject":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Libère la projection ; les vues rendues par clip_columns deviennent invalides."""
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._cache.clear()
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._file.close()
+
+    # --- Index des chunks ---
+
+    def _index(self) -> None:
+        header_id = LMPRJChunkedSerializer.HEADER_CHUNK
+        pos = 0
+        first = self._walk(0, 1)
+        if first and first[0][0] == header_id:
+            start, length = first[0][1]
+            try:
+                self.header = json.loads(bytes(self._buf[start:start + length]).decode("utf-8"))
+            except ValueError:
+                self.header = None
+            pos = start + length
+            table = (self.header or {}).get("chunks")
+            if table and self._index_from_table(table):
+                pos = int(self.header.get("journal_offset") or table[-1][2])
+            else:
+                self._chunks.clear()
+        for chunk_id, span in self._walk(pos):
+            self._chunks.setdefault(chunk_id, []).append(span)
+
+    def _index_from_table(self, table: List[list]) -> bool:
+        """Index du snapshot depuis la table de HEAD ; False si elle ne correspond pas au fichier."""
+        for chunk_id, start, end, count in table:
+            if end > len(self._buf) or bytes(self._buf[start:start + 4]) != chunk_id.encode("ascii"):
+                return False
+            if count == 1:
+                (length,) = struct.unpack_from("I", self._buf, start + 4)
+                self._chunks.setdefault(chunk_id, []).append((start + 8, length))
+            else:
+                for _, span in self._walk(start, count):
+                    self._chunks.setdefault(chunk_id, []).append(span)
+        return True
+
+    def _walk(self, pos: int, limit: Optional[int] = None) -> List[Tuple[str, Tuple[int, int]]]:
+        """En-têtes de chunks à partir de `pos` (un chunk tronqué en fin de fichier arrête le parcours)."""
+        found = []
+        size = len(self._buf)
+        while pos + 8 <= size and (limit is None or len(found) < limit):
+            raw_id, length = _CHUNK_HEADER.unpack_from(self._buf, pos)
+            try:
+                chunk_id = raw_id.decode("ascii")
+            except UnicodeDecodeError:
+                print(f"Identifiant de chunk illisible à l'octet {pos}, lecture arrêtée")
+                break
+            if pos + 8 + length > size:
+                print(f"Chunk {chunk_id} tronqué en fin de fichier ignoré ({size - pos - 8}/{length} octets)")
+                break
+            found.append((chunk_id, (pos + 8, length)))
+            pos += 8 + length
+        return found
+
+    def chunk_ids(self) -> List[str]:
+        return list(self._chunks)
+
+    def chunk(self, chunk_id: str, index: int = 0) -> Optional[memoryview]:
+        """Données brutes d'un chunk (vue sans copie, valide jusqu'à close()), None s'il est absent."""
+        view = self._data(chunk_id, index)
+        if view is not None:
+            self._views.append(view)
+        return view
+
+    def _data(self, chunk_id: str, index: int = 0) -> Optional[memoryview]:
+        # vue interne : temporaire, libérée dès qu'elle n'est plus référencée
+        spans = self._chunks.get(chunk_id)
+        if not spans or index >= len(spans):
+            return None
+        start, length = spans[index]
+        return self._buf[start:start + length]
+
+    def _chunk_data(self, chunk_id: str) -> List[memoryview]:
+        return [self._buf[start:start + length] for start, length in self._chunks.get(chunk_id, ())]
+
+    def _cached(self, key: str, decode):
+        if key not in self._cache:
+            try:
+                self._cache[key] = decode()
+            except Exception as e:
+                print(f"Erreur de décodage du chunk {key} : {e}")
+                self._cache[key] = None
+        return self._cache[key]
+
+    def _json(self, chunk_id: str):
+        data = self._data(chunk_id)
+        return None if data is None else json.loads(bytes(data).decode("utf-8"))
+
+    # --- Journal ---
+
+    @property
+    def has_journal(self) -> bool:
+        """Le fichier contient des deltas : les listes ne se lisent plus directement dans le snapshot."""
+        return "DELT" in self._chunks
+
+    def _journaled(self) -> Project:
+        return self._cached("project", self._build_project)
+
+    # --- Métadonnées ---
+
+    @property
+    def name(self) -> str:
+        if self.has_journal:
+            return self._journaled().name
+        meta = self._cached("PROJ", lambda: self._json("PROJ")) or {}
+        return meta.get("name", Project().name)
+
+    @property
+    def resolution(self) -> Tuple[int, int]:
+        if self.has_journal:
+            return self._journaled().resolution
+        data = self._data("RESO")
+        return struct.unpack("II", data) if data is not None else Project().resolution
+
+    @property
+    def fps(self) -> float:
+        if self.has_journal:
+            return self._journaled().fps
+        data = self._data("FPS ")
+        return struct.unpack("f", data)[0] if data is not None else Project().fps
+
+    @property
+    def output(self) -> str:
+        if self.has_journal:
+            return self._journaled().output
+        data = self._data("OUTP")
+        return bytes(data).decode("utf-8") if data is not None else Project().output
+
+    @property
+    def audio_normalize(self) -> bool:
+        if self.has_journal:
+            return self._journaled().audio_normalize
+        data = self._data("AUDN")
+        return struct.unpack("?", data)[0] if data is not None else Project().audio_normalize
+
+    @property
+    def filters(self) -> Filters:
+        if self.has_journal:
+            return self._journaled().filters
+        filt = self._cached("FILT", lambda: self._json("FILT"))
+        return Filters(**filt) if filt is not None else Filters()
+
+    @property
+    def imported_assets(self) -> List[dict]:
+        if self.has_journal:
+            return self._journaled().imported_assets
+        return self._cached("IMPT", lambda: self._json("IMPT")) or []
+
+    # --- Clips et overlays ---
+
+    @property
+    def strings(self) -> List[str]:
+        return self._cached("STRT", lambda: columnar.decode_strings(self._data("STRT"))
+                            if "STRT" in self._chunks else []) or []
+
+    @property
+    def clip_count(self) -> int:
+        """Nombre de clips, sans décoder les clips (table CLPT ou nombre de chunks CLIP)."""
+        if self.has_journal:
+            return len(self._journaled().clips)
+        count = len(self._chunks.get("CLIP", ()))
+        for table in self._chunk_data("CLPT"):
+            count += columnar.table_layout(table)[0]
+        return count
+
+    def clip_columns(self):
+        """
+        (indices dans strings, in_s, out_s, duration_s) : vues sans copie sur
+        la table CLPT (little-endian), ou None (ancien format ou journal).
+        """
+        if self.has_journal or "CLIP" in self._chunks or len(self._chunks.get("CLPT", ())) != 1:
+            return None
+        return self._cached("columns", self._map_clip_columns)
+
+    def _map_clip_columns(self):
+        idx, cols = columnar.table_columns(self._data("CLPT"))
+        self._views.extend(v for v in (idx, *cols) if isinstance(v, memoryview))
+        return (idx, *cols)
+
+    def clip(self, i: int) -> Clip:
+        """Un seul clip, lu directement dans les colonnes quand c'est possible."""
+        columns = self.clip_columns()
+        if columns is None:
+            return self.clips[i]
+        idx, in_s, out_s, dur = columns
+        return Clip(path=self.strings[idx[i]], in_s=in_s[i], out_s=out_s[i], duration_s=dur[i])
+
+    @property
+    def clips(self) -> List[Clip]:
+        if self.has_journal:
+            return self._journaled().clips
+        return self._cached("clips", self._decode_clips)
+
+    def _decode_clips(self) -> List[Clip]:
+        clips = []
+        for data in self._chunk_data("CLPT"):
+            clips.extend(columnar.decode_clips(data, self.strings))
+        for data in self._chunk_data("CLIP"):
+            clips.append(Clip(**json.loads(bytes(data).decode("utf-8"))))
+        return clips
+
+    @property
+    def text_overlays(self) -> List[TextOverlay]:
+        if self.has_journal:
+            return self._journaled().text_overlays
+        return self._cached("OVER", lambda: [TextOverlay(**json.loads(bytes(d).decode("utf-8")))
+                                             for d in self._chunk_data("OVER")])
+
+    @property
+    def image_overlays(self) -> List[ImageOverlay]:
+        if self.has_journal:
+            return self._journaled().image_overlays
+        return self._cached("IMGT", lambda: [ov for d in self._chunk_data("IMGT")
+                                             for ov in columnar.decode_image_overlays(d, self.strings)])
+
+    # --- Projet complet ---
+
+    def to_project(self) -> Project:
+        """Projet complet (nouvel objet), deltas du journal rejoués."""
+        if self.has_journal:
+            return self._build_project()
+        return self._snapshot()
+
+    def _snapshot(self) -> Project:
+        proj = Project()
+        proj.name = self.name
+        proj.resolution = self.resolution
+        proj.fps = self.fps
+        proj.output = self.output
+        proj.audio_normalize = self.audio_normalize
+        proj.filters = self.filters
+        proj.imported_assets = list(self.imported_assets)
+        proj.clips = list(self.clips or [])
+        proj.text_overlays = list(self.text_overlays or [])
+        proj.image_overlays = list(self.image_overlays or [])
+        return proj
+
+    def _build_project(self) -> Project:
+        from core.save_system.journal import apply_delta
+        journal = self._chunks.pop("DELT")
+        try:
+            proj = self._snapshot()
+        finally:
+            self._chunks["DELT"] = journal
+        for start, length in journal:
+            try:
+                apply_delta(proj, json.loads(bytes(self._buf[start:start + length]).decode("utf-8")))
+            except Exception as e:
+                print(f"Erreur de décodage du chunk DELT : {e}")
+        return proj
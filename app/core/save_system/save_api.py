@@ -1,21 +1,49 @@
-from typing import Callable
+from typing import Callable, Optional
 import os
+import sqlite3
 from custom_types.ImportTypes import ImportTypes
 from core.save_system.serializers import LMPRJChunkedSerializer
+from core.save_system.catalog import ProjectCatalog, CatalogEntry
 from core import project as Project
 
 class ProjectAPI:
+    _catalog: Optional[ProjectCatalog] = None
+
+    @staticmethod
+    def catalog() -> ProjectCatalog:
+        """Catalogue SQLite du dossier de sauvegarde (ouvert une fois)."""
+        if ProjectAPI._catalog is None:
+            ProjectAPI._catalog = ProjectCatalog()
+        return ProjectAPI._catalog
+
+    @staticmethod
+    def list_project_entries(**query) -> list[CatalogEntry]:
+        """
+        Projets avec leurs métadonnées, via le catalogue rafraîchi (seuls les
+        fichiers modifiés sont relus). `query` : voir ProjectCatalog.query.
+        """
+        catalog = ProjectAPI.catalog()
+        catalog.refresh()
+        return catalog.query(**query)
+
     @staticmethod
     def list_projects() -> list[str]:
-        return LMPRJChunkedSerializer.list_projects() if hasattr(LMPRJChunkedSerializer, "list_projects") else [
-            f.name for f in os.scandir(LMPRJChunkedSerializer.get_save_dir())
-            if f.is_file() and f.name.endswith(".lmprj")
-        ]
+        """Noms de fichiers .lmprj, les plus récemment modifiés d'abord."""
+        try:
+            return [e.filename for e in ProjectAPI.list_project_entries()]
+        except (sqlite3.Error, OSError) as e:
+            print(f"Catalogue indisponible, parcours du dossier : {e}")
+            return LMPRJChunkedSerializer.list_projects()
 
     @staticmethod
     def load(filename: str) -> Project:
         return LMPRJChunkedSerializer.load(filename)
 
+    @staticmethod
+    def open_lazy(filename: str):
+        """Projet décodé à la demande (voir LMPRJChunkedSerializer.open_lazy)."""
+        return LMPRJChunkedSerializer.open_lazy(filename)
+
     @staticmethod
     def save(project: Project, filename: str) -> str:
         return LMPRJChunkedSerializer.save(project, filename)
@@ -43,9 +71,14 @@ class ProjectAPI:
     def get_clip_count(filename: str) -> int:
         """
         Retourne le nombre de clips dans un projet spécifique (.lmprj).
+        Lu dans l'en-tête du fichier, sans charger le projet.
         """
-        proj = LMPRJChunkedSerializer.load(filename)
-        return len(proj.clips)
+        return LMPRJChunkedSerializer.get_project_clip_count(filename)
+
+    @staticmethod
+    def read_header(filename: str) -> dict:
+        """Résumé d'un projet (voir LMPRJChunkedSerializer.read_header)."""
+        return LMPRJChunkedSerializer.read_header(filename)
     
     @staticmethod
     def add_import(filename: str, import_path: str, asset_name: str, type: ImportTypes) -> str:
@@ -2,14 +2,27 @@
 import os
 import json
 import struct
+import time
 import platform
-from typing import List
-from core.project import Project, Clip, TextOverlay, Filters
+from typing import Any, Dict, List
+from core.project import Project
+from core.save_system import columnar
 
 class LMPRJChunkedSerializer:
     EXTENSION = ".lmprj"
     APP_NAME = "Luminare"
-    VERSION = "0.0.1"
+    # 0.0.2 : clips et overlays d'images en tables (STRT/CLPT/IMGT, voir columnar)
+    VERSION = "0.0.2"
+    LEGACY_VERSION = "0.0.1"
+
+    # En-tête "HEAD" de taille fixe en tête de fichier : résumé du projet et
+    # table des chunks, lisible sans parcourir le reste (voir read_header)
+    HEADER_CHUNK = "HEAD"
+    HEADER_SIZE = 2048
+    HEADER_FORMAT = 2
+    # Place du nom dans l'en-tête, en octets une fois encodé en JSON (les
+    # caractères non ASCII y sont échappés : jusqu'à 12 octets par caractère)
+    HEADER_NAME_BYTES = 512
 
     @staticmethod
     def get_save_dir() -> str:
@@ -29,88 +42,176 @@ class LMPRJChunkedSerializer:
         f.write(data)
 
     @staticmethod
-    def save(project: Project, filename: str) -> str:
+    def path_for(filename: str) -> str:
+        """Chemin complet d'un projet dans le dossier de sauvegarde (extension ajoutée)."""
         if not filename.endswith(LMPRJChunkedSerializer.EXTENSION):
             filename += LMPRJChunkedSerializer.EXTENSION
-        filepath = os.path.join(LMPRJChunkedSerializer.get_save_dir(), filename)
+        return os.path.join(LMPRJChunkedSerializer.get_save_dir(), filename)
+
+    @staticmethod
+    def save(project: Project, filename: str) -> str:
+        """
+        Écrit le projet dans un fichier temporaire qui remplace l'original
+        (os.replace) : un échec en cours d'écriture laisse l'ancien intact.
+        """
+        filepath = LMPRJChunkedSerializer.path_for(filename)
+        tmp = f"{filepath}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                LMPRJChunkedSerializer.write_snapshot(f, project)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, filepath)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+        return filepath
+
+    @staticmethod
+    def header_stats(project: Project) -> Dict[str, Any]:
+        """Résumé du projet stocké dans l'en-tête."""
+        return {
+            "name": LMPRJChunkedSerializer._header_name(project.name),
+            "clip_count": len(project.clips),
+            "total_duration_s": project.total_duration_s(),
+            "text_overlay_count": len(project.text_overlays),
+            "image_overlay_count": len(project.image_overlays),
+            "modified": time.time(),
+        }
+
+    @staticmethod
+    def _header_name(name: str) -> str:
+        """Nom raccourci pour tenir dans HEADER_NAME_BYTES une fois encodé dans l'en-tête."""
+        name = name[:LMPRJChunkedSerializer.HEADER_NAME_BYTES]
+        while len(json.dumps(name)) > LMPRJChunkedSerializer.HEADER_NAME_BYTES:
+            name = name[:-1]
+        return name
+
+    @staticmethod
+    def write_header(f, header: Dict[str, Any]):
+        """Écrit (ou réécrit en place) le chunk HEAD à la position courante de `f`."""
+        data = json.dumps(header).encode("utf-8")
+        if len(data) > LMPRJChunkedSerializer.HEADER_SIZE:
+            raise ValueError(f"En-tête trop grand ({len(data)} octets)")
+        LMPRJChunkedSerializer.write_chunk(f, LMPRJChunkedSerializer.HEADER_CHUNK,
+                                           data.ljust(LMPRJChunkedSerializer.HEADER_SIZE))
+
+    @staticmethod
+    def update_header(path: str, stats: Dict[str, Any]):
+        """
+        Met à jour les statistiques de l'en-tête d'un fichier existant (après
+        l'ajout de deltas au journal) ; la table des chunks est conservée.
+        """
+        with open(path, "r+b") as f:
+            header = LMPRJChunkedSerializer._read_header_chunk(f)
+            if header is None:
+                return
+            header.update(stats)
+            f.seek(0)
+            LMPRJChunkedSerializer.write_header(f, header)
+
+    @staticmethod
+    def write_padding(f, write_chunk=None, align: int = 8):
+        """Chunk "PAD " pour que les données du chunk suivant soient alignées."""
+        pad = -(f.tell() + 16) % align
+        (write_chunk or LMPRJChunkedSerializer.write_chunk)(f, "PAD ", b"\0" * pad)
+
+    @staticmethod
+    def write_snapshot(f, project: Project, columnar_tables: bool = True):
+        """
+        Écrit l'état complet du projet (chunks) dans le fichier ouvert `f`,
+        précédé de l'en-tête HEAD (réécrit à la fin avec la table des chunks).
+        `columnar_tables=False` écrit l'ancien format (un chunk JSON par clip).
+        """
+        start = f.tell()
+        header = {"format": LMPRJChunkedSerializer.HEADER_FORMAT if columnar_tables else 1,
+                  "version": (LMPRJChunkedSerializer.VERSION if columnar_tables
+                              else LMPRJChunkedSerializer.LEGACY_VERSION)}
+        header.update(LMPRJChunkedSerializer.header_stats(project))
+        LMPRJChunkedSerializer.write_header(f, dict(header, chunks=[]))
+
+        # Table des chunks : [id, début, fin, nombre] par suite de chunks de même id
+        chunks: List[list] = []
+        write = LMPRJChunkedSerializer.write_chunk
+
+        def write_chunk(_f, chunk_id: str, data: bytes):
+            offset = _f.tell()
+            write(_f, chunk_id, data)
+            if chunks and chunks[-1][0] == chunk_id and chunks[-1][2] == offset:
+                chunks[-1][2] = _f.tell()
+                chunks[-1][3] += 1
+            else:
+                chunks.append([chunk_id, offset, _f.tell(), 1])
 
-        with open(filepath, "wb") as f:
-            proj_meta = {"version": LMPRJChunkedSerializer.VERSION, "name": project.name}
-            LMPRJChunkedSerializer.write_chunk(f, "PROJ", json.dumps(proj_meta).encode("utf-8"))
-
-            # Resolution
-            LMPRJChunkedSerializer.write_chunk(f, "RESO", struct.pack("II", *project.resolution))
-            # FPS
-            LMPRJChunkedSerializer.write_chunk(f, "FPS ", struct.pack("f", project.fps))
-            # Output
-            LMPRJChunkedSerializer.write_chunk(f, "OUTP", project.output.encode("utf-8"))
-            # Audio normalize
-            LMPRJChunkedSerializer.write_chunk(f, "AUDN", struct.pack("?", project.audio_normalize))
-            # Filters
-            LMPRJChunkedSerializer.write_chunk(f, "FILT", json.dumps(vars(project.filters)).encode("utf-8"))
-
-            if project.imported_assets:
-                imported_data = json.dumps(project.imported_assets).encode("utf-8")
-                LMPRJChunkedSerializer.write_chunk(f, "IMPT", imported_data)
+        LMPRJChunkedSerializer._write_chunks(f, project, write_chunk, columnar_tables, header["version"])
 
+        end = f.tell()
+        header["chunks"] = chunks
+        header["journal_offset"] = end
+        f.seek(start)
+        LMPRJChunkedSerializer.write_header(f, header)
+        f.seek(end)
+
+    @staticmethod
+    def _write_chunks(f, project: Project, write_chunk, columnar_tables: bool = True,
+                      version: str = VERSION):
+        proj_meta = {"version": version, "name": project.name}
+        write_chunk(f, "PROJ", json.dumps(proj_meta).encode("utf-8"))
+
+        # Resolution
+        write_chunk(f, "RESO", struct.pack("II", *project.resolution))
+        # FPS
+        write_chunk(f, "FPS ", struct.pack("f", project.fps))
+        # Output
+        write_chunk(f, "OUTP", project.output.encode("utf-8"))
+        # Audio normalize
+        write_chunk(f, "AUDN", struct.pack("?", project.audio_normalize))
+        # Filters
+        write_chunk(f, "FILT", json.dumps(vars(project.filters)).encode("utf-8"))
+
+        if project.imported_assets:
+            imported_data = json.dumps(project.imported_assets).encode("utf-8")
+            write_chunk(f, "IMPT", imported_data)
+
+        if columnar_tables:
+            # Clips et overlays d'images : chemins internés, colonnes float64 alignées
+            strings = columnar.StringTable()
+            clip_table = columnar.encode_clips(project.clips, strings)
+            image_table = columnar.encode_image_overlays(project.image_overlays, strings)
+            write_chunk(f, "STRT", strings.encode())
+            LMPRJChunkedSerializer.write_padding(f, write_chunk)
+            write_chunk(f, "CLPT", clip_table)
+            if project.image_overlays:
+                LMPRJChunkedSerializer.write_padding(f, write_chunk)
+                write_chunk(f, "IMGT", image_table)
+        else:
             # Clips
             for clip in project.clips:
-                LMPRJChunkedSerializer.write_chunk(f, "CLIP", json.dumps({"path": clip.path, "in_s": clip.in_s, "out_s": clip.out_s, "duration_s": clip.duration_s}).encode("utf-8"))
-            # Text overlays
-            for ov in project.text_overlays:
-                LMPRJChunkedSerializer.write_chunk(f, "OVER", json.dumps(vars(ov)).encode("utf-8"))
-
-        return filepath
+                write_chunk(f, "CLIP", json.dumps({"path": clip.path, "in_s": clip.in_s, "out_s": clip.out_s, "duration_s": clip.duration_s}).encode("utf-8"))
+        # Text overlays
+        for ov in project.text_overlays:
+            write_chunk(f, "OVER", json.dumps(vars(ov)).encode("utf-8"))
 
     @staticmethod
     def load(filename: str) -> Project:
+        """Projet complet ; le fichier est projeté en mémoire (voir lazy_project)."""
+        with LMPRJChunkedSerializer.open_lazy(filename) as lazy:
+            return lazy.to_project()
+
+    @staticmethod
+    def open_lazy(filename: str):
+        """
+        Ouvre un projet sans le décoder (LazyProject, à fermer) : les chunks
+        ne sont lus qu'à l'accès (clips, overlays…).
+        """
         filepath = os.path.join(LMPRJChunkedSerializer.get_save_dir(), filename)
         if not os.path.exists(filepath):
             raise FileNotFoundError(f"{filepath} n'existe pas")
-
-        proj = Project()
-        with open(filepath, "rb") as f:
-            while True:
-                header = f.read(8)
-                if not header:
-                    break
-                try:
-                    chunk_id, length = struct.unpack("4sI", header)
-                    chunk_id = chunk_id.decode("ascii")
-                    data = f.read(length)
-                except Exception as e:
-                    print(f"Erreur de lecture d’un chunk : {e}")
-                    continue
-
-                try:
-                    if chunk_id == "PROJ":
-                        meta = json.loads(data.decode("utf-8"))
-                        proj.name = meta.get("name", proj.name)
-                    elif chunk_id == "RESO":
-                        proj.resolution = struct.unpack("II", data)
-                    elif chunk_id == "FPS ":
-                        proj.fps = struct.unpack("f", data)[0]
-                    elif chunk_id == "OUTP":
-                        proj.output = data.decode("utf-8")
-                    elif chunk_id == "AUDN":
-                        proj.audio_normalize = struct.unpack("?", data)[0]
-                    elif chunk_id == "FILT":
-                        filt = json.loads(data.decode("utf-8"))
-                        proj.filters = Filters(**filt)
-                    elif chunk_id == "IMPT":
-                        proj.imported_assets = json.loads(data.decode("utf-8"))
-                    elif chunk_id == "CLIP":
-                        clip_data = json.loads(data.decode("utf-8"))
-                        proj.clips.append(Clip(**clip_data))
-                    elif chunk_id == "OVER":
-                        ov_data = json.loads(data.decode("utf-8"))
-                        proj.text_overlays.append(TextOverlay(**ov_data))
-                    else:
-                        continue
-                except Exception as e:
-                    print(f"Erreur de décodage du chunk {chunk_id} : {e}")
-
-        return proj
+        from core.save_system.lazy_project import LazyProject
+        return LazyProject(filepath)
 
     # --- Utils ---
     @staticmethod
@@ -121,9 +222,45 @@ class LMPRJChunkedSerializer:
         return [f for f in os.listdir(save_dir) if f.endswith(LMPRJChunkedSerializer.EXTENSION)]
 
     @staticmethod
-    def get_project_clip_count(filename: str) -> int:
+    def _read_header_chunk(f):
+        """Chunk HEAD en début de fichier, décodé ; None si absent (ancien format)."""
+        head = f.read(8)
+        if len(head) < 8:
+            return None
+        chunk_id, length = struct.unpack("4sI", head)
+        if chunk_id != LMPRJChunkedSerializer.HEADER_CHUNK.encode("ascii"):
+            return None
+        data = f.read(length)
+        if len(data) < length:
+            return None
+        try:
+            return json.loads(data.decode("utf-8"))
+        except ValueError:
+            return None
+
+    @staticmethod
+    def read_header(filename: str) -> Dict[str, Any]:
+        """
+        Résumé d'un projet sans le charger : nom, nombre de clips, durée
+        totale, nombre d'overlays, date de modification et table des chunks
+        ([id, début, fin, nombre]). Seuls les octets de l'en-tête sont lus ;
+        les fichiers sans en-tête (anciens) sont chargés entièrement, leur
+        résumé est alors calculé ("chunks" vaut None).
+        """
+        filepath = os.path.join(LMPRJChunkedSerializer.get_save_dir(), filename)
+        with open(filepath, "rb") as f:
+            header = LMPRJChunkedSerializer._read_header_chunk(f)
+        if header is not None:
+            return header
+
         proj = LMPRJChunkedSerializer.load(filename)
-        return len(proj.clips)
+        header = LMPRJChunkedSerializer.header_stats(proj)
+        header.update(format=0, modified=os.path.getmtime(filepath), chunks=None)
+        return header
+
+    @staticmethod
+    def get_project_clip_count(filename: str) -> int:
+        return LMPRJChunkedSerializer.read_header(filename)["clip_count"]
 
     @staticmethod
     def get_save_count() -> int:
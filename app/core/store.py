@@ -27,6 +27,7 @@ class Store(QObject):
         
         self._project = Project(name="Nouveau projet")
         self._current_project_filename: Optional[str] = None
+        self._journal = None  # sauvegarde automatique journalisée (voir _auto_save)
         
         Store._is_initialized = True
 
@@ -375,14 +376,18 @@ class Store(QObject):
         self._auto_save_timer.start(interval_ms)
 
     def _auto_save(self):
-        from core.save_system.save_api import ProjectAPI
+        from core.save_system.journal import ProjectJournal
         try:
             # Utilisation du nom du projet en cours pour la sauvegarde automatique
             safe_name = "".join(c for c in self._project.name.strip() if c.isalnum() or c in (' ', '.', '_'))
             filename_to_save = f"{safe_name}.lmprj.autosave" 
 
-            ProjectAPI.save(self._project, filename_to_save)
-            print(f"Auto-save effectué dans : {filename_to_save}")
+            # Journal : snapshot au premier passage, puis seulement les modifications
+            if self._journal is None or self._journal.filename != filename_to_save:
+                self._journal = ProjectJournal(filename_to_save)
+            written = self._journal.save(self._project)
+            if written:
+                print(f"Auto-save effectué dans : {filename_to_save} ({written} octets)")
         except Exception as e:
             print("Auto-save échoué :", e)
 
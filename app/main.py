@@ -11,8 +11,8 @@ os.environ["QT_MEDIA_BACKEND"] = "ffmpeg"
 # os.environ["QT_MEDIA_BACKEND"] = "windows"
 from pathlib import Path
 from ui import styles
+from core.runtime_env import bootstrap_ffmpeg_on_path, app_cache_dir
 
-import platform
 import sys
 
 # --- Configuration initiale du chemin ---
@@ -27,29 +27,9 @@ def set_cwd_to_repo_root():
         os.chdir(root)
     return root
 
-def bootstrap_ffmpeg_on_path(root: Path):
-    """Ajoute un FFmpeg portable au PATH si disponible sous vendor/ffmpeg."""
-    system = platform.system().lower()
-    candidates = []
-    if system.startswith("win"):
-        candidates += [
-            root / "vendor" / "ffmpeg" / "windows" / "bin",
-            root / "vendor" / "ffmpeg" / "win64" / "bin",
-        ]
-    elif system == "darwin":
-        candidates += [root / "vendor" / "ffmpeg" / "macos" / "bin"]
-    else:
-        candidates += [root / "vendor" / "ffmpeg" / "linux" / "bin"]
-
-    for p in candidates:
-        if p.exists():
-            os.environ["PATH"] = str(p) + os.pathsep + os.environ.get("PATH", "")
-            print(f"FFmpeg bootstrapped from: {p}")
-            break
-
 def ensure_cache_dirs(root: Path):
     """Crée les répertoires de cache si absents."""
-    for d in [root / "cache", root / "cache" / "wave"]:
+    for d in [app_cache_dir(), app_cache_dir("wave")]:
         d.mkdir(parents=True, exist_ok=True)
 
 def quiet_qt_multimedia_logs():
@@ -75,7 +55,8 @@ def main():
     
     # Imports pour l'injection de dépendance
     from core.export.export_service import ExportService
-    from core.export.ffmpeg_engine import FfmpegRenderEngine
+    from core.export.smart_render_engine import SmartRenderEngine
+    from core.export.render_cache import SegmentRenderCache
 
     # --- 3. Démarrage de l'application Qt ---
     app = QApplication(sys.argv)
@@ -86,8 +67,10 @@ def main():
     store_instance = Store()
     store_instance.start_auto_save() 
     
-    # Le Moteur de Rendu (Implémentation concrète)
-    render_engine = FfmpegRenderEngine()
+    # Le Moteur de Rendu (Implémentation concrète : copie des plages intactes,
+    # ré-encodage segmenté sur tous les cœurs pour le reste ; les segments déjà
+    # rendus sont repris du cache lors des exports suivants)
+    render_engine = SmartRenderEngine(cache=SegmentRenderCache())
     
     # Le Service d'Export (Interface)
     # Nous injectons le moteur *dans* le service.
@@ -142,9 +125,16 @@ def main():
         
         
 
-    project_list_data = ProjectAPI.list_projects()
+    # Catalogue indexé : seuls les projets modifiés depuis la dernière ouverture sont relus
+    try:
+        project_list_data = ProjectAPI.list_project_entries()
+        search_projects = lambda text: ProjectAPI.catalog().query(name_contains=text or None)
+    except Exception as e:
+        print(f"Catalogue des projets indisponible : {e}")
+        project_list_data = ProjectAPI.list_projects()
+        search_projects = None
 
-    main_menu = MainMenu(go_to_editor,go_to_editor_with_project_name, project_list_data)
+    main_menu = MainMenu(go_to_editor,go_to_editor_with_project_name, project_list_data, search_projects)
 
     # Note: La logique "go_back_to_menu" est (probablement) gérée
     # à l'intérieur de EditorWindow via un signal.
@@ -0,0 +1,239 @@
+# render_cli.py (rendu headless, sans Qt)
+"""
+Rendu en ligne de commande pour les nœuds de rendu sans affichage.
+
+    luminare-render projet.lmprj -o sortie.mp4 --profile h264_fast_draft
+    luminare-render "projets/*.lmprj" -o exports/ --jobs 4
+    luminare-render projet.lmprj --dump-graph      # graphe vidéo optimisé
+
+Le projet est chargé par LMPRJChunkedSerializer.load et rendu par
+ExportService ; aucun module UI (PySide6) n'est importé. Les imports lourds
+sont faits à la demande, pour que le démarrage reste court.
+"""
+from __future__ import annotations
+import time
+
+_T0 = time.perf_counter()
+
+import argparse
+import glob
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+APP_DIR = Path(__file__).resolve().parent
+if str(APP_DIR) not in sys.path:
+    sys.path.insert(0, str(APP_DIR))
+
+ENGINES = ("smart", "parallel", "ffmpeg", "frame-server", "distributed")
+
+
+def peak_rss_mb(children: bool = False) -> Optional[float]:
+    """Pic de mémoire résidente (Mo) du processus ou de ses enfants (ffmpeg)."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+    rss = resource.getrusage(who).ru_maxrss
+    # ru_maxrss : Ko sous Linux, octets sous macOS
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def make_engine(name: str, workers: Optional[int] = None, cache: bool = False,
+                nodes: Optional[List[tuple]] = None):
+    if name == "distributed":
+        from core.export.distributed import DistributedRenderEngine
+        return DistributedRenderEngine(nodes or [])
+    if name == "frame-server":
+        from core.export.frame_server_engine import FrameServerRenderEngine
+        return FrameServerRenderEngine()
+    if name == "ffmpeg":
+        from core.export.ffmpeg_engine import FfmpegRenderEngine
+        return FfmpegRenderEngine()
+
+    kwargs: Dict[str, Any] = {"workers": workers}
+    if cache:
+        from core.export.render_cache import SegmentRenderCache
+        kwargs["cache"] = SegmentRenderCache()
+    if name == "parallel":
+        from core.export.parallel_engine import ParallelFfmpegRenderEngine
+        return ParallelFfmpegRenderEngine(**kwargs)
+    from core.export.smart_render_engine import SmartRenderEngine
+    return SmartRenderEngine(**kwargs)
+
+
+def render_one(project_file: str, output: str, profile_key: str, engine_name: str,
+               workers: Optional[int] = None, cache: bool = False,
+               quiet: bool = False, nodes: Optional[List[tuple]] = None,
+               incremental: bool = False) -> Dict[str, Any]:
+    """Rend un projet ; utilisable tel quel dans un processus du pool."""
+    t_start = time.perf_counter()
+    from core.save_system.serializers import LMPRJChunkedSerializer
+    from core.export.export_service import ExportService
+    from core.export.export_profile import DEFAULT_PROFILES
+    from core.export.engine_interface import RenderError, RenderMonitor
+
+    result: Dict[str, Any] = {"project": project_file, "output": output, "ok": False}
+    try:
+        service = ExportService(engine=make_engine(engine_name, workers, cache, nodes))
+        project = LMPRJChunkedSerializer.load(project_file)
+        result["startup_s"] = time.perf_counter() - t_start
+        result["media_s"] = project.total_duration_s()
+
+        monitor = None
+        if not quiet:
+            name = Path(project_file).name
+            last = [-1]
+
+            def on_progress(info):
+                pct = int(info.percent)
+                if pct != last[0]:
+                    last[0] = pct
+                    eta = f", reste {info.eta_s:.0f}s" if info.eta_s is not None else ""
+                    print(f"[{name}] {pct:3d}% — {info.fps:.0f} i/s{eta}", flush=True)
+
+            monitor = RenderMonitor(on_progress=on_progress)
+
+        t_render = time.perf_counter()
+        service.export_project(project, Path(output), DEFAULT_PROFILES[profile_key], monitor=monitor,
+                               incremental=incremental)
+        result["render_s"] = time.perf_counter() - t_render
+        result["ok"] = True
+    except RenderError as e:
+        result["error"] = str(e)
+    except Exception as e:
+        result["error"] = f"Erreur inattendue : {e}"
+    result["wall_s"] = time.perf_counter() - t_start
+    result["peak_rss_mb"] = peak_rss_mb()
+    result["ffmpeg_peak_rss_mb"] = peak_rss_mb(children=True)
+    return result
+
+
+def _render_one_star(args):
+    return render_one(*args)
+
+
+def expand_projects(patterns: List[str]) -> List[str]:
+    files: List[str] = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern, recursive=True)) if glob.has_magic(pattern) else [pattern]
+        for m in matches:
+            p = os.path.abspath(m)
+            if p not in files:
+                files.append(p)
+    return files
+
+
+def output_for(project_file: str, output: Optional[str], many: bool) -> str:
+    """Sortie d'un projet : -o tel quel pour un seul projet, sinon dossier -o/<nom>.mp4."""
+    if output and not many and not output.endswith(("/", os.sep)) and not os.path.isdir(output):
+        return os.path.abspath(output)
+    out_dir = output or os.path.dirname(project_file)
+    return os.path.abspath(os.path.join(out_dir, Path(project_file).stem + ".mp4"))
+
+
+def dump_graphs(projects: List[str], profile_key: str) -> int:
+    """Affiche l'IR optimisée (render_graph) de chaque projet."""
+    from core.save_system.serializers import LMPRJChunkedSerializer
+    from core.export.ffmpeg_engine import FfmpegRenderEngine
+    from core.export.export_profile import DEFAULT_PROFILES
+
+    engine = FfmpegRenderEngine()
+    for project_file in projects:
+        project = LMPRJChunkedSerializer.load(project_file)
+        print(f"# {project_file}")
+        print(engine.video_graph(project, DEFAULT_PROFILES[profile_key]).dump())
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    from core.export.export_profile import DEFAULT_PROFILES
+    ap = argparse.ArgumentParser(prog="luminare-render",
+                                 description="Rendu headless de projets Luminare (.lmprj).")
+    ap.add_argument("projects", nargs="+", help="fichiers .lmprj ou motifs glob (\"dossier/*.lmprj\")")
+    ap.add_argument("-o", "--output", help="fichier de sortie (un projet) ou dossier (plusieurs)")
+    ap.add_argument("--profile", default="h264_medium", choices=sorted(DEFAULT_PROFILES))
+    ap.add_argument("--engine", default="smart", choices=ENGINES)
+    ap.add_argument("-j", "--jobs", type=int, default=1,
+                    help="nombre de projets rendus en parallèle (pool de processus)")
+    ap.add_argument("--cache", action="store_true", help="réutiliser les segments déjà rendus")
+    ap.add_argument("--incremental", action="store_true",
+                    help="garder les flux vidéo/audio : le réexport ne refait que le flux modifié")
+    ap.add_argument("-q", "--quiet", action="store_true", help="pas d'affichage de progression")
+    ap.add_argument("--nodes", default="",
+                    help="moteur distributed : workers host:port séparés par des virgules")
+    ap.add_argument("--local-nodes", type=int, default=0,
+                    help="moteur distributed : lancer N workers locaux")
+    ap.add_argument("--dump-graph", action="store_true",
+                    help="afficher le graphe vidéo optimisé de chaque projet, sans rendre")
+    return ap
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    projects = expand_projects(args.projects)
+    if not projects:
+        print("Aucun projet trouvé.", file=sys.stderr)
+        return 2
+    many = len(projects) > 1
+    outputs = [output_for(p, args.output, many) for p in projects]
+
+    # Mêmes conventions que l'app : ffmpeg portable de vendor/ (caches : voir app_cache_dir)
+    from core.runtime_env import bootstrap_ffmpeg_on_path
+    os.chdir(APP_DIR)
+    bootstrap_ffmpeg_on_path(APP_DIR)
+
+    if args.dump_graph:
+        return dump_graphs(projects, args.profile)
+
+    jobs = max(1, min(args.jobs, len(projects)))
+    workers = max(1, (os.cpu_count() or 1) // jobs)
+    startup = time.perf_counter() - _T0
+    print(f"Démarrage : {startup * 1000:.0f} ms, mémoire {peak_rss_mb() or 0:.0f} Mo — "
+          f"{len(projects)} projet(s), {jobs} en parallèle", flush=True)
+
+    nodes = []
+    for item in filter(None, (n.strip() for n in args.nodes.split(","))):
+        host, _, port = item.rpartition(":")
+        nodes.append((host or "127.0.0.1", int(port)))
+    local_pool = None
+    if args.engine == "distributed" and args.local_nodes:
+        from core.export.distributed import launch_local_workers
+        local_pool = launch_local_workers(args.local_nodes)
+        nodes += local_pool.addresses
+    if args.engine == "distributed" and not nodes:
+        print("Le moteur distributed demande --nodes ou --local-nodes.", file=sys.stderr)
+        return 2
+
+    tasks = [(p, o, args.profile, args.engine, workers, args.cache, args.quiet or jobs > 1, nodes,
+              args.incremental)
+             for p, o in zip(projects, outputs)]
+    try:
+        if jobs == 1:
+            results = [_render_one_star(t) for t in tasks]
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                results = list(pool.map(_render_one_star, tasks))
+    finally:
+        if local_pool is not None:
+            local_pool.close()
+
+    failed = 0
+    for r in results:
+        if r["ok"]:
+            speed = r["media_s"] / r["render_s"] if r.get("render_s") else 0.0
+            print(f"OK   {r['output']} — rendu {r['render_s']:.1f}s (x{speed:.2f} temps réel), "
+                  f"chargement {r['startup_s'] * 1000:.0f} ms, "
+                  f"pic mémoire {r['peak_rss_mb'] or 0:.0f} Mo (ffmpeg {r['ffmpeg_peak_rss_mb'] or 0:.0f} Mo)")
+        else:
+            failed += 1
+            print(f"ÉCHEC {r['project']} : {r.get('error')}", file=sys.stderr)
+    print(f"Total : {time.perf_counter() - _T0:.1f}s, {len(results) - failed}/{len(results)} réussi(s)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
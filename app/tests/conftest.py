@@ -0,0 +1,13 @@
+# tests/conftest.py
+from __future__ import annotations
+
+import pytest
+
+
+@pytest.fixture
+def save_dir(tmp_path, monkeypatch):
+    """Dossier de sauvegarde isolé (voir LMPRJChunkedSerializer.get_save_dir)."""
+    monkeypatch.setenv("XDG_DATA_HOME", str(tmp_path))
+    monkeypatch.setenv("USERPROFILE", str(tmp_path))
+    from core.save_system.serializers import LMPRJChunkedSerializer
+    return LMPRJChunkedSerializer.get_save_dir()
@@ -0,0 +1,73 @@
+# tests/test_catalog.py
+"""Catalogue SQLite du dossier de sauvegarde."""
+from __future__ import annotations
+import os
+
+import pytest
+
+from core.project import Project, Clip
+from core.save_system.catalog import ProjectCatalog, THUMBNAIL_DIR
+from core.save_system.serializers import LMPRJChunkedSerializer
+
+
+def _save(filename: str, name: str, clips: int, clip_s: float = 2.0) -> str:
+    project = Project(name=name)
+    project.clips = [Clip(path=f"/media/{name}_{i}.mp4", in_s=0.0, out_s=clip_s, duration_s=clip_s)
+                     for i in range(clips)]
+    return LMPRJChunkedSerializer.save(project, filename)
+
+
+@pytest.fixture
+def catalog(save_dir):
+    _save("court.lmprj", "Court métrage", clips=2)
+    _save("long.lmprj", "Long_métrage", clips=10, clip_s=30.0)
+    _save("clip.lmprj", "Clip musical", clips=5, clip_s=4.0)
+    catalog = ProjectCatalog()
+    yield catalog
+    catalog.close()
+
+
+def test_refresh_only_rereads_changed_files(catalog, save_dir):
+    assert catalog.refresh() == (3, 0)
+    assert catalog.refresh() == (0, 0)
+
+    _save("clip.lmprj", "Clip musical", clips=6, clip_s=4.0)
+    os.remove(os.path.join(save_dir, "court.lmprj"))
+    assert catalog.refresh() == (1, 1)
+    assert catalog.count() == 2
+    assert {e.filename: e.clip_count for e in catalog.query()} == {"long.lmprj": 10, "clip.lmprj": 6}
+
+
+def test_entries_come_from_the_headers(catalog):
+    catalog.refresh()
+    entry = next(e for e in catalog.query() if e.filename == "long.lmprj")
+    assert entry.name == "Long_métrage"
+    assert entry.duration_s == pytest.approx(300.0)
+    assert entry.clip_count == 10 and entry.text_overlay_count == 0
+    assert entry.thumbnail is None
+
+
+def test_query_filters_sorts_and_pages(catalog):
+    catalog.refresh()
+    assert [e.filename for e in catalog.query(sort="clips", descending=False)] == \
+        ["court.lmprj", "clip.lmprj", "long.lmprj"]
+    assert [e.filename for e in catalog.query(name_contains="métrage", sort="name", descending=False)] == \
+        ["court.lmprj", "long.lmprj"]
+    # '_' est littéral, pas un joker LIKE
+    assert [e.filename for e in catalog.query(name_contains="g_m")] == ["long.lmprj"]
+    assert [e.filename for e in catalog.query(min_duration_s=10.0, max_duration_s=100.0)] == ["clip.lmprj"]
+    assert [e.filename for e in catalog.query(min_clips=5, sort="duration", limit=1, offset=1)] == ["clip.lmprj"]
+    with pytest.raises(ValueError):
+        catalog.query(sort="chemin")
+
+
+def test_thumbnails_are_found_by_convention(catalog, save_dir):
+    os.makedirs(os.path.join(save_dir, THUMBNAIL_DIR))
+    thumb = os.path.join(save_dir, THUMBNAIL_DIR, "court.png")
+    open(thumb, "wb").close()
+    catalog.refresh()
+    entries = {e.filename: e for e in catalog.query()}
+    assert entries["court.lmprj"].thumbnail == thumb
+
+    catalog.set_thumbnail("court.lmprj", None)
+    assert next(e for e in catalog.query() if e.filename == "court.lmprj").thumbnail is None
@@ -0,0 +1,44 @@
+# tests/test_distributed.py
+"""Rendu distribué de bout en bout sur des workers locaux (ffmpeg requis)."""
+from __future__ import annotations
+import shutil
+
+import pytest
+
+ffmpeg = pytest.importorskip("ffmpeg")
+if shutil.which("ffmpeg") is None or shutil.which("ffprobe") is None:
+    pytest.skip("ffmpeg/ffprobe introuvables", allow_module_level=True)
+
+from core.project import Project, Clip
+from core.export.distributed import DistributedRenderEngine, LocalWorkerPool
+from core.export.export_profile import DEFAULT_PROFILES
+from core.export.timeline_slicing import plan_segments
+
+SOURCE_S = 6.0
+
+
+@pytest.fixture(scope="module")
+def source(tmp_path_factory):
+    """Source synthétique : mire + sinus, 320x240 à 25 i/s."""
+    path = tmp_path_factory.mktemp("media") / "source.mp4"
+    v = ffmpeg.input(f"testsrc=size=320x240:rate=25:duration={SOURCE_S}", f="lavfi")
+    a = ffmpeg.input(f"sine=frequency=440:duration={SOURCE_S}", f="lavfi")
+    ffmpeg.run(ffmpeg.output(v, a, str(path), vcodec="libx264", preset="ultrafast",
+                             g=25, acodec="aac"), overwrite_output=True, quiet=True)
+    return path
+
+
+def test_render_on_local_workers(source, tmp_path):
+    project = Project(name="distribué", resolution=(320, 240), fps=25, audio_normalize=False)
+    project.clips = [Clip(path=str(source), in_s=0.0, out_s=3.0, duration_s=3.0),
+                     Clip(path=str(source), in_s=2.0, out_s=5.0, duration_s=3.0)]
+    out = tmp_path / "out.mp4"
+
+    with LocalWorkerPool(2) as pool:
+        engine = DistributedRenderEngine(pool.addresses, segment_s=0.5)
+        engine.render(project, out, DEFAULT_PROFILES["h264_fast_draft"])
+
+    duration = float(ffmpeg.probe(str(out))["format"]["duration"])
+    assert duration == pytest.approx(project.total_duration_s(), abs=0.15)
+    assert sum(st.parts for st in engine.last_stats) == len(plan_segments(project, 0.5))
+    assert sum(1 for st in engine.last_stats if st.parts > 0) >= 2
@@ -0,0 +1,111 @@
+# tests/test_journal.py
+"""Sauvegardes journalisées : rejeu des deltas, compaction, échecs en cours de sauvegarde."""
+from __future__ import annotations
+import os
+
+import pytest
+
+from core.project import Project, Clip, TextOverlay
+from core.save_system import journal
+from core.save_system.journal import ProjectJournal, journal_state
+from core.save_system.serializers import LMPRJChunkedSerializer
+
+NAME = "journal.lmprj"
+
+
+def _project(n: int = 5) -> Project:
+    project = Project(name="journal")
+    project.clips = [Clip(path=f"/media/clip{i}.mp4", in_s=float(i), out_s=float(i) + 2.0, duration_s=2.0)
+                     for i in range(n)]
+    return project
+
+
+def _loaded() -> Project:
+    return LMPRJChunkedSerializer.load(NAME)
+
+
+def test_deltas_are_appended_and_replayed(save_dir):
+    project = _project()
+    jr = ProjectJournal(NAME)
+    jr.save(project)
+    base_size = os.path.getsize(jr.path)
+
+    project.clips.insert(2, Clip(path="/media/new.mp4", in_s=0.0, out_s=1.0, duration_s=1.0))
+    assert jr.save(project) > 0
+    del project.clips[0]
+    project.clips[-1].out_s = 3.5
+    project.text_overlays.append(TextOverlay(text="Titre", start=0.0, end=1.0))
+    project.name = "renommé"
+    jr.save(project)
+    assert jr.save(project) == 0
+
+    assert os.path.getsize(jr.path) > base_size
+    assert journal_state(_loaded()) == journal_state(project)
+    assert LMPRJChunkedSerializer.read_header(NAME)["clip_count"] == len(project.clips)
+
+
+def test_truncated_delta_is_ignored(save_dir):
+    project = _project()
+    jr = ProjectJournal(NAME)
+    jr.save(project)
+    saved = journal_state(project)
+    project.clips.pop()
+    jr.save(project)
+
+    with open(jr.path, "r+b") as f:
+        f.truncate(os.path.getsize(jr.path) - 3)
+    assert journal_state(_loaded()) == saved
+
+
+def test_compaction_rewrites_a_snapshot(save_dir):
+    project = _project()
+    jr = ProjectJournal(NAME, compact_threshold=200)
+    jr.save(project)
+    for i in range(10):
+        project.clips.append(Clip(path=f"/media/more{i}.mp4", in_s=0.0, out_s=1.0, duration_s=1.0))
+        jr.save(project)
+        jr.wait()
+
+    with LMPRJChunkedSerializer.open_lazy(NAME) as lazy:
+        deltas = len(lazy._chunks.get(journal.DELTA_CHUNK, ()))
+    assert deltas < 10
+    assert journal_state(_loaded()) == journal_state(project)
+
+
+def test_failed_append_leaves_no_partial_delta(save_dir, monkeypatch):
+    project = _project()
+    jr = ProjectJournal(NAME)
+    jr.save(project)
+    size = os.path.getsize(jr.path)
+
+    def disk_full(f, chunk_id, data):
+        f.write(chunk_id.encode("ascii") + b"\0\0")
+        raise OSError("disque plein")
+
+    project.clips.pop()
+    with monkeypatch.context() as m, pytest.raises(OSError):
+        m.setattr(LMPRJChunkedSerializer, "write_chunk", staticmethod(disk_full))
+        jr.save(project)
+    assert os.path.getsize(jr.path) == size
+
+    project.clips.pop()
+    jr.save(project)
+    assert journal_state(_loaded()) == journal_state(project)
+
+
+def test_failed_header_update_does_not_replay_the_delta_twice(save_dir, monkeypatch):
+    project = _project()
+    jr = ProjectJournal(NAME)
+    jr.save(project)
+
+    def broken(path, stats):
+        raise ValueError("en-tête illisible")
+
+    project.clips.insert(0, Clip(path="/media/first.mp4", in_s=0.0, out_s=1.0, duration_s=1.0))
+    with monkeypatch.context() as m, pytest.raises(ValueError):
+        m.setattr(LMPRJChunkedSerializer, "update_header", staticmethod(broken))
+        jr.save(project)
+
+    project.clips.append(Clip(path="/media/last.mp4", in_s=0.0, out_s=1.0, duration_s=1.0))
+    jr.save(project)
+    assert journal_state(_loaded()) == journal_state(project)
@@ -0,0 +1,103 @@
+# tests/test_lazy_project.py
+"""Lecture projetée en mémoire (LazyProject)."""
+from __future__ import annotations
+import os
+
+import pytest
+
+from core.project import Project, Clip, ImageOverlay
+from core.save_system.journal import ProjectJournal
+from core.save_system.lazy_project import LazyProject
+from core.save_system.save_api import ProjectAPI
+from core.save_system.serializers import LMPRJChunkedSerializer
+
+NAME = "lazy.lmprj"
+
+
+def _project(n: int = 50) -> Project:
+    project = Project(name="lazy", fps=25)
+    project.clips = [Clip(path=f"/media/rush_{i % 4}.mp4", in_s=float(i), out_s=i + 1.5, duration_s=1.5)
+                     for i in range(n)]
+    project.image_overlays = [ImageOverlay(path="/media/logo.png", start=0.0, end=4.0)]
+    return project
+
+
+def test_reads_metadata_and_single_clips_without_decoding_all(save_dir):
+    project = _project()
+    path = LMPRJChunkedSerializer.save(project, NAME)
+    with LazyProject(path) as lazy:
+        assert lazy.header["clip_count"] == 50
+        assert lazy.clip_count == 50
+        assert lazy.name == "lazy" and lazy.fps == 25
+        assert lazy.clip(7) == project.clips[7]
+        assert "clips" not in lazy._cache
+        assert lazy.image_overlays == project.image_overlays
+
+
+def test_clip_columns_are_views_on_the_file(save_dir):
+    project = _project()
+    path = LMPRJChunkedSerializer.save(project, NAME)
+    lazy = LazyProject(path)
+    idx, in_s, out_s, dur = lazy.clip_columns()
+    assert isinstance(in_s, memoryview)
+    assert [lazy.strings[i] for i in idx] == [c.path for c in project.clips]
+    assert list(in_s) == [c.in_s for c in project.clips]
+    assert sum(dur) == pytest.approx(project.total_duration_s())
+
+    raw = lazy.chunk("PROJ")
+    lazy.close()
+    # vues libérées avec la projection
+    with pytest.raises(ValueError):
+        in_s[0]
+    with pytest.raises(ValueError):
+        bytes(raw)
+    assert lazy._file.closed
+
+
+def test_to_project_matches_the_loader(save_dir):
+    project = _project()
+    path = LMPRJChunkedSerializer.save(project, NAME)
+    with LazyProject(path) as lazy:
+        loaded = lazy.to_project()
+    assert loaded.clips == project.clips
+    assert loaded.image_overlays == project.image_overlays
+    with ProjectAPI.open_lazy(NAME) as lazy:
+        assert lazy.clip_count == 50
+
+
+def test_journaled_files_replay_deltas(save_dir):
+    project = _project()
+    jr = ProjectJournal(NAME)
+    jr.save(project)
+    del project.clips[:10]
+    project.name = "après"
+    jr.save(project)
+
+    with LazyProject(jr.path) as lazy:
+        assert lazy.has_journal
+        assert lazy.clip_columns() is None
+        assert lazy.clip_count == 40
+        assert lazy.name == "après"
+        assert lazy.clip(0) == project.clips[0]
+        assert lazy.to_project().clips == project.clips
+
+
+def test_legacy_and_damaged_files(save_dir):
+    project = _project(5)
+    path = LMPRJChunkedSerializer.path_for(NAME)
+    with open(path, "wb") as f:
+        LMPRJChunkedSerializer.write_snapshot(f, project, columnar_tables=False)
+    with LazyProject(path) as lazy:
+        assert lazy.clip_columns() is None
+        assert lazy.clips == project.clips
+
+    # fichier tronqué : les chunks complets restent lisibles
+    with open(path, "r+b") as f:
+        f.truncate(os.path.getsize(path) - 5)
+    with LazyProject(path) as lazy:
+        assert lazy.clip_count == 4
+
+    open(path, "wb").close()
+    with LazyProject(path) as lazy:
+        assert lazy.header is None and lazy.clip_count == 0
+        assert lazy.to_project().name == Project().name
@@ -0,0 +1,51 @@
+# tests/test_loudness.py
+"""Mesure de loudness de la timeline combinée depuis celles des clips."""
+from __future__ import annotations
+import math
+
+import pytest
+
+pytest.importorskip("ffmpeg")
+
+from core.export.loudness import LoudnessStats, combine
+
+
+def _stats(i: float, tp: float = -3.0, lra: float = 0.0, duration: float = 10.0) -> LoudnessStats:
+    return LoudnessStats(input_i=i, input_tp=tp, input_lra=lra, input_thresh=i - 10.0, duration_s=duration)
+
+
+def test_integrated_is_energy_weighted_by_duration():
+    merged = combine([_stats(-20.0, duration=30.0), _stats(-10.0, duration=10.0)])
+    expected = 10.0 * math.log10((30.0 * 10 ** -2.0 + 10.0 * 10 ** -1.0) / 40.0)
+    assert merged.input_i == pytest.approx(expected)
+    assert merged.input_thresh == pytest.approx(expected - 10.0)
+    assert merged.duration_s == 40.0
+
+
+def test_true_peak_is_the_maximum():
+    merged = combine([_stats(-16.0, tp=-6.0), _stats(-18.0, tp=-0.5), _stats(-14.0, tp=-2.0)])
+    assert merged.input_tp == -0.5
+
+
+def test_silence_is_gated_out():
+    silent = LoudnessStats(float("-inf"), float("-inf"), 0.0, float("-inf"), 20.0)
+    merged = combine([_stats(-16.0, duration=10.0), silent])
+    assert merged.input_i == pytest.approx(-16.0)
+    assert merged.duration_s == 30.0
+    assert combine([silent]) is None
+
+
+def test_lra_includes_level_differences_between_clips():
+    merged = combine([_stats(-30.0, lra=2.0), _stats(-12.0, lra=3.0)])
+    # deux clips stables à 18 LU d'écart : la LRA regroupée dépasse leurs LRA
+    assert merged.input_lra > 15.0
+
+
+def test_lra_is_never_below_a_clip_lra():
+    merged = combine([_stats(-16.0, lra=8.0), _stats(-16.0, lra=4.0, duration=1.0)])
+    assert merged.input_lra >= 8.0
+
+
+def test_lra_gates_clips_20_lu_below_the_programme():
+    merged = combine([_stats(-14.0, lra=5.0, duration=50.0), _stats(-60.0, lra=1.0, duration=50.0)])
+    assert merged.input_lra == pytest.approx(5.0)
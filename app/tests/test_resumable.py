@@ -0,0 +1,87 @@
+# tests/test_resumable.py
+"""Export incrémental : seul le flux dont les entrées ont changé est re-rendu."""
+from __future__ import annotations
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("ffmpeg")
+
+from core.project import Project, Clip, TextOverlay
+from core.export.export_profile import DEFAULT_PROFILES
+from core.export.export_service import ExportService
+from core.export.render_cache import SegmentRenderCache
+from core.export.smart_render_engine import SmartRenderEngine
+
+
+class CountingSmartEngine(SmartRenderEngine):
+    """Moteur de l'app sans ffmpeg : chaque rendu écrit un fichier factice et est compté."""
+
+    def __init__(self, cache_dir: Path):
+        super().__init__(workers=2, cache=SegmentRenderCache(cache_dir))
+        self.calls = Counter()
+
+    def _source_matches(self, clip, project, profile) -> bool:
+        return False  # pas de sonde : tout est rendu
+
+    def render_options(self) -> dict:
+        return {"text_backend": self.text_backend}
+
+    def render_video_part_multi(self, project, start, end, targets, monitor=None) -> None:
+        self.calls["video"] += 1
+        for _, path in targets:
+            Path(path).write_bytes(f"video {start:.3f}-{end:.3f}".encode())
+
+    def render_audio_track(self, project, output_path, profile, monitor=None, task="audio") -> None:
+        self.calls["audio"] += 1
+        Path(output_path).write_bytes(f"audio {project.audio_normalize}".encode())
+
+    def concat_parts(self, part_paths, audio_path, output_path, profile, monitor=None,
+                     duration_s=0.0, task="concat") -> None:
+        self.calls["concat"] += 1
+        data = b"".join(Path(p).read_bytes() for p in part_paths) + Path(audio_path).read_bytes()
+        Path(output_path).write_bytes(data)
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    monkeypatch.setenv("LUMINARE_CACHE_DIR", str(tmp_path / "cache"))
+    return CountingSmartEngine(tmp_path / "segments")
+
+
+@pytest.fixture
+def project(tmp_path) -> Project:
+    project = Project(name="incrémental", resolution=(320, 240), fps=25, audio_normalize=False)
+    project.clips = [Clip(path=str(tmp_path / "a.mp4"), in_s=0.0, out_s=25.0, duration_s=25.0),
+                     Clip(path=str(tmp_path / "b.mp4"), in_s=5.0, out_s=12.0, duration_s=7.0)]
+    return project
+
+
+def _export(engine, project, out: Path) -> None:
+    engine.calls.clear()
+    ExportService(engine).export_project(project, out, DEFAULT_PROFILES["h264_fast_draft"],
+                                         incremental=True)
+
+
+def test_audio_only_edit_rerenders_only_the_audio_track(engine, project, tmp_path):
+    out = tmp_path / "out.mp4"
+    _export(engine, project, out)
+    assert engine.calls["video"] > 0 and engine.calls["audio"] == 1
+
+    project.audio_normalize = True
+    _export(engine, project, out)
+    assert engine.calls == Counter(audio=1, concat=1)
+    assert out.read_bytes().endswith(b"audio True")
+
+
+def test_title_edit_keeps_the_audio_and_unchanged_segments(engine, project, tmp_path):
+    out = tmp_path / "out.mp4"
+    _export(engine, project, out)
+    first = engine.calls["video"]
+
+    project.text_overlays = [TextOverlay(text="Titre", start=1.0, end=3.0)]
+    _export(engine, project, out)
+    assert engine.calls["audio"] == 0
+    # seule la fenêtre du cache qui porte le titre est ré-encodée
+    assert 0 < engine.calls["video"] < first
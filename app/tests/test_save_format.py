@@ -0,0 +1,123 @@
+# tests/test_save_format.py
+"""Format .lmprj : tables en colonnes (format 2) et lecture des anciens fichiers."""
+from __future__ import annotations
+import struct
+
+import pytest
+
+from core.project import Project, Clip, TextOverlay, ImageOverlay, Filters
+from core.save_system import columnar
+from core.save_system.serializers import LMPRJChunkedSerializer
+
+NAME = "format.lmprj"
+
+
+def _project(n: int = 20) -> Project:
+    project = Project(name="format", resolution=(1280, 720), fps=25, output="sortie.mp4",
+                      audio_normalize=False)
+    project.filters = Filters(brightness=0.1, contrast=1.2, saturation=0.9, vignette=True)
+    project.imported_assets = [{"name": "a", "path": "/media/a.mp4", "type": "video"}]
+    project.clips = [Clip(path=f"/média/rush_{i % 3}.mp4", in_s=i * 0.5, out_s=i * 0.5 + 1.25,
+                          duration_s=1.25) for i in range(n)]
+    project.text_overlays = [TextOverlay(text="Titre é", start=0.0, end=2.0)]
+    project.image_overlays = [ImageOverlay(path="/media/logo.png", x=0.1, y=0.2, w=0.3, h=0.4,
+                                           start=1.0, end=5.0, opacity=0.5),
+                              ImageOverlay(path="/média/rush_0.mp4", start=2.0, end=3.0)]
+    return project
+
+
+def _chunks(path: str):
+    """[(id, début des données, longueur)] en parcourant le fichier."""
+    data = open(path, "rb").read()
+    found, pos = [], 0
+    while pos + 8 <= len(data):
+        chunk_id, length = struct.unpack_from("4sI", data, pos)
+        found.append((chunk_id.decode("ascii"), pos + 8, length))
+        pos += 8 + length
+    assert pos == len(data)
+    return found
+
+
+def _assert_same(loaded: Project, project: Project) -> None:
+    assert loaded.name == project.name
+    assert tuple(loaded.resolution) == tuple(project.resolution)
+    assert loaded.fps == project.fps
+    assert loaded.output == project.output
+    assert loaded.audio_normalize == project.audio_normalize
+    assert loaded.filters == project.filters
+    assert loaded.imported_assets == project.imported_assets
+    assert loaded.clips == project.clips
+    assert loaded.text_overlays == project.text_overlays
+    assert loaded.image_overlays == project.image_overlays
+
+
+def test_columnar_round_trip(save_dir):
+    project = _project()
+    path = LMPRJChunkedSerializer.save(project, NAME)
+    _assert_same(LMPRJChunkedSerializer.load(NAME), project)
+
+    ids = [c[0] for c in _chunks(path)]
+    assert ids[0] == LMPRJChunkedSerializer.HEADER_CHUNK
+    assert {"STRT", "CLPT", "IMGT"} <= set(ids) and "CLIP" not in ids
+    header = LMPRJChunkedSerializer.read_header(NAME)
+    assert header["version"] == LMPRJChunkedSerializer.VERSION
+
+
+def test_table_data_is_aligned_on_8_bytes(save_dir):
+    path = LMPRJChunkedSerializer.save(_project(n=7), NAME)
+    for chunk_id, start, _ in _chunks(path):
+        if chunk_id in ("CLPT", "IMGT"):
+            assert start % 8 == 0
+
+
+def test_paths_are_interned_once(save_dir):
+    path = LMPRJChunkedSerializer.save(_project(n=300), NAME)
+    data = open(path, "rb").read()
+    _, start, length = next(c for c in _chunks(path) if c[0] == "STRT")
+    assert sorted(columnar.decode_strings(data[start:start + length])) == \
+        ["/media/logo.png", "/média/rush_0.mp4", "/média/rush_1.mp4", "/média/rush_2.mp4"]
+
+
+def test_empty_project_round_trip(save_dir):
+    project = Project(name="vide")
+    LMPRJChunkedSerializer.save(project, NAME)
+    _assert_same(LMPRJChunkedSerializer.load(NAME), project)
+
+
+def test_legacy_clip_chunks_still_load(save_dir):
+    project = _project()
+    with open(LMPRJChunkedSerializer.path_for(NAME), "wb") as f:
+        LMPRJChunkedSerializer.write_snapshot(f, project, columnar_tables=False)
+    ids = [c[0] for c in _chunks(LMPRJChunkedSerializer.path_for(NAME))]
+    assert ids.count("CLIP") == len(project.clips) and "CLPT" not in ids
+    assert LMPRJChunkedSerializer.read_header(NAME)["version"] == LMPRJChunkedSerializer.LEGACY_VERSION
+
+    loaded = LMPRJChunkedSerializer.load(NAME)
+    # l'ancien format ne stocke pas les overlays d'images
+    project.image_overlays = []
+    _assert_same(loaded, project)
+
+
+def test_files_without_header_still_load(save_dir):
+    project = _project()
+    project.image_overlays = []
+    with open(LMPRJChunkedSerializer.path_for(NAME), "wb") as f:
+        LMPRJChunkedSerializer._write_chunks(f, project, LMPRJChunkedSerializer.write_chunk,
+                                             columnar_tables=False,
+                                             version=LMPRJChunkedSerializer.LEGACY_VERSION)
+    _assert_same(LMPRJChunkedSerializer.load(NAME), project)
+
+
+def test_string_table_round_trip():
+    table = columnar.StringTable()
+    assert [table.intern(s) for s in ("a", "", "é😀", "a")] == [0, 1, 2, 0]
+    assert columnar.decode_strings(table.encode()) == ["a", "", "é😀"]
+
+
+def test_table_columns_read_values_in_place():
+    buf = columnar.encode_table([2, 0, 1], [[0.5, 1.5, 2.5], [-1.0, 0.0, 1e9]])
+    n, idx_off, col_offs = columnar.table_layout(buf)
+    assert n == 3 and all(off % 8 == 0 for off in col_offs)
+    idx, (first, second) = columnar.table_columns(buf)
+    assert list(idx) == [2, 0, 1]
+    assert list(first) == [0.5, 1.5, 2.5] and list(second) == pytest.approx([-1.0, 0.0, 1e9])
@@ -0,0 +1,67 @@
+# tests/test_save_header.py
+"""En-tête HEAD des .lmprj : résumé lisible sans charger le projet."""
+from __future__ import annotations
+import os
+
+import pytest
+
+from core.project import Project, Clip, TextOverlay
+from core.save_system.serializers import LMPRJChunkedSerializer
+
+NAME = "entete.lmprj"
+
+
+def _project(name: str = "entête", n: int = 3) -> Project:
+    project = Project(name=name)
+    project.clips = [Clip(path=f"/media/clip{i}.mp4", in_s=0.0, out_s=2.5, duration_s=2.5) for i in range(n)]
+    project.text_overlays = [TextOverlay(text="Titre", start=0.0, end=1.0)]
+    return project
+
+
+def test_header_summarizes_the_project(save_dir):
+    LMPRJChunkedSerializer.save(_project(), NAME)
+    header = LMPRJChunkedSerializer.read_header(NAME)
+    assert header["format"] == LMPRJChunkedSerializer.HEADER_FORMAT
+    assert header["name"] == "entête"
+    assert header["clip_count"] == 3
+    assert header["total_duration_s"] == pytest.approx(7.5)
+    assert header["text_overlay_count"] == 1
+    assert [c[0] for c in header["chunks"]][:2] == ["PROJ", "RESO"]
+
+
+@pytest.mark.parametrize("name", ["x" * 5000, "😀" * 200, "é́" * 400], ids=["ascii", "emoji", "accents"])
+def test_long_non_ascii_names_fit_the_header(save_dir, name):
+    path = LMPRJChunkedSerializer.save(_project(name=name), NAME)
+    header = LMPRJChunkedSerializer.read_header(NAME)
+    assert name.startswith(header["name"]) and header["name"]
+    # le nom complet reste dans le chunk PROJ
+    assert LMPRJChunkedSerializer.load(NAME).name == name
+    assert not os.path.exists(f"{path}.tmp")
+
+
+def test_failed_save_keeps_the_previous_file(save_dir, monkeypatch):
+    path = LMPRJChunkedSerializer.save(_project(), NAME)
+    before = open(path, "rb").read()
+
+    def broken(f, project, columnar_tables=True):
+        f.write(b"HEAD")
+        raise ValueError("échec d'écriture")
+
+    monkeypatch.setattr(LMPRJChunkedSerializer, "write_snapshot", staticmethod(broken))
+    with pytest.raises(ValueError):
+        LMPRJChunkedSerializer.save(_project(n=10), NAME)
+    assert open(path, "rb").read() == before
+    assert not os.path.exists(f"{path}.tmp")
+
+
+def test_files_without_header_are_summarized_by_loading(save_dir):
+    project = _project()
+    path = LMPRJChunkedSerializer.path_for(NAME)
+    with open(path, "wb") as f:
+        LMPRJChunkedSerializer._write_chunks(f, project, LMPRJChunkedSerializer.write_chunk,
+                                             columnar_tables=False,
+                                             version=LMPRJChunkedSerializer.LEGACY_VERSION)
+    header = LMPRJChunkedSerializer.read_header(NAME)
+    assert header["format"] == 0 and header["chunks"] is None
+    assert header["clip_count"] == 3
+    assert LMPRJChunkedSerializer.get_project_clip_count(NAME) == 3
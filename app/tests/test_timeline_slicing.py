@@ -0,0 +1,36 @@
+# tests/test_timeline_slicing.py
+"""Découpage de la timeline en plages de rendu."""
+from __future__ import annotations
+from dataclasses import replace
+
+import pytest
+
+from core.project import Project, Clip
+from core.export.timeline_slicing import plan_segments
+
+
+def _project(*durations: float) -> Project:
+    project = Project(fps=25)
+    project.clips = [Clip(path=f"clip{i}.mp4", in_s=0.0, out_s=d, duration_s=d)
+                     for i, d in enumerate(durations)]
+    return project
+
+
+def test_cuts_fall_on_clip_edges_and_frames():
+    ranges = plan_segments(_project(7.0, 3.0), 2.5)
+    assert ranges[0].start == 0.0 and ranges[-1].end == pytest.approx(10.0)
+    assert any(r.start == pytest.approx(7.0) for r in ranges)
+    for r in ranges:
+        assert r.duration <= 2.5 + 1e-9
+        assert r.start * 25 == pytest.approx(round(r.start * 25))
+
+
+def test_fixed_windows_keep_cuts_when_the_tail_is_trimmed():
+    project = _project(35.0, 5.0)
+    before = plan_segments(project, 10.0, fixed=True)
+    project.clips[0] = replace(project.clips[0], out_s=33.0, duration_s=33.0)
+    after = plan_segments(project, 10.0, fixed=True)
+
+    assert [(r.start, r.end) for r in before[:3]] == [(0.0, 10.0), (10.0, 20.0), (20.0, 30.0)]
+    assert before[:3] == after[:3]
+    assert after[3].end == pytest.approx(33.0)
@@ -1,6 +1,6 @@
 from pathlib import Path
 from PySide6.QtCore import Qt, QUrl
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QMessageBox, QSizePolicy, QSplitter, QFileDialog, QInputDialog
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QMessageBox, QSizePolicy, QSplitter, QFileDialog, QInputDialog, QProgressDialog
 
 from ui.editor.video_canvas import VideoCanvas
 from ui.editor.player_controls import PlayerControls
@@ -15,7 +15,6 @@ from core.utils_timeline import clips_to_timeline_items, total_sequence_duration
 
 from core.export.export_service import ExportService
 from core.export.export_profile import DEFAULT_PROFILES
-from core.export.engine_interface import RenderError
 from ui.editor.assets_panel import AssetsPanel
 
 class EditorWindow(QWidget):
@@ -27,6 +26,8 @@ class EditorWindow(QWidget):
         # back
         self.store = store
         self.exporter = export_service
+        self._export_jobs = []  # exports en cours (références gardées vivantes)
+        self._last_export = None  # (chemin, plage) du dernier export, pour « Réexporter »
 
         self.media = MediaController(self)        # player 1-fichier
         self.seq = SequencePlayer(self.media, self.store, self) 
@@ -100,6 +101,13 @@ class EditorWindow(QWidget):
 
         # --- Export ---
         self.controls.exportRequested.connect(self._export)
+        self.controls.reexportRequested.connect(self._reexport)
+
+        # --- Marques entrée/sortie (plage d'export) ---
+        self._mark_in_ms = None
+        self._mark_out_ms = None
+        self.controls.markInRequested.connect(self._mark_in)
+        self.controls.markOutRequested.connect(self._mark_out)
 
         # --- Bouton ✂ Couper ---
         if hasattr(self.controls, "splitRequested"):
@@ -145,8 +153,47 @@ class EditorWindow(QWidget):
         self.store.set_clip(f, duration_s=5.0)
 
     # ---------- Export ----------
+    def _mark_in(self):
+        self._mark_in_ms = int(self.seq.position_ms())
+        # une sortie avant la nouvelle entrée n'a plus de sens
+        if self._mark_out_ms is not None and self._mark_out_ms <= self._mark_in_ms:
+            self._mark_out_ms = None
+        self.controls.set_marks(self._mark_in_ms, self._mark_out_ms)
+
+    def _mark_out(self):
+        self._mark_out_ms = int(self.seq.position_ms())
+        if self._mark_in_ms is not None and self._mark_in_ms >= self._mark_out_ms:
+            self._mark_in_ms = None
+        self.controls.set_marks(self._mark_in_ms, self._mark_out_ms)
+
+    def _marked_range(self):
+        """(début, fin) en secondes si au moins une marque est posée, sinon None."""
+        if self._mark_in_ms is None and self._mark_out_ms is None:
+            return None
+        total_ms = total_sequence_duration_ms(self.store.project().clips)
+        start = self._mark_in_ms if self._mark_in_ms is not None else 0
+        end = self._mark_out_ms if self._mark_out_ms is not None else total_ms
+        if end <= start:
+            return None
+        return (start / 1000.0, end / 1000.0)
+
     def _export(self):
         proj = self.store.project()
+
+        time_range = self._marked_range()
+        if time_range is not None:
+            choice = QMessageBox.question(
+                self, "Plage d'export",
+                f"Exporter seulement la plage marquée "
+                f"({time_range[0]:.2f}s – {time_range[1]:.2f}s) ?\n"
+                f"« Non » exporte toute la timeline et efface les marques.",
+                QMessageBox.Yes | QMessageBox.No | QMessageBox.Cancel, QMessageBox.Yes)
+            if choice == QMessageBox.Cancel:
+                return
+            if choice == QMessageBox.No:
+                time_range = None
+                self._mark_in_ms = self._mark_out_ms = None
+                self.controls.set_marks(None, None)
         
         default_name = proj.name.strip() or "output"
         default_path = str(Path.cwd() / "exports" / f"{default_name}.mp4")
@@ -158,25 +205,76 @@ class EditorWindow(QWidget):
         if not out_path_str:
             return
 
-        out_path = Path(out_path_str)
+        self._start_export(Path(out_path_str), time_range)
+
+    def _reexport(self):
+        """
+        Réexport incrémental vers le dernier fichier exporté : les flux vidéo
+        et audio sont gardés en cache, seul celui dont les entrées ont changé
+        est re-rendu (le premier réexport rend tout).
+        """
+        if self._last_export is None:
+            QMessageBox.information(self, "Réexporter", "Aucun export précédent : utilisez d'abord « Exporter ».")
+            return
+        out_path, time_range = self._last_export
+        self._start_export(out_path, time_range, incremental=True)
+
+    def _start_export(self, out_path: Path, time_range, incremental: bool = False):
+        proj = self.store.project()
+        self._last_export = (out_path, time_range)
         
         profile = DEFAULT_PROFILES["h264_medium"]
         
         fallback_src = proj.clips[0].path if proj.clips else (str(Path("assets") / "Fluid_Sim_Hue_Test.mp4"))
 
-        try:
-            self.exporter.export_project(
-                proj=proj,
-                out_path=out_path,
-                profile=profile,
-                fallback_src=fallback_src
+        # Export non bloquant : l'éditeur reste utilisable pendant le rendu
+        job = self.exporter.export_async(
+            proj=proj,
+            out_path=out_path,
+            profile=profile,
+            fallback_src=fallback_src,
+            time_range=time_range,
+            incremental=incremental
+        )
+        self._export_jobs.append(job)
+
+        dialog = QProgressDialog(f"Export de {out_path.name}…", "Annuler", 0, 100, self)
+        dialog.setWindowTitle("Exportation")
+        dialog.setWindowModality(Qt.NonModal)
+        dialog.setAutoClose(False)
+        dialog.setAutoReset(False)
+        dialog.setMinimumDuration(0)
+        dialog.canceled.connect(job.cancel)
+
+        def _on_progress(info):
+            dialog.setValue(int(info.percent))
+            eta = f"{int(info.eta_s // 60)} min {int(info.eta_s % 60):02d} s" if info.eta_s is not None else "…"
+            dialog.setLabelText(
+                f"Export de {out_path.name}\n"
+                f"Image {info.frame} — {info.fps:.0f} i/s — x{info.speed:.2f} — reste {eta}"
             )
-            QMessageBox.information(self, "Exportation terminée", f"Fichier exporté avec succès : \n{out_path}")
-            
-        except RenderError as e:
-            QMessageBox.critical(self, "Échec de l'exportation", f"Une erreur de rendu est survenue:\n{e}")
-        except Exception as e:
-            QMessageBox.critical(self, "Échec de l'exportation", f"Une erreur inattendue est survenue:\n{e}")
+
+        def _on_done():
+            if job in self._export_jobs:
+                self._export_jobs.remove(job)
+            # close() émet canceled : on déconnecte d'abord
+            dialog.canceled.disconnect(job.cancel)
+            dialog.close()
+            dialog.deleteLater()
+
+        def _on_finished(path: str):
+            _on_done()
+            QMessageBox.information(self, "Exportation terminée", f"Fichier exporté avec succès : \n{path}")
+
+        def _on_failed(msg: str):
+            _on_done()
+            QMessageBox.critical(self, "Échec de l'exportation", f"Une erreur de rendu est survenue:\n{msg}")
+
+        job.progress.connect(_on_progress)
+        job.finished.connect(_on_finished)
+        job.failed.connect(_on_failed)
+        job.cancelled.connect(_on_done)
+        dialog.show()
 
     def _on_media_error(self, text: str):
         if text:
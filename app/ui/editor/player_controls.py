@@ -13,6 +13,7 @@ class PlaybackState:
 class PlayerControls(QWidget):
     openRequested = Signal()
     exportRequested = Signal()
+    reexportRequested = Signal()
     zoomChanged = Signal(int)
     splitRequested = Signal()
     markInRequested = Signal()
@@ -31,6 +32,8 @@ class PlayerControls(QWidget):
         self.btn_play_pause = QPushButton(self._icon(QStyle.SP_MediaPlay), "") 
         self.btn_stop   = QPushButton(self._icon(QStyle.SP_MediaStop), "")
         self.btn_split  = QPushButton("✂ Couper") 
+        self.btn_mark_in  = QPushButton("[ Entrée")
+        self.btn_mark_out = QPushButton("Sortie ]")
         
         # Boutons de navigation rapide
         self.btn_backward = QPushButton(self._icon(QStyle.SP_MediaSeekBackward), "")
@@ -38,6 +41,7 @@ class PlayerControls(QWidget):
 
         # Boutons d'action
         self.btn_export = QPushButton("Exporter (MVP)")
+        self.btn_reexport = QPushButton("Réexporter")
         self.btn_del_close = QPushButton("Suppr (refermer)")
         
         # Sliders et labels de temps
@@ -66,6 +70,10 @@ class PlayerControls(QWidget):
         # Tooltips
         self.btn_split.setToolTip("Couper le clip au niveau de la tête de lecture")
         self.btn_del_close.setToolTip("Supprimer la sélection de la timeline et refermer le trou.")
+        self.btn_mark_in.setToolTip("Marquer le début de la plage à exporter à la tête de lecture")
+        self.btn_mark_out.setToolTip("Marquer la fin de la plage à exporter à la tête de lecture")
+        self.btn_reexport.setToolTip("Réexporter vers le dernier fichier exporté : seul le flux modifié "
+                                     "(audio ou vidéo) est re-rendu, les flux sont gardés en cache")
         
         # --- 2. Création et organisation des Layouts ---
         
@@ -87,11 +95,18 @@ class PlayerControls(QWidget):
         # Actions de timeline
         h_box_controls.addWidget(self.btn_split)
         h_box_controls.addWidget(self.btn_del_close)
+
+        h_box_controls.addSpacing(10)
+
+        # Plage d'export (entrée/sortie)
+        h_box_controls.addWidget(self.btn_mark_in)
+        h_box_controls.addWidget(self.btn_mark_out)
         
         h_box_controls.addStretch(1) # Espace flexible
 
         # Export (à droite)
         h_box_controls.addWidget(self.btn_export)
+        h_box_controls.addWidget(self.btn_reexport)
         
         # B. Deuxième ligne: Position de lecture (Slider + Temps)
         h_box_timeline = QHBoxLayout()
@@ -124,8 +139,11 @@ class PlayerControls(QWidget):
 
         # Signaux primaires
         self.btn_export.clicked.connect(self.exportRequested.emit)
+        self.btn_reexport.clicked.connect(self.reexportRequested.emit)
         self.btn_split.clicked.connect(self.splitRequested.emit)
         self.btn_del_close.clicked.connect(self.deleteSelectionCloseRequested.emit)
+        self.btn_mark_in.clicked.connect(self.markInRequested.emit)
+        self.btn_mark_out.clicked.connect(self.markOutRequested.emit)
         
         self.zoom_slider.valueChanged.connect(
             lambda v: (self.zoom_lbl.setText(f"Zoom ({v}px/s)"), self.zoomChanged.emit(v))
@@ -200,11 +218,18 @@ class PlayerControls(QWidget):
         if self._media:
             self._media.set_volume(v / 100)
 
+    @staticmethod
+    def _fmt(ms):
+        s = int(ms / 1000); m, s = divmod(s, 60); h, m = divmod(m, 60)
+        return f"{h:02d}:{m:02d}:{s:02d}" if h else f"{m:02d}:{s:02d}"
+
     def _update_label(self, pos, dur):
-        def fmt(ms):
-            s = int(ms / 1000); m, s = divmod(s, 60); h, m = divmod(m, 60)
-            return f"{h:02d}:{m:02d}:{s:02d}" if h else f"{m:02d}:{s:02d}"
-        self.lbl_time.setText(f"{fmt(pos)} / {fmt(dur)}")
+        self.lbl_time.setText(f"{self._fmt(pos)} / {self._fmt(dur)}")
+
+    def set_marks(self, in_ms: Optional[int], out_ms: Optional[int]):
+        """Affiche les marques entrée/sortie (None = non posée) sur leurs boutons."""
+        self.btn_mark_in.setText("[ Entrée" if in_ms is None else f"[ {self._fmt(in_ms)}")
+        self.btn_mark_out.setText("Sortie ]" if out_ms is None else f"{self._fmt(out_ms)} ]")
 
     def _handle_seek(self, ms: int):
         self.btn_forward.setEnabled(False)
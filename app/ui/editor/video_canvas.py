@@ -1,7 +1,9 @@
 from PySide6.QtCore import Qt, QRect, Signal
 from PySide6.QtGui import QPainter, QPixmap, QImage, QFont, QColor, QPen, QBrush
 from PySide6.QtWidgets import QWidget, QSizePolicy
+import numpy as np
 from core.project import Project
+from core.frame_filters import FrameFilterProcessor
 
 class VideoCanvas(QWidget):
     overlaySelected = Signal(object)  # émet le TextOverlay sélectionné (ou None)
@@ -21,12 +23,28 @@ class VideoCanvas(QWidget):
         self._drag_offset = (0, 0)  # offset souris dans le rect du texte
         self._last_overlay_boxes: list[tuple[object, QRect]] = []
         self._last_target_rect: QRect | None = None  # rect de la vidéo (letterbox)
+        # mêmes traitements que le moteur d'export FrameServerRenderEngine
+        self._filters = FrameFilterProcessor()
 
     # --- API ---
     def set_frame(self, img: QImage):
-        self._frame = img if (img is not None and not img.isNull()) else None
+        img = img if (img is not None and not img.isNull()) else None
+        if img is not None and self._project is not None:
+            self._filters.set_filters(self._project.filters)
+            if not self._filters.is_identity:
+                img = self._apply_filters(img)
+        self._frame = img
         self.update()
 
+    def _apply_filters(self, img: QImage) -> QImage:
+        """Aperçu des Filters : QImage -> tableau BGR -> frame_filters -> QImage."""
+        img = img.convertToFormat(QImage.Format_BGR888)
+        w, h, stride = img.width(), img.height(), img.bytesPerLine()
+        buf = np.frombuffer(img.constBits(), dtype=np.uint8, count=stride * h)
+        frame = buf.reshape(h, stride)[:, :w * 3].reshape(h, w, 3).copy()
+        self._filters.apply(frame)
+        return QImage(frame.data, w, h, w * 3, QImage.Format_BGR888).copy()
+
     def set_project(self, proj: Project | None):
         self._project = proj
         self.update()
@@ -1,5 +1,7 @@
-from PySide6.QtWidgets import QVBoxLayout, QGridLayout, QWidget
+import time
+from PySide6.QtWidgets import QVBoxLayout, QGridLayout, QWidget, QLineEdit
 from PySide6.QtCore import Qt
+from PySide6.QtGui import QIcon
 from app.ui import styles
 from app.ui.components.create_project_button import CreateProjectButton
 from app.ui.components.project_button import ProjectButton
@@ -7,10 +9,18 @@ from app.ui.components.title import Title
 from app.ui.components.menu_button import MenuButton
 
 class ProjectSelect(QWidget):
-    def __init__(self, go_to_editor,go_to_editor_with_project_name, vids):
+    COLS = 5
+
+    def __init__(self, go_to_editor,go_to_editor_with_project_name, vids, search=None):
+        """
+        `vids` : entrées du catalogue (CatalogEntry) ou noms de fichiers.
+        `search(texte)` : requête au catalogue pour la barre de recherche.
+        """
         super().__init__()
-        
+
         self.setStyleSheet(styles.WINDOW_STYLE)
+        self._open_project = go_to_editor_with_project_name
+        self._search = search
 
         layoutCreate = QVBoxLayout(self)
         layoutCreate.setSpacing(30)
@@ -20,15 +30,42 @@ class ProjectSelect(QWidget):
 
         layoutCreate.addWidget(CreateProjectButton("Éditeur", go_to_editor))
 
-        layoutProject = QGridLayout()
-        layoutProject.setVerticalSpacing(15)
-        cols = 5
-        for i, text in enumerate(vids):
-            row = i // cols
-            col = i % cols
-            load_func = lambda checked, name=text: go_to_editor_with_project_name(name)
-            layoutProject.addWidget(ProjectButton(text, load_func), row, col, alignment=Qt.AlignmentFlag.AlignTop)
+        if search is not None:
+            self.search_edit = QLineEdit()
+            self.search_edit.setPlaceholderText("Rechercher un projet…")
+            self.search_edit.setClearButtonEnabled(True)
+            self.search_edit.textChanged.connect(lambda text: self._fill(self._search(text.strip())))
+            layoutCreate.addWidget(self.search_edit)
+
+        self.layoutProject = QGridLayout()
+        self.layoutProject.setVerticalSpacing(15)
+        self._fill(vids)
+
+        layoutCreate.addLayout(self.layoutProject)
+
+        layoutCreate.addStretch(1)
+
+    def _fill(self, vids):
+        while self.layoutProject.count():
+            item = self.layoutProject.takeAt(0)
+            if item.widget() is not None:
+                item.widget().deleteLater()
 
-        layoutCreate.addLayout(layoutProject)
+        for i, entry in enumerate(vids):
+            row = i // self.COLS
+            col = i % self.COLS
+            filename = getattr(entry, "filename", entry)
+            load_func = lambda checked, name=filename: self._open_project(name)
+            button = ProjectButton(self._label(entry), load_func)
+            if hasattr(entry, "mtime"):
+                button.setToolTip(f"{filename}\nModifié le {time.strftime('%d/%m/%Y %H:%M', time.localtime(entry.mtime))}")
+            if getattr(entry, "thumbnail", None):
+                button.setIcon(QIcon(entry.thumbnail))
+            self.layoutProject.addWidget(button, row, col, alignment=Qt.AlignmentFlag.AlignTop)
 
-        layoutCreate.addStretch(1)
\ No newline at end of file
+    @staticmethod
+    def _label(entry) -> str:
+        if not hasattr(entry, "clip_count"):
+            return entry
+        m, s = divmod(int(entry.duration_s), 60)
+        return f"{entry.name}\n{entry.clip_count} clip(s) · {m:02d}:{s:02d}"